@@ -3,14 +3,21 @@ Authentication endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, bindparam
 from pydantic import BaseModel
 
 from backend.core.database import get_db
+from backend.core.security import verify_client_password
 from backend.models.client import Client
 
 router = APIRouter()
 
+# Active client by username (settings->>'username'), built once at import
+ACTIVE_CLIENT_BY_USERNAME = select(Client).where(
+    Client.is_active == True,
+    Client.settings["username"].as_string() == bindparam("username")
+).limit(1)
+
 
 class LoginRequest(BaseModel):
     """Login request model"""
@@ -33,7 +40,8 @@ async def login(
     Authenticate user with bioTrack+ credentials
 
     This endpoint validates user login credentials against stored client information.
-    For demo/testing, credentials are stored in the client.settings JSON field.
+    For demo/testing, credentials are stored in the client.settings JSON field
+    (username plus a bcrypt password_hash).
 
     Demo Credentials:
         Username: demo@biotrack.ca
@@ -62,32 +70,20 @@ async def login(
         for proper single sign-on authentication. Current implementation is for
         demo/testing purposes only.
     """
-    # Find all active clients
-    result = await db.execute(
-        select(Client).where(Client.is_active == True)
-    )
-    clients = result.scalars().all()
-
-    # Check each client's settings for matching username
-    for client in clients:
-        # Check if username matches in settings
-        client_username = client.settings.get("username") if client.settings else None
-
-        if client_username == credentials.username:
-            # Validate password
-            client_password = client.settings.get("password") if client.settings else None
-
-            if client_password == credentials.password:
-                # Login successful!
-                return LoginResponse(
-                    message="Login successful",
-                    client={
-                        "id": str(client.id),
-                        "name": client.name,
-                        "dynamics_url": client.dynamics_url,
-                        "is_active": client.is_active
-                    }
-                )
+    result = await db.execute(ACTIVE_CLIENT_BY_USERNAME, {"username": credentials.username})
+    client = result.scalar_one_or_none()
+
+    if client and await verify_client_password(client.settings, credentials.password):
+        # Login successful!
+        return LoginResponse(
+            message="Login successful",
+            client={
+                "id": str(client.id),
+                "name": client.name,
+                "dynamics_url": client.dynamics_url,
+                "is_active": client.is_active
+            }
+        )
 
     # No matching credentials found
     raise HTTPException(
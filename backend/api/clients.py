@@ -1,18 +1,34 @@
 """
 Client management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import select, update, delete, bindparam
+from typing import List, Optional
 from uuid import UUID
 
-from backend.core.database import get_db
+from backend.core.cache import cached_json, invalidate
+from backend.core.database import get_db, dialect_insert
+from backend.core.security import hash_settings_password
 from backend.models.client import Client
-from backend.schemas.client import ClientCreate, ClientResponse, ClientUpdate
+from backend.models.recording import Recording
+from backend.models.schema_mapping import SchemaMapping
+from backend.schemas.client import (
+    SECRET_SETTINGS,
+    ClientCreate,
+    ClientResponse,
+    ClientUpdate,
+    CLIENT_ADAPTER,
+    CLIENT_LIST_ADAPTER
+)
 
 router = APIRouter()
 
+# Built once at import; handlers only bind the id
+CLIENT_BY_ID = select(Client).where(Client.id == bindparam("client_id"))
+
 
 @router.post("/clients", response_model=ClientResponse, status_code=status.HTTP_201_CREATED)
 async def create_client(
@@ -20,21 +36,27 @@ async def create_client(
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new client"""
-    # Check if client with same name exists
-    result = await db.execute(select(Client).where(Client.name == client_data.name))
-    existing_client = result.scalar_one_or_none()
-
-    if existing_client:
+    # Insert unless the name is taken, in a single race-free statement
+    client_values = client_data.model_dump()
+    # bcrypt is CPU-bound; hash off the event loop
+    client_values["settings"] = await asyncio.to_thread(hash_settings_password, client_values["settings"])
+
+    result = await db.execute(
+        dialect_insert(Client)
+        .values(**client_values)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(Client)
+    )
+    new_client = result.scalar_one_or_none()
+
+    if not new_client:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Client with name '{client_data.name}' already exists"
         )
 
-    # Create new client
-    new_client = Client(**client_data.model_dump())
-    db.add(new_client)
     await db.commit()
-    await db.refresh(new_client)
+    await invalidate("clients")
 
     return new_client
 
@@ -46,27 +68,33 @@ async def list_clients(
     db: AsyncSession = Depends(get_db)
 ):
     """List all clients"""
-    result = await db.execute(select(Client).offset(skip).limit(limit))
-    clients = result.scalars().all()
-    return clients
+    async def load():
+        result = await db.execute(select(Client).offset(skip).limit(limit))
+        return result.scalars().all()
+
+    return await cached_json(f"clients:list:{skip}:{limit}", load, CLIENT_LIST_ADAPTER)
 
 
 @router.get("/clients/{client_id}", response_model=ClientResponse)
 async def get_client(
     client_id: UUID,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific client"""
-    result = await db.execute(select(Client).where(Client.id == client_id))
-    client = result.scalar_one_or_none()
+    async def load():
+        result = await db.execute(CLIENT_BY_ID, {"client_id": client_id})
+        client = result.scalar_one_or_none()
 
-    if not client:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Client with id '{client_id}' not found"
-        )
+        if not client:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Client with id '{client_id}' not found"
+            )
 
-    return client
+        return client
+
+    return await cached_json(f"clients:{client_id}", load, CLIENT_ADAPTER, if_none_match)
 
 
 @router.patch("/clients/{client_id}", response_model=ClientResponse)
@@ -75,8 +103,31 @@ async def update_client(
     client_data: ClientUpdate,
     db: AsyncSession = Depends(get_db)
 ):
-    """Update a client"""
-    result = await db.execute(select(Client).where(Client.id == client_id))
+    """
+    Update a client
+
+    Responses never include the stored login credential, so settings sent
+    without a new settings["password"] keep the stored one.
+    """
+    update_data = client_data.model_dump(exclude_unset=True)
+    new_settings = update_data.get("settings")
+    if new_settings is not None and "password" in new_settings:
+        update_data["settings"] = await asyncio.to_thread(hash_settings_password, new_settings)
+    elif new_settings is not None:
+        stored = await db.scalar(select(Client.settings).where(Client.id == client_id))
+        credentials = {key: value for key, value in (stored or {}).items() if key in SECRET_SETTINGS}
+        update_data["settings"] = {**new_settings, **credentials}
+
+    if update_data:
+        # UPDATE ... RETURNING hands back the updated row in one round-trip
+        result = await db.execute(
+            update(Client)
+            .where(Client.id == client_id)
+            .values(**update_data)
+            .returning(Client)
+        )
+    else:
+        result = await db.execute(CLIENT_BY_ID, {"client_id": client_id})
     client = result.scalar_one_or_none()
 
     if not client:
@@ -85,13 +136,8 @@ async def update_client(
             detail=f"Client with id '{client_id}' not found"
         )
 
-    # Update fields
-    update_data = client_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(client, field, value)
-
     await db.commit()
-    await db.refresh(client)
+    await invalidate("clients")
 
     return client
 
@@ -102,16 +148,23 @@ async def delete_client(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a client"""
-    result = await db.execute(select(Client).where(Client.id == client_id))
-    client = result.scalar_one_or_none()
-
-    if not client:
+    # Remove dependent rows with set-based deletes rather than loading every
+    # recording/schema mapping through the ORM cascade
+    await db.execute(delete(Recording).where(Recording.client_id == client_id))
+    await db.execute(delete(SchemaMapping).where(SchemaMapping.client_id == client_id))
+    result = await db.execute(
+        delete(Client).where(Client.id == client_id).returning(Client.id)
+    )
+
+    if result.scalar_one_or_none() is None:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Client with id '{client_id}' not found"
         )
 
-    await db.delete(client)
     await db.commit()
+    await invalidate("clients")
+    await invalidate("schema_mappings")
 
     return None
@@ -1,14 +1,65 @@
 """
 Health check endpoints
+
+- /health/live: process is up (no dependencies checked)
+- /health/ready and /health/db: database reachable
+- /health/queue: recordings waiting for a Celery worker (consumer lag)
+
+Database checks are cached briefly so frequent probes from several instances
+don't turn into a steady stream of queries, and a single slow check is shared
+by every probe waiting on it.
 """
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import time
+
+import redis.asyncio as redis
+from fastapi import APIRouter, status
+from fastapi.responses import ORJSONResponse
+from redis.exceptions import RedisError
 from sqlalchemy import text
 
-from backend.core.database import get_db
+from backend.core.config import settings
+from backend.core.database import AsyncSessionLocal, engine
 
 router = APIRouter()
 
+# Seconds a database check result is reused
+HEALTHY_TTL_SECONDS = 5
+UNHEALTHY_TTL_SECONDS = 1
+
+_db_check_lock = asyncio.Lock()
+_db_check_result = None
+_db_checked_at = 0.0
+
+
+async def _check_database() -> dict:
+    """Run SELECT 1, reusing a recent result if there is one"""
+    global _db_check_result, _db_checked_at
+
+    async with _db_check_lock:
+        if _db_check_result is not None:
+            ttl = HEALTHY_TTL_SECONDS if _db_check_result["status"] == "healthy" else UNHEALTHY_TTL_SECONDS
+            if time.monotonic() - _db_checked_at < ttl:
+                return _db_check_result
+
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(text("SELECT 1"))
+                result.fetchone()
+            _db_check_result = {
+                "status": "healthy",
+                "database": "connected"
+            }
+        except Exception as e:
+            _db_check_result = {
+                "status": "unhealthy",
+                "database": "disconnected",
+                "error": str(e)
+            }
+
+        _db_checked_at = time.monotonic()
+        return _db_check_result
+
 
 @router.get("/health")
 async def health_check():
@@ -19,19 +70,45 @@ async def health_check():
     }
 
 
+@router.get("/health/live")
+async def liveness_check():
+    """Liveness probe - doesn't touch the database"""
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+async def readiness_check():
+    """Readiness probe - 503 while the database is unreachable"""
+    result = await _check_database()
+    if result["status"] != "healthy":
+        return ORJSONResponse(result, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return result
+
+
 @router.get("/health/db")
-async def database_health_check(db: AsyncSession = Depends(get_db)):
+async def database_health_check():
     """Database health check"""
+    result = await _check_database()
+    return {**result, "pool": engine.pool.status()}
+
+
+@router.get("/health/queue")
+async def queue_health_check():
+    """Processing queue depth - 503 while the Celery broker is unreachable"""
+    if settings.PROCESSING_BACKEND != "celery":
+        return {"backend": settings.PROCESSING_BACKEND}
+
+    from backend.workers.tasks import RECORDINGS_QUEUE
+
+    client = redis.from_url(settings.CELERY_BROKER_URL, socket_connect_timeout=0.5, socket_timeout=0.5)
     try:
-        result = await db.execute(text("SELECT 1"))
-        result.fetchone()
-        return {
-            "status": "healthy",
-            "database": "connected"
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "database": "disconnected",
-            "error": str(e)
-        }
+        pending = await client.llen(RECORDINGS_QUEUE)
+    except (RedisError, OSError) as e:
+        return ORJSONResponse(
+            {"backend": "celery", "status": "unhealthy", "error": str(e)},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    finally:
+        await client.aclose()
+
+    return {"backend": "celery", "status": "healthy", "pending": pending}
@@ -34,6 +34,7 @@ Response Models:
 Error Responses:
     - 400 Bad Request: Invalid client_id or inactive client
     - 404 Not Found: Client or recording not found
+    - 409 Conflict: Reprocess requested while the recording is being processed
     - 500 Internal Server Error: File upload or processing error
 
 Security:
@@ -65,27 +66,91 @@ Frontend Integration:
 Author: Farm Data Automation Team
 Version: 2.0
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Response, status, UploadFile, File, Form
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import select, insert, update, tuple_, func, literal, bindparam, or_
+from sqlalchemy.orm import load_only, with_expression
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
+from datetime import datetime
+import asyncio
+import hashlib
+import orjson
 import logging
 
-from backend.core.database import get_db
-from backend.models.recording import Recording
-from backend.schemas.recording import RecordingResponse, RecordingUploadResponse
-from backend.services.local_storage import LocalStorageService
-from backend.workers.recording_processor import process_recording_async
+from backend.core.database import get_db, AsyncSessionLocal
+from backend.core.events import (
+    TERMINAL_STATUSES,
+    current_status,
+    current_statuses,
+    publish_status,
+    status_event,
+    subscribe
+)
+from backend.core.responses import not_modified, stream_json_array
+from backend.models.client import Client
+from backend.models.recording import Recording, RecordingStatus, TRANSCRIPTION_PREVIEW_LENGTH
+from backend.schemas.recording import (
+    RecordingResponse,
+    RecordingSummary,
+    RecordingUploadResponse,
+    RECORDING_SUMMARY_LIST_ADAPTER
+)
+from backend.services.local_storage import LocalStorageService, get_storage_service
+from backend.workers.recording_processor import CLAIM_EXPIRED, lease_expired_before, schedule_processing
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Built once at import; handlers only bind the id
+RECORDING_BY_ID = select(Recording).where(Recording.id == bindparam("recording_id"))
+
+# Puts a recording back in the queue: only one no run has claimed yet (its
+# task may have been lost on a restart or never queued), a failed or synced
+# one, or a run whose claim has expired (the rule CLAIM_RECORDING uses).
+# Resetting a run still in progress would let its next task claim it again
+# and start a second pipeline and Dynamics record alongside the first
+RESET_FOR_REPROCESSING = (
+    update(Recording)
+    .where(
+        Recording.id == bindparam("recording_id"),
+        or_(
+            Recording.status.in_([RecordingStatus.UPLOADED, RecordingStatus.FAILED, RecordingStatus.SYNCED]),
+            CLAIM_EXPIRED,
+        ),
+    )
+    .values(status=RecordingStatus.UPLOADED, sync_error=None)
+    .returning(Recording)
+)
+
+# Seconds between SSE keep-alive comments on an idle status stream
+EVENTS_KEEPALIVE_SECONDS = 15
+
+# Read uploads 1MB at a time instead of loading the whole file into memory
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def _read_chunks(file: UploadFile, digest) -> AsyncIterator[bytes]:
+    """
+    Yield an uploaded file in UPLOAD_CHUNK_SIZE pieces, hashing as it goes
+
+    hashlib releases the GIL on large buffers, so each chunk is hashed in a
+    worker thread instead of blocking the event loop.
+    """
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        await asyncio.to_thread(digest.update, chunk)
+        yield chunk
+
 
 @router.post("/recordings/upload", response_model=RecordingUploadResponse, status_code=status.HTTP_201_CREATED)
 async def upload_recording(
+    background_tasks: BackgroundTasks,
     client_id: UUID = Form(...),
     file: UploadFile = File(...),
+    storage_service: LocalStorageService = Depends(get_storage_service),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -100,11 +165,11 @@ async def upload_recording(
         - file (File): Audio file in supported format (MP3, WAV, M4A, OGG)
 
     Processing Flow:
-        1. Validates client exists and is active
-        2. Saves file to local storage (./storage/recordings/{client_id}/{year-month}/)
-        3. Creates recording record in database with status=UPLOADED
-        4. Triggers async background processing (non-blocking)
-        5. Returns immediately with recording_id for status tracking
+        1. Saves file to local storage (./storage/recordings/{client_id}/{year-month}/)
+        2. Creates recording record with status=UPLOADED, in the same statement
+           that checks the client exists and is active (file is removed if not)
+        3. Schedules background processing to run after the response is sent
+        4. Returns immediately with recording_id for status tracking
 
     Response (201 Created):
         {
@@ -132,9 +197,10 @@ async def upload_recording(
 
         Total processing time: 10-60 seconds average
 
-    Polling for Status:
-        After upload, client should poll GET /recordings/{recording_id}
-        every 2-3 seconds to check status and display progress to user.
+    Tracking Status:
+        After upload, open GET /recordings/{recording_id}/events (Server-Sent
+        Events) to receive each status change as it happens. Clients that
+        can't use SSE can poll GET /recordings/{recording_id} instead.
 
     Example (JavaScript):
         const formData = new FormData();
@@ -154,60 +220,44 @@ async def upload_recording(
         - Recommended: < 10MB for optimal processing speed
         - Typical voice recording: 1-5MB per minute
     """
-    # Validate client exists
-    from backend.models.client import Client
-    result = await db.execute(select(Client).where(Client.id == client_id))
-    client = result.scalar_one_or_none()
-
-    if not client:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Client with id '{client_id}' not found"
-        )
-
-    if not client.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Client '{client.name}' is not active"
-        )
+    recording_id = None
 
     try:
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
-
-        # Upload to local storage
-        storage_service = LocalStorageService()
-        file_path = await storage_service.upload_file(
-            file_content=file_content,
+        # Stream to local storage in fixed-size chunks
+        digest = hashlib.blake2b(digest_size=32)
+        file_path, file_size = await storage_service.upload_stream(
+            chunks=_read_chunks(file, digest),
             filename=file.filename,
-            client_id=str(client_id),
-            content_type=file.content_type
+            client_id=str(client_id)
         )
 
-        # Create recording record
-        recording = Recording(
-            client_id=client_id,
-            filename=file.filename,
-            file_path=file_path,
-            file_size=file_size,
-            content_type=file.content_type
+        # Insert the recording only if the client exists and is active, so the
+        # client check costs no extra round-trip. INSERT ... SELECT skips
+        # Python-side column defaults, so those columns are given explicitly
+        # (id and timestamps come from their server defaults).
+        new_row = {
+            "client_id": client_id,
+            "filename": file.filename,
+            "file_path": file_path,
+            "file_size": file_size,
+            "content_type": file.content_type,
+            "content_hash": digest.hexdigest(),
+            "status": RecordingStatus.UPLOADED,
+        }
+        columns = Recording.__table__.c
+        active_client = select(
+            *(literal(value, columns[name].type) for name, value in new_row.items())
+        ).where(Client.id == client_id, Client.is_active == True)
+
+        result = await db.execute(
+            insert(Recording)
+            .from_select(list(new_row), active_client)
+            .returning(Recording.id)
         )
+        recording_id = result.scalar_one_or_none()
 
-        db.add(recording)
-        await db.commit()
-        await db.refresh(recording)
-
-        # Trigger async processing
-        await process_recording_async(recording.id)
-
-        logger.info(f"Recording {recording.id} uploaded successfully for client {client.name}")
-
-        return RecordingUploadResponse(
-            recording_id=recording.id,
-            message="Recording uploaded successfully and queued for processing",
-            status="uploaded"
-        )
+        if recording_id:
+            await db.commit()
 
     except Exception as e:
         logger.error(f"Error uploading recording: {str(e)}")
@@ -216,13 +266,50 @@ async def upload_recording(
             detail=f"Error uploading recording: {str(e)}"
         )
 
+    if not recording_id:
+        # Nothing inserted - discard the file and report why
+        await storage_service.delete_file(file_path)
+        await _raise_client_unavailable(db, client_id)
+
+    # Process after the response has been sent
+    await schedule_processing(recording_id, background_tasks)
+
+    logger.info(f"Recording {recording_id} uploaded successfully for client {client_id}")
+
+    return RecordingUploadResponse(
+        recording_id=recording_id,
+        message="Recording uploaded successfully and queued for processing",
+        status="uploaded"
+    )
+
+
+async def _raise_client_unavailable(db: AsyncSession, client_id: UUID):
+    """Raise 404 if the client doesn't exist, or 400 if it is inactive"""
+    result = await db.execute(
+        select(Client.name, Client.is_active).where(Client.id == client_id)
+    )
+    client = result.one_or_none()
+
+    if not client:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Client with id '{client_id}' not found"
+        )
+
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Client '{client.name}' is not active"
+    )
+
 
-@router.get("/recordings", response_model=List[RecordingResponse])
+@router.get("/recordings", response_model=List[RecordingSummary])
 async def list_recordings(
     client_id: UUID = None,
+    status_filter: Optional[RecordingStatus] = Query(None, alias="status"),
+    before: Optional[datetime] = None,
+    before_id: Optional[UUID] = None,
     skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    limit: int = 100
 ):
     """
     List all recordings with optional filtering and pagination
@@ -232,18 +319,21 @@ async def list_recordings(
 
     Query Parameters:
         - client_id (UUID, optional): Filter by specific client
-        - skip (int, default=0): Number of records to skip (for pagination)
+        - status (string, optional): Filter by processing status (e.g. "failed")
+        - before (datetime, optional): Cursor - only return recordings created before this
+        - before_id (UUID, optional): Cursor tie-breaker for recordings sharing `before`
+        - skip (int, default=0): Number of records to skip (prefer the cursor for deep pages)
         - limit (int, default=100, max=1000): Number of records to return
 
-    Response: Array of RecordingResponse objects
+    Response: Array of RecordingSummary objects
         [
             {
                 "id": "123e4567-e89b-12d3-a456-426614174000",
                 "client_id": "550e8400-e29b-41d4-a716-446655440000",
                 "filename": "recording_20240115_143022.wav",
                 "status": "synced",
-                "transcription_text": "Add new heifer, ear tag 12345, born January 15th...",
-                "extracted_data": {"ear_tag": "12345", "sex": "Heifer", ...},
+                "transcription_preview": "Add new heifer, ear tag 12345, born January 15th...",
+                "entity_type": "animal",
                 "dynamics_record_id": "abc-123-def",
                 "sync_error": null,
                 "created_at": "2024-01-15T14:30:22Z",
@@ -252,37 +342,97 @@ async def list_recordings(
             ...
         ]
 
+    Full transcription and extracted data are omitted to keep list payloads
+    small; fetch GET /recordings/{recording_id} for the complete record.
+    Statuses include in-progress ones (transcribing, processing) that are
+    published but not yet written to the database.
+    The array is streamed from the database cursor rather than built in memory.
+
     Ordering:
-        Results are ordered by created_at descending (newest first)
+        Results are ordered by created_at descending (newest first), then id
+
+    Pagination:
+        Pass the created_at and id of the last recording on a page as
+        `before` and `before_id` to get the next page. Unlike skip, the cost
+        of a page doesn't grow with how far into the list it is.
 
     Example Usage:
         # Get all recordings for logged-in client
         GET /api/v1/recordings?client_id=550e8400-e29b-41d4-a716-446655440000
 
+        # Get a client's failed recordings
+        GET /api/v1/recordings?client_id=550e8400-...&status=failed
+
         # Paginate through results
-        GET /api/v1/recordings?skip=0&limit=20   # Page 1
-        GET /api/v1/recordings?skip=20&limit=20  # Page 2
+        GET /api/v1/recordings?limit=20   # Page 1
+        GET /api/v1/recordings?limit=20&before=2024-01-15T14:30:22&before_id=123e4567-...  # Page 2
     """
-    query = select(Recording)
+    # Only load the columns the list view needs
+    query = select(Recording).options(
+        load_only(
+            Recording.id,
+            Recording.client_id,
+            Recording.filename,
+            Recording.status,
+            Recording.entity_type,
+            Recording.dynamics_record_id,
+            Recording.sync_error,
+            Recording.created_at,
+            Recording.processed_at,
+        ),
+        with_expression(
+            Recording.transcription_preview,
+            func.substr(Recording.transcription_text, 1, TRANSCRIPTION_PREVIEW_LENGTH)
+        ),
+    )
 
     if client_id:
         query = query.where(Recording.client_id == client_id)
 
-    query = query.offset(skip).limit(limit).order_by(Recording.created_at.desc())
+    if status_filter:
+        query = query.where(Recording.status == status_filter)
 
-    result = await db.execute(query)
-    recordings = result.scalars().all()
+    # Keyset pagination: seek past the cursor instead of discarding skipped rows
+    if before and before_id:
+        query = query.where(tuple_(Recording.created_at, Recording.id) < (before, before_id))
+    elif before:
+        query = query.where(Recording.created_at < before)
 
-    return recordings
+    if skip:
+        query = query.offset(skip)
+
+    query = query.order_by(Recording.created_at.desc(), Recording.id.desc()).limit(limit)
+
+    return await stream_json_array(query, RECORDING_SUMMARY_LIST_ADAPTER, _with_live_statuses)
+
+
+async def _with_live_statuses(summaries: List[RecordingSummary]) -> List[RecordingSummary]:
+    """Show in-progress statuses that were published without a database write"""
+    live = await current_statuses(summaries)
+    if not live:
+        return summaries
+    return [
+        summary.model_copy(update={"status": RecordingStatus(live[summary.id])})
+        if summary.id in live else summary
+        for summary in summaries
+    ]
 
 
 @router.get("/recordings/{recording_id}", response_model=RecordingResponse)
 async def get_recording(
     recording_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get a specific recording"""
-    result = await db.execute(select(Recording).where(Recording.id == recording_id))
+    """
+    Get a specific recording
+
+    The dashboard polls this while a recording is processing. Responses carry
+    an ETag derived from updated_at and status, so unchanged polls get a
+    304 Not Modified without the body being serialized.
+    """
+    result = await db.execute(RECORDING_BY_ID, {"recording_id": recording_id})
     recording = result.scalar_one_or_none()
 
     if not recording:
@@ -291,33 +441,149 @@ async def get_recording(
             detail=f"Recording with id '{recording_id}' not found"
         )
 
+    # In-progress statuses are published without a database write
+    live_status = await current_status(recording)
+    etag = f'W/"{recording.updated_at.timestamp()}-{live_status}"'
+    unchanged = not_modified(if_none_match, etag)
+    if unchanged:
+        return unchanged
+
+    response.headers["ETag"] = etag
+    if live_status != recording.status.value:
+        return RecordingResponse.model_validate(recording).model_copy(
+            update={"status": RecordingStatus(live_status)}
+        )
     return recording
 
 
+async def _read_status_event(recording_id: UUID) -> Optional[dict]:
+    """
+    A recording's status event, with any newer published in-progress status
+
+    None if the recording has been deleted (with its client).
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(RECORDING_BY_ID, {"recording_id": recording_id})
+        recording = result.scalar_one_or_none()
+    if recording is None:
+        return None
+    return {**status_event(recording), "status": await current_status(recording)}
+
+
+@router.get("/recordings/{recording_id}/events")
+async def recording_events(
+    recording_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream a recording's status changes as Server-Sent Events
+
+    Sends the current status immediately, then one `status` event per change
+    until the recording reaches SYNCED or FAILED, at which point the stream
+    closes. If the recording is deleted meanwhile, a final `deleted` event
+    is sent and the stream closes. While idle the status is re-read every EVENTS_KEEPALIVE_SECONDS,
+    so a missed event is caught up late rather than never. Replaces polling
+    GET /recordings/{recording_id}.
+
+    Event format:
+        event: status
+        data: {"id": "...", "status": "transcribing", "sync_error": null}
+
+        event: deleted
+        data: {"id": "..."}
+
+    Example (JavaScript):
+        const events = new EventSource(`/api/v1/recordings/${recordingId}/events`);
+        events.addEventListener('status', (e) => {
+            const { status } = JSON.parse(e.data);
+            if (status === 'synced' || status === 'failed') events.close();
+        });
+    """
+    result = await db.execute(RECORDING_BY_ID, {"recording_id": recording_id})
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Recording with id '{recording_id}' not found"
+        )
+
+    def format_event(event: dict) -> bytes:
+        return b"event: status\ndata: " + orjson.dumps(event) + b"\n\n"
+
+    deleted_event = b"event: deleted\ndata: " + orjson.dumps({"id": str(recording_id)}) + b"\n\n"
+
+    async def stream():
+        # Subscribe before reading the current status so no change is missed
+        async with subscribe(recording_id) as events:
+            event = await _read_status_event(recording_id)
+
+            while True:
+                if event is None:
+                    yield deleted_event
+                    return
+                yield format_event(event)
+                if event["status"] in TERMINAL_STATUSES:
+                    return
+
+                last_status = event["status"]
+                while True:
+                    try:
+                        event = await asyncio.wait_for(events.get(), EVENTS_KEEPALIVE_SECONDS)
+                        break
+                    except asyncio.TimeoutError:
+                        pass
+                    # An event can be lost (a Redis blip, a worker killed
+                    # mid-run), so idle streams re-read the status rather
+                    # than wait on the subscription forever
+                    event = await _read_status_event(recording_id)
+                    if event is None or event["status"] != last_status:
+                        break
+                    yield b": keep-alive\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Keep nginx-style proxies from buffering the stream
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
 @router.post("/recordings/{recording_id}/reprocess", response_model=RecordingResponse)
 async def reprocess_recording(
     recording_id: UUID,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
-    """Reprocess a failed or completed recording"""
-    result = await db.execute(select(Recording).where(Recording.id == recording_id))
+    """
+    Reprocess a failed or completed recording
+
+    Returns 409 Conflict while the recording is still being processed.
+    """
+    # Reset status and fetch the updated row in one statement
+    result = await db.execute(RESET_FOR_REPROCESSING, {
+        "recording_id": recording_id,
+        "lease_expired_before": lease_expired_before(),
+    })
     recording = result.scalar_one_or_none()
 
     if not recording:
+        exists = await db.scalar(select(Recording.id).where(Recording.id == recording_id))
+        if exists:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Recording with id '{recording_id}' is still being processed"
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Recording with id '{recording_id}' not found"
         )
 
-    # Reset status
-    from backend.models.recording import RecordingStatus
-    recording.status = RecordingStatus.UPLOADED
-    recording.sync_error = None
-
     await db.commit()
-    await db.refresh(recording)
+    await publish_status(recording)
 
-    # Trigger async processing
-    await process_recording_async(recording.id)
+    # Process after the response has been sent
+    await schedule_processing(recording.id, background_tasks)
 
     return recording
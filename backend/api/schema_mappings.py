@@ -1,23 +1,30 @@
 """
 Schema Mapping management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import select, bindparam
+from typing import List, Optional
 from uuid import UUID
 
+from backend.core.cache import cached_json, invalidate
 from backend.core.database import get_db
 from backend.models.schema_mapping import SchemaMapping
 from backend.models.client import Client
 from backend.schemas.schema_mapping import (
     SchemaMappingCreate,
     SchemaMappingResponse,
-    SchemaMappingUpdate
+    SchemaMappingUpdate,
+    SCHEMA_MAPPING_ADAPTER,
+    SCHEMA_MAPPING_LIST_ADAPTER
 )
 
 router = APIRouter()
 
+# Built once at import; handlers only bind the id
+SCHEMA_MAPPING_BY_ID = select(SchemaMapping).where(SchemaMapping.id == bindparam("mapping_id"))
+CLIENT_ID_BY_ID = select(Client.id).where(Client.id == bindparam("client_id"))
+
 
 @router.post("/schema-mappings", response_model=SchemaMappingResponse, status_code=status.HTTP_201_CREATED)
 async def create_schema_mapping(
@@ -26,10 +33,9 @@ async def create_schema_mapping(
 ):
     """Create a new schema mapping for a client"""
     # Verify client exists
-    result = await db.execute(select(Client).where(Client.id == mapping_data.client_id))
-    client = result.scalar_one_or_none()
+    result = await db.execute(CLIENT_ID_BY_ID, {"client_id": mapping_data.client_id})
 
-    if not client:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Client with id '{mapping_data.client_id}' not found"
@@ -40,6 +46,7 @@ async def create_schema_mapping(
     db.add(new_mapping)
     await db.commit()
     await db.refresh(new_mapping)
+    await invalidate("schema_mappings")
 
     return new_mapping
 
@@ -59,28 +66,37 @@ async def list_schema_mappings(
 
     query = query.offset(skip).limit(limit)
 
-    result = await db.execute(query)
-    mappings = result.scalars().all()
+    async def load():
+        result = await db.execute(query)
+        return result.scalars().all()
 
-    return mappings
+    return await cached_json(
+        f"schema_mappings:list:{client_id}:{skip}:{limit}",
+        load,
+        SCHEMA_MAPPING_LIST_ADAPTER
+    )
 
 
 @router.get("/schema-mappings/{mapping_id}", response_model=SchemaMappingResponse)
 async def get_schema_mapping(
     mapping_id: UUID,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific schema mapping"""
-    result = await db.execute(select(SchemaMapping).where(SchemaMapping.id == mapping_id))
-    mapping = result.scalar_one_or_none()
+    async def load():
+        result = await db.execute(SCHEMA_MAPPING_BY_ID, {"mapping_id": mapping_id})
+        mapping = result.scalar_one_or_none()
 
-    if not mapping:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Schema mapping with id '{mapping_id}' not found"
-        )
+        if not mapping:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Schema mapping with id '{mapping_id}' not found"
+            )
 
-    return mapping
+        return mapping
+
+    return await cached_json(f"schema_mappings:{mapping_id}", load, SCHEMA_MAPPING_ADAPTER, if_none_match)
 
 
 @router.patch("/schema-mappings/{mapping_id}", response_model=SchemaMappingResponse)
@@ -90,7 +106,7 @@ async def update_schema_mapping(
     db: AsyncSession = Depends(get_db)
 ):
     """Update a schema mapping"""
-    result = await db.execute(select(SchemaMapping).where(SchemaMapping.id == mapping_id))
+    result = await db.execute(SCHEMA_MAPPING_BY_ID, {"mapping_id": mapping_id})
     mapping = result.scalar_one_or_none()
 
     if not mapping:
@@ -106,6 +122,7 @@ async def update_schema_mapping(
 
     await db.commit()
     await db.refresh(mapping)
+    await invalidate("schema_mappings")
 
     return mapping
 
@@ -116,7 +133,7 @@ async def delete_schema_mapping(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a schema mapping"""
-    result = await db.execute(select(SchemaMapping).where(SchemaMapping.id == mapping_id))
+    result = await db.execute(SCHEMA_MAPPING_BY_ID, {"mapping_id": mapping_id})
     mapping = result.scalar_one_or_none()
 
     if not mapping:
@@ -127,5 +144,6 @@ async def delete_schema_mapping(
 
     await db.delete(mapping)
     await db.commit()
+    await invalidate("schema_mappings")
 
     return None
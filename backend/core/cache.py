@@ -0,0 +1,187 @@
+"""
+Redis response cache
+
+Client and schema mapping configuration changes rarely but is read on every
+dashboard load, so the GET endpoints cache their serialized JSON in Redis.
+
+Each entry is written twice:
+- a fresh copy that expires after CACHE_TTL_SECONDS and is deleted on writes
+- a last-known-good copy kept for CACHE_STALE_TTL_SECONDS, served only when
+  the database is unreachable
+
+Redis is optional. If it cannot be reached the cache turns itself off for a
+short back-off period and requests go straight to the database.
+
+Usage:
+    from backend.core.cache import cached_json, invalidate
+
+    return await cached_json("clients:list:0:100", load, CLIENT_LIST_ADAPTER)
+    await invalidate("clients")
+"""
+import hashlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+import redis.asyncio as redis
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.core.config import settings
+from backend.core.responses import not_modified
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "fda"
+# Seconds to skip Redis after a connection failure
+RETRY_AFTER_SECONDS = 30
+
+_redis: Optional[redis.Redis] = None
+_pubsub_redis: Optional[redis.Redis] = None
+_unavailable_until = 0.0
+
+
+def get_redis() -> redis.Redis:
+    """Get the shared Redis client (connections are opened lazily)"""
+    global _redis
+    if _redis is None:
+        _redis = redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5
+        )
+    return _redis
+
+
+def get_pubsub_redis() -> redis.Redis:
+    """
+    Get the Redis client for pub/sub subscriptions
+
+    A subscription sits idle until the next message, which get_redis()'s
+    0.5s socket timeout would treat as a failure, so this client has none.
+    """
+    global _pubsub_redis
+    if _pubsub_redis is None:
+        _pubsub_redis = redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=None
+        )
+    return _pubsub_redis
+
+
+async def close_cache():
+    """Close the Redis connection pools on shutdown"""
+    global _redis, _pubsub_redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+    if _pubsub_redis is not None:
+        await _pubsub_redis.aclose()
+        _pubsub_redis = None
+
+
+async def run_redis(
+    operation: Callable[[redis.Redis], Awaitable[Any]],
+    client: Optional[redis.Redis] = None
+) -> Any:
+    """Run a Redis operation (on get_redis() by default), returning None if Redis is unavailable"""
+    global _unavailable_until
+
+    if time.monotonic() < _unavailable_until:
+        return None
+
+    try:
+        return await operation(client or get_redis())
+    except (RedisError, OSError) as e:
+        _unavailable_until = time.monotonic() + RETRY_AFTER_SECONDS
+        logger.warning(f"Redis unavailable, skipping cache for {RETRY_AFTER_SECONDS}s: {e}")
+        return None
+
+
+def _fresh_key(key: str) -> str:
+    return f"{KEY_PREFIX}:{key}"
+
+
+def _stale_key(key: str) -> str:
+    return f"{KEY_PREFIX}:stale:{key}"
+
+
+async def _store(key: str, body: bytes):
+    async def write(client: redis.Redis):
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.set(_fresh_key(key), body, ex=settings.CACHE_TTL_SECONDS)
+            pipe.set(_stale_key(key), body, ex=settings.CACHE_STALE_TTL_SECONDS)
+            await pipe.execute()
+
+    await run_redis(write)
+
+
+def _json_response(body: bytes, if_none_match: Optional[str], headers: Optional[dict] = None) -> Response:
+    """JSON response with a content-hash ETag, or 304 if the client has it"""
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    unchanged = not_modified(if_none_match, etag)
+    if unchanged:
+        return unchanged
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, **(headers or {})}
+    )
+
+
+async def cached_json(
+    key: str,
+    load: Callable[[], Awaitable[Any]],
+    adapter: TypeAdapter,
+    if_none_match: Optional[str] = None
+) -> Response:
+    """
+    Serve a JSON response from cache, loading and caching it on a miss
+
+    Args:
+        key: Cache key, namespaced as "<namespace>:..." for invalidation
+        load: Coroutine function returning the ORM object(s) to serialize
+        adapter: TypeAdapter for the response type, used to validate and serialize
+        if_none_match: Request If-None-Match header; a match returns 304
+
+    Returns:
+        JSON response with an ETag (marked with a Warning header if served stale)
+
+    Raises:
+        HTTPException: Propagated from load (not cached)
+        SQLAlchemyError: If the database fails and no stale copy exists
+    """
+    body = await run_redis(lambda client: client.get(_fresh_key(key)))
+    if body is not None:
+        return _json_response(body, if_none_match)
+
+    try:
+        data = await load()
+    except (SQLAlchemyError, OSError):
+        stale = await run_redis(lambda client: client.get(_stale_key(key)))
+        if stale is None:
+            raise
+        logger.warning(f"Database unavailable, serving stale cache for '{key}'")
+        return _json_response(stale, if_none_match, {"Warning": '110 - "Response is Stale"'})
+
+    body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+    await _store(key, body)
+
+    return _json_response(body, if_none_match)
+
+
+async def invalidate(namespace: str):
+    """
+    Drop all fresh cache entries in a namespace
+
+    Stale copies are left in place so they can still back a database outage.
+    """
+    async def delete_namespace(client: redis.Redis):
+        keys = [key async for key in client.scan_iter(match=_fresh_key(f"{namespace}:*"), count=500)]
+        if keys:
+            await client.delete(*keys)
+
+    await run_redis(delete_namespace)
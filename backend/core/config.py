@@ -17,9 +17,16 @@ Usage:
     # Access settings
     api_key = settings.WHISPER_API_KEY
     is_prod = settings.is_production
+
+    # Or, as a FastAPI dependency
+    def endpoint(settings: Settings = Depends(get_settings)): ...
+
+Settings are loaded on first access (not at import) and cached for the life
+of the process, so .env is read and validated once.
 """
+from functools import cached_property, lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Tuple
 import os
 
 
@@ -59,9 +66,21 @@ class Settings(BaseSettings):
     # ==================== Application Settings ====================
     APP_NAME: str = "Farm Data Automation"
     DEBUG: bool = False
+    # Threads for blocking work (password hashing, upload hashing, local Whisper)
+    WORKER_THREADS: int = (os.cpu_count() or 1) * 2
     # Comma-separated list of allowed CORS origins for frontend access
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:8000"
 
+    @cached_property
+    def origins(self) -> Tuple[str, ...]:
+        """
+        ALLOWED_ORIGINS parsed once into a tuple for CORS middleware
+
+        Returns:
+            Tuple of allowed origin URLs
+        """
+        return tuple(origin.strip() for origin in self.ALLOWED_ORIGINS.split(','))
+
     def get_origins_list(self) -> List[str]:
         """
         Parse ALLOWED_ORIGINS into a list for CORS middleware
@@ -69,9 +88,7 @@ class Settings(BaseSettings):
         Returns:
             List of allowed origin URLs
         """
-        if isinstance(self.ALLOWED_ORIGINS, str):
-            return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(',')]
-        return self.ALLOWED_ORIGINS
+        return list(self.origins)
 
     # ==================== Database Settings ====================
     # Auto-switches: SQLite for development, PostgreSQL for production
@@ -81,6 +98,16 @@ class Settings(BaseSettings):
         "sqlite+aiosqlite:///./farm_data.db"
     )
 
+    # Connection pool sizing (PostgreSQL only - SQLite uses SQLAlchemy's defaults)
+    # The API and background processing share one pool, so size it for both
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_TIMEOUT: int = 10  # Seconds to wait for a connection before erroring
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    # asyncpg prepared statement caches (set both to 0 behind PgBouncer in transaction mode)
+    DB_STATEMENT_CACHE_SIZE: int = 1024
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 512
+
     # ==================== Storage Settings ====================
     # Auto-detects environment: uses ./storage/recordings for development,
     # /app/storage/recordings for production (Docker/cloud deployments)
@@ -106,6 +133,20 @@ class Settings(BaseSettings):
     # Model options: tiny, base, small, medium, large
     # Recommended: "base" for good balance of speed and quality
     WHISPER_LOCAL_MODEL: str = os.getenv("WHISPER_LOCAL_MODEL", "base")
+    # "auto" uses a CUDA GPU (int8_float16) when one is available, else CPU (int8)
+    WHISPER_DEVICE: str = "auto"
+    # Local transcriptions run at once (others wait). Each already uses every
+    # CPU core, so 1 on CPU; raise it on a GPU with spare capacity.
+    WHISPER_LOCAL_WORKERS: int = 1
+    # On a GPU, speech segments of a recording decoded together per batch
+    # (1 decodes them one after another)
+    WHISPER_BATCH_SIZE: int = 8
+    # Load and warm up the local model at startup instead of on the first recording
+    WHISPER_PRELOAD: bool = True
+
+    # Max concurrent Whisper API requests per process (extra requests wait)
+    WHISPER_MAX_CONCURRENCY: int = 4
+    WHISPER_HTTP_POOL_SIZE: int = 20  # Connections kept open to the Whisper API
 
     # ==================== Groq AI Settings ====================
     # Used for structured data extraction from transcribed text
@@ -114,6 +155,12 @@ class Settings(BaseSettings):
     GROQ_API_KEY: str = ""
     GROQ_MODEL: str = "llama-3.1-70b-versatile"
     GROQ_TEMPERATURE: float = 0.1  # Low temperature for consistent extraction
+    # Tried first (~3x faster); GROQ_MODEL is used only when its answer is
+    # uncertain or incomplete. Empty to always use GROQ_MODEL.
+    GROQ_FAST_MODEL: str = "llama-3.1-8b-instant"
+    GROQ_MAX_TOKENS: int = 1024  # Extraction JSON is a few hundred tokens
+    GROQ_MAX_CONCURRENCY: int = 4  # Max concurrent Groq requests per process
+    GROQ_HTTP_POOL_SIZE: int = 20  # Connections kept open to the Groq API
 
     # ==================== Azure Settings (Legacy) ====================
     # DEPRECATED: Kept for backward compatibility during migration
@@ -139,11 +186,30 @@ class Settings(BaseSettings):
     DYNAMICS_CLIENT_ID: str = ""  # Azure AD App Registration Client ID
     DYNAMICS_CLIENT_SECRET: str = ""  # Azure AD App Registration Client Secret
     DYNAMICS_TENANT_ID: str = ""  # Azure AD Tenant ID
+    DYNAMICS_MAX_CONCURRENCY: int = 16  # Max concurrent Dynamics/Azure AD requests per process
+    DYNAMICS_MAX_ATTEMPTS: int = 3  # Tries per request on 429/5xx (exponential backoff)
 
-    # ==================== Queue Settings ====================
-    # Redis URL for background job processing (future feature)
-    # Not currently used - processing is done synchronously
+    # ==================== Redis Settings ====================
+    # Used to cache client and schema mapping GET responses
+    # Optional - the API falls back to the database if Redis is unreachable
     REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_TTL_SECONDS: int = 30  # Fresh cache lifetime
+    CACHE_STALE_TTL_SECONDS: int = 86400  # Last-known-good copy served if the DB is down
+    TRANSCRIPTION_CACHE_TTL_SECONDS: int = 604800  # Transcripts of identical audio reused for a week
+    EXTRACTION_CACHE_TTL_SECONDS: int = 86400  # AI extractions of identical transcripts reused for a day
+
+    # ==================== Processing Settings ====================
+    # "background": recordings are processed inside the API process (no extra
+    #   services - fine for development and small deployments)
+    # "celery": recordings are queued in Redis for Celery workers, surviving
+    #   restarts (see backend/workers/tasks.py)
+    PROCESSING_BACKEND: str = "background"
+    CELERY_BROKER_URL: str = "redis://localhost:6379/1"  # Separate DB from the cache
+    CELERY_VISIBILITY_TIMEOUT: int = 3600  # Seconds before an unacknowledged task is redelivered
+    # Seconds a processing run may take: Celery stops a task after this, and a
+    # claim older than this is treated as abandoned. Keep it below
+    # CELERY_VISIBILITY_TIMEOUT so a run is stopped before its task is redelivered
+    PROCESSING_TIME_LIMIT: int = 1800
 
     # ==================== Security Settings ====================
     # SECRET_KEY: Change this to a random secure string in production
@@ -153,4 +219,15 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30  # Session timeout duration
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings on first call and return the same instance afterwards"""
+    return Settings()
+
+
+def __getattr__(name: str):
+    # Lazy module attribute so `from backend.core.config import settings`
+    # keeps working without constructing Settings at import time
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,186 @@
+"""
+Recording status events
+
+The recording processor publishes a status event on each status change, and the
+/recordings/{id}/events endpoint relays them to the browser as Server-Sent
+Events so the dashboard doesn't have to poll.
+
+Events go to two places:
+- subscribers in this process (an asyncio.Queue per subscriber)
+- the Redis channel "recording:{id}", for API instances in other processes
+
+A subscriber listens on Redis when it is reachable (on its own connection
+without a read timeout, see get_pubsub_redis) and falls back to in-process
+delivery otherwise, so single-process deployments work without Redis.
+
+The latest published status is also kept in Redis for an hour. The transient
+PROCESSING status is published without being committed, so current_status()
+/ current_statuses() is what polling endpoints report.
+
+Usage:
+    from backend.core.events import publish_status, subscribe
+
+    await publish_status(recording)
+
+    async with subscribe(recording_id) as events:
+        event = await events.get()
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Set
+from uuid import UUID
+
+import orjson
+from redis.exceptions import RedisError
+
+from backend.core.cache import KEY_PREFIX, get_pubsub_redis, run_redis
+from backend.models.recording import RecordingStatus
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which no further events are published
+TERMINAL_STATUSES = frozenset({RecordingStatus.SYNCED.value, RecordingStatus.FAILED.value})
+
+# Published statuses outlive any single processing run
+STATUS_TTL_SECONDS = 3600
+
+_local_subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+
+def _channel(recording_id) -> str:
+    return f"recording:{recording_id}"
+
+
+def _status_key(recording_id) -> str:
+    return f"{KEY_PREFIX}:recording-status:{recording_id}"
+
+
+def status_event(recording) -> dict:
+    """Build the event payload for a recording's current state"""
+    return {
+        "id": str(recording.id),
+        "status": recording.status.value,
+        "sync_error": recording.sync_error,
+    }
+
+
+async def publish_status(recording):
+    """
+    Publish a recording's current status to all subscribers
+
+    Args:
+        recording: Recording model instance (status committed, or a transient
+            in-progress status that will be committed with the next step)
+    """
+    event = status_event(recording)
+    channel = _channel(recording.id)
+
+    for queue in _local_subscribers.get(channel, ()):
+        queue.put_nowait(event)
+
+    async def publish(client):
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.publish(channel, orjson.dumps(event))
+            pipe.set(_status_key(recording.id), event["status"], ex=STATUS_TTL_SECONDS)
+            await pipe.execute()
+
+    await run_redis(publish)
+
+
+async def current_status(recording) -> str:
+    """
+    A recording's latest status value
+
+    The database's status, unless it is still in progress and a newer
+    transient status has been published since.
+    """
+    status = recording.status.value
+    if status in TERMINAL_STATUSES:
+        return status
+
+    published = await run_redis(lambda client: client.get(_status_key(recording.id)))
+    return published.decode() if published else status
+
+
+async def current_statuses(recordings) -> Dict[UUID, str]:
+    """
+    Published statuses that are newer than the database's, for many recordings
+
+    One Redis round trip for the whole batch (see current_status).
+
+    Returns:
+        Recording id -> status value, only for recordings whose published
+        status differs from the stored one
+    """
+    pending = [recording for recording in recordings if recording.status.value not in TERMINAL_STATUSES]
+    if not pending:
+        return {}
+
+    published = await run_redis(
+        lambda client: client.mget([_status_key(recording.id) for recording in pending])
+    )
+    if not published:
+        return {}
+
+    return {
+        recording.id: value.decode()
+        for recording, value in zip(pending, published)
+        if value and value.decode() != recording.status.value
+    }
+
+
+async def _relay_redis(pubsub, queue: asyncio.Queue):
+    """Copy messages from a Redis subscription into a queue"""
+    try:
+        async for message in pubsub.listen():
+            if message["type"] == "message":
+                queue.put_nowait(orjson.loads(message["data"]))
+    except (RedisError, OSError) as e:
+        logger.warning(f"Lost Redis subscription: {e}")
+
+
+@asynccontextmanager
+async def subscribe(recording_id: UUID) -> AsyncIterator[asyncio.Queue]:
+    """
+    Subscribe to status events for one recording
+
+    Yields:
+        Queue that receives event dicts (see status_event)
+    """
+    channel = _channel(recording_id)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def open_subscription(client):
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(channel)
+        except BaseException:
+            await pubsub.aclose()
+            raise
+        return pubsub
+
+    pubsub = await run_redis(open_subscription, get_pubsub_redis())
+
+    if pubsub is None:
+        # Redis unavailable - only events from this process are delivered
+        _local_subscribers[channel].add(queue)
+        try:
+            yield queue
+        finally:
+            _local_subscribers[channel].discard(queue)
+            if not _local_subscribers[channel]:
+                del _local_subscribers[channel]
+        return
+
+    relay = asyncio.create_task(_relay_redis(pubsub, queue))
+    try:
+        yield queue
+    finally:
+        relay.cancel()
+        try:
+            await pubsub.unsubscribe(channel)
+        except (RedisError, OSError):
+            pass
+        await pubsub.aclose()
@@ -0,0 +1,134 @@
+"""
+Response helpers: streamed JSON arrays, conditional (ETag) responses and
+response compression
+"""
+import logging
+from typing import Awaitable, Callable, Optional
+
+from fastapi import status
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.sql import Select
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+from backend.core.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the database and written to the client per chunk
+STREAM_BATCH_SIZE = 100
+
+# Sent as events happen: gzip would hold them back in its buffer
+UNCOMPRESSED_MEDIA_TYPES = ("text/event-stream",)
+
+
+async def stream_json_array(
+    query: Select,
+    adapter: TypeAdapter,
+    transform: Optional[Callable[[list], Awaitable[list]]] = None
+) -> StreamingResponse:
+    """
+    Stream the rows of an ORM query as a JSON array
+
+    Rows are read with a server-side cursor and serialized one batch at a time,
+    so memory use stays flat regardless of how many rows are returned.
+
+    The query runs in its own session: request-scoped sessions from get_db are
+    closed before a streaming body is sent. The query is executed and its
+    first batch serialized before the response is built, so a failing query
+    raises here and the client gets an error status instead of a 200 with a
+    truncated body.
+
+    Args:
+        query: select() of an ORM entity
+        adapter: TypeAdapter for a List[...] of the response schema (with
+            from_attributes), used to serialize each batch in one call
+        transform: Optional coroutine function applied to each batch of
+            validated response models before it is serialized
+
+    Returns:
+        StreamingResponse with media type application/json
+    """
+    async def serialize(batch) -> bytes:
+        items = adapter.validate_python(batch, from_attributes=True)
+        if transform is not None:
+            items = await transform(items)
+        # "[row,row,...]" -> "row,row,..."
+        return adapter.dump_json(items)[1:-1]
+
+    session = AsyncSessionLocal()
+    try:
+        rows = await session.stream_scalars(
+            query.execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        partitions = rows.partitions()
+        first_batch = await anext(partitions, None)
+        first_chunk = await serialize(first_batch) if first_batch else b""
+    except BaseException:
+        await session.close()
+        raise
+
+    async def body():
+        try:
+            yield b"[" + first_chunk
+            empty = not first_chunk
+            async for batch in partitions:
+                chunk = await serialize(batch)
+                yield chunk if empty else b"," + chunk
+                empty = False
+            yield b"]"
+        except Exception as e:
+            # Headers are already sent, so the client sees a truncated body
+            logger.error(f"Error streaming rows: {str(e)}")
+            raise
+        finally:
+            await session.close()
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+def not_modified(if_none_match: Optional[str], etag: str) -> Optional[Response]:
+    """
+    Build a 304 response if the client already has this version
+
+    Args:
+        if_none_match: Value of the request's If-None-Match header
+        etag: ETag of the current representation
+
+    Returns:
+        304 Not Modified response, or None if the client's copy is out of date
+    """
+    if not if_none_match:
+        return None
+
+    # Weak comparison: W/"x" matches "x"
+    current = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == current:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    return None
+
+
+class _SelectiveGZipResponder(GZipResponder):
+    async def send_with_gzip(self, message: Message) -> None:
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith(UNCOMPRESSED_MEDIA_TYPES):
+                # Starlette's pass-through path for already-encoded responses
+                self.content_encoding_set = True
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves UNCOMPRESSED_MEDIA_TYPES (Server-Sent Events) as they are"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _SelectiveGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -0,0 +1,65 @@
+"""
+Password hashing helpers
+
+Dashboard login passwords are stored in client.settings["password_hash"] as
+bcrypt hashes. Older rows may still carry a plaintext settings["password"];
+those are compared in constant time until the client is re-provisioned.
+"""
+import asyncio
+import hmac
+from typing import Dict, Optional
+
+from passlib.context import CryptContext
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    """Hash a password with bcrypt"""
+    return pwd_context.hash(password)
+
+
+def hash_settings_password(client_settings: Optional[Dict]) -> Optional[Dict]:
+    """
+    Replace a plaintext settings["password"] with settings["password_hash"]
+
+    Args:
+        client_settings: Client settings dict from a create/update request
+
+    Returns:
+        Copy of the settings with the password hashed (or the input unchanged)
+    """
+    if not client_settings or "password" not in client_settings:
+        return client_settings
+
+    hashed = dict(client_settings)
+    hashed["password_hash"] = hash_password(hashed.pop("password"))
+    return hashed
+
+
+async def verify_client_password(client_settings: Optional[Dict], password: str) -> bool:
+    """
+    Check a login password against a client's stored credentials
+
+    bcrypt verification is CPU-bound (~10ms+), so it runs in a worker thread
+    to keep the event loop free for other requests.
+
+    Args:
+        client_settings: Client settings dict
+        password: Password supplied at login
+
+    Returns:
+        True if the password matches
+    """
+    if not client_settings:
+        return False
+
+    password_hash = client_settings.get("password_hash")
+    if password_hash:
+        return await asyncio.to_thread(pwd_context.verify, password, password_hash)
+
+    # Legacy plaintext password
+    stored_password = client_settings.get("password")
+    if stored_password is None:
+        return False
+    return hmac.compare_digest(stored_password.encode(), password.encode())
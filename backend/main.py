@@ -4,14 +4,19 @@ Farm Data Automation - Main FastAPI Application
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import os
 from pathlib import Path
 
 from backend.api import recordings, health, clients, schema_mappings, auth
-from backend.core.config import settings
+from backend.core.config import get_settings
 from backend.core.database import init_db
+from backend.core.cache import close_cache
+from backend.core.responses import SelectiveGZipMiddleware
 
 # Configure logging
 logging.basicConfig(
@@ -25,28 +30,51 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     logger.info("Starting up Farm Data Automation API...")
+    # Bound the pool used by asyncio.to_thread() and run_in_executor(None)
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=get_settings().WORKER_THREADS)
+    )
     await init_db()
     logger.info("Database initialized")
+    settings = get_settings()
+    # Celery workers transcribe in their own processes; the API only queues
+    if settings.WHISPER_MODE == "local" and settings.WHISPER_PRELOAD and settings.PROCESSING_BACKEND != "celery":
+        # Imported here so API-mode and queue-only deployments never load it
+        try:
+            from backend.services.whisper_local import preload_local_whisper
+        except ImportError as e:
+            logger.error(f"Local Whisper unavailable, not preloading: {str(e)}")
+        else:
+            await preload_local_whisper(settings.WHISPER_LOCAL_MODEL)
     yield
     logger.info("Shutting down Farm Data Automation API...")
+    await close_cache()
+    # Imported here so startup doesn't load httpx before a recording needs it
+    from backend.services.dynamics_client import close_http_client
+    await close_http_client()
 
 
 app = FastAPI(
     title="Farm Data Automation API",
     description="ML/AI data processing agent for agricultural voice recordings",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.get_origins_list(),
+    allow_origins=get_settings().origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress JSON responses over 1KB (recording lists, extracted data); status
+# event streams are left uncompressed so each event is sent when it happens
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
 app.include_router(health.router, prefix="/api/v1", tags=["health"])
 app.include_router(auth.router, prefix="/api/v1", tags=["authentication"])
@@ -60,12 +88,20 @@ if frontend_path.exists():
     app.mount("/static", StaticFiles(directory=str(frontend_path / "static")), name="static")
 
 
+# Resolved once at startup rather than checked on every request
+INDEX_HTML = frontend_path / "templates" / "index.html"
+if not INDEX_HTML.exists():
+    INDEX_HTML = None
+
+# Browsers may reuse the dashboard page for a few minutes
+INDEX_CACHE_HEADERS = {"Cache-Control": "public, max-age=300"}
+
+
 @app.get("/")
 async def root():
     """Serve frontend dashboard"""
-    frontend_html = frontend_path / "templates" / "index.html"
-    if frontend_html.exists():
-        return FileResponse(frontend_html)
+    if INDEX_HTML:
+        return FileResponse(INDEX_HTML, headers=INDEX_CACHE_HEADERS)
     else:
         return {
             "message": "Farm Data Automation API",
@@ -86,10 +122,17 @@ async def api_root():
 
 if __name__ == "__main__":
     import uvicorn
+    production = get_settings().is_production
     uvicorn.run(
         "backend.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        # The reloader watches the source tree for changes - development only
+        reload=not production,
+        workers=min(os.cpu_count() or 1, 4) if production else None,
+        # uvloop and httptools (from uvicorn[standard]) where available; "auto"
+        # falls back to asyncio/h11 on platforms without them, such as Windows
+        loop="auto",
+        http="auto",
         log_level="info"
     )
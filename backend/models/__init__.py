@@ -1,4 +1,13 @@
-"""Database models package"""
+"""
+Database models package
+
+Relationships are declared lazy="raise": with async sessions an implicit lazy
+load can't run, and every awaited per-row load is an extra round-trip. Load
+related objects explicitly in the query instead:
+
+    select(Client).options(selectinload(Client.recordings))
+    select(Recording).options(selectinload(Recording.client))
+"""
 from backend.models.client import Client
 from backend.models.recording import Recording
 from backend.models.schema_mapping import SchemaMapping
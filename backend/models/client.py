@@ -1,41 +1,64 @@
 """
 Client model for multi-tenant support
 """
-from sqlalchemy import Column, String, Boolean, DateTime, Text, JSON
+from sqlalchemy import String, Boolean, DateTime, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
+from typing import List, Optional, TYPE_CHECKING
 import uuid
 
-from backend.core.database import Base
+from backend.core.database import Base, JSONDocument, gen_random_uuid, utc_now
+
+if TYPE_CHECKING:
+    from backend.models.recording import Recording
+    from backend.models.schema_mapping import SchemaMapping
 
 
 class Client(Base):
     """Client/Tenant model"""
     __tablename__ = "clients"
+    # Fetch database-generated timestamps in the INSERT/UPDATE itself (RETURNING)
+    # instead of expiring them, which would need a lazy load after every flush
+    __mapper_args__ = {"eager_defaults": True}
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    name = Column(String(255), nullable=False, unique=True)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
+    name: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
 
     # Dynamics 365 credentials (encrypted in production)
-    dynamics_url = Column(String(500), nullable=False)
-    dynamics_client_id = Column(String(255), nullable=False)
-    dynamics_client_secret = Column(Text, nullable=False)  # Should be encrypted
-    dynamics_tenant_id = Column(String(255), nullable=False)
+    dynamics_url: Mapped[str] = mapped_column(String(500), nullable=False)
+    dynamics_client_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    dynamics_client_secret: Mapped[str] = mapped_column(Text, nullable=False)  # Should be encrypted
+    dynamics_tenant_id: Mapped[str] = mapped_column(String(255), nullable=False)
 
     # Client status
-    is_active = Column(Boolean, default=True, nullable=False)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=utc_now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=utc_now(), onupdate=utc_now(), nullable=False
+    )
 
     # Additional settings (JSON)
-    settings = Column(JSON, default={})
+    settings: Mapped[Optional[dict]] = mapped_column(JSONDocument, default={})
 
     # Relationships
-    recordings = relationship("Recording", back_populates="client", cascade="all, delete-orphan")
-    schema_mappings = relationship("SchemaMapping", back_populates="client", cascade="all, delete-orphan")
+    recordings: Mapped[List["Recording"]] = relationship(
+        back_populates="client", cascade="all, delete-orphan", lazy="raise"
+    )
+    schema_mappings: Mapped[List["SchemaMapping"]] = relationship(
+        back_populates="client", cascade="all, delete-orphan", lazy="raise"
+    )
 
     def __repr__(self):
         return f"<Client(id={self.id}, name={self.name})>"
+
+
+# Login looks clients up by settings->>'username'; index it on PostgreSQL so the
+# lookup is a single index probe instead of a scan over every active client
+Index(
+    "ix_clients_settings_username",
+    Client.settings["username"].as_string(),
+    postgresql_where=Client.is_active,
+).ddl_if(dialect="postgresql")
@@ -1,14 +1,18 @@
 """
 Recording model for voice recordings and processing
 """
-from sqlalchemy import Column, String, DateTime, Text, Enum, ForeignKey, Integer, JSON
+from sqlalchemy import String, DateTime, Text, Enum, ForeignKey, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, query_expression
 from datetime import datetime
+from typing import Optional, TYPE_CHECKING
 import uuid
 import enum
 
-from backend.core.database import Base
+from backend.core.database import Base, JSONDocument, gen_random_uuid, utc_now
+
+if TYPE_CHECKING:
+    from backend.models.client import Client
 
 
 class RecordingStatus(str, enum.Enum):
@@ -22,43 +26,110 @@ class RecordingStatus(str, enum.Enum):
     FAILED = "failed"
 
 
+# Characters of transcription included in recording list responses
+TRANSCRIPTION_PREVIEW_LENGTH = 100
+
+
 class Recording(Base):
     """Voice recording model"""
     __tablename__ = "recordings"
+    # Fetch database-generated timestamps in the INSERT/UPDATE itself (RETURNING)
+    # instead of expiring them, which would need a lazy load after every flush
+    __mapper_args__ = {"eager_defaults": True}
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
+    client_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False)
 
     # File information
-    filename = Column(String(500), nullable=False)
-    blob_url = Column(Text, nullable=True)  # Legacy Azure storage (nullable for migration)
-    file_path = Column(Text, nullable=True)  # New local storage path
-    file_size = Column(Integer)
-    content_type = Column(String(100))
+    filename: Mapped[str] = mapped_column(String(500), nullable=False)
+    # Legacy Azure storage (nullable for migration)
+    blob_url: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    file_path: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # New local storage path
+    file_size: Mapped[Optional[int]] = mapped_column(Integer)
+    content_type: Mapped[Optional[str]] = mapped_column(String(100))
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64))  # BLAKE2b-256 hex digest of the audio, for dedupe
 
     # Processing status
-    status = Column(Enum(RecordingStatus), default=RecordingStatus.UPLOADED, nullable=False)
+    # Stored as the plain value in a VARCHAR with a CHECK constraint, not a
+    # native enum type, so new statuses don't need an ALTER TYPE migration
+    status: Mapped[RecordingStatus] = mapped_column(
+        Enum(
+            RecordingStatus,
+            native_enum=False,
+            length=16,
+            create_constraint=True,
+            name="ck_recordings_status",
+            values_callable=lambda statuses: [status.value for status in statuses],
+        ),
+        default=RecordingStatus.UPLOADED,
+        nullable=False,
+        index=True
+    )
 
     # Transcription
-    transcription_text = Column(Text)
-    transcription_confidence = Column(String(10))  # LOW, MEDIUM, HIGH
+    transcription_text: Mapped[Optional[str]] = mapped_column(Text)
+    transcription_confidence: Mapped[Optional[str]] = mapped_column(String(10))  # LOW, MEDIUM, HIGH
 
     # AI Processing
-    extracted_data = Column(JSON)  # Extracted fields from AI
-    entity_type = Column(String(100))  # Dynamics entity type (e.g., "animal", "farm")
-    confidence_score = Column(String(10))
+    extracted_data: Mapped[Optional[dict]] = mapped_column(JSONDocument)  # Extracted fields from AI
+    entity_type: Mapped[Optional[str]] = mapped_column(String(100))  # Dynamics entity type (e.g., "animal", "farm")
+    confidence_score: Mapped[Optional[str]] = mapped_column(String(10))
 
     # Dynamics 365 sync
-    dynamics_record_id = Column(String(255))  # ID in Dynamics 365
-    sync_error = Column(Text)
+    dynamics_record_id: Mapped[Optional[str]] = mapped_column(String(255), index=True)  # ID in Dynamics 365
+    sync_error: Mapped[Optional[str]] = mapped_column(Text)
 
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-    processed_at = Column(DateTime)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=utc_now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=utc_now(), onupdate=utc_now(), nullable=False
+    )
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    # When the current processing run claimed the recording (its lease start)
+    claimed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+    # Truncated transcription, only populated by queries using with_expression()
+    transcription_preview: Mapped[Optional[str]] = query_expression()
 
     # Relationships
-    client = relationship("Client", back_populates="recordings")
+    client: Mapped["Client"] = relationship(back_populates="recordings", lazy="raise")
 
     def __repr__(self):
         return f"<Recording(id={self.id}, filename={self.filename}, status={self.status})>"
+
+
+# Matches the dashboard listing (filter by client, newest first) so keyset
+# pagination on (created_at, id) is an index range scan at any page depth
+Index(
+    "ix_recordings_client_created",
+    Recording.client_id,
+    Recording.created_at.desc(),
+    Recording.id.desc(),
+)
+
+# Same listing filtered by status (e.g. a client's failed recordings), still
+# returned in keyset order without a sort step
+Index(
+    "ix_recordings_client_status_created",
+    Recording.client_id,
+    Recording.status,
+    Recording.created_at.desc(),
+    Recording.id.desc(),
+)
+
+# Containment queries on extracted fields (extracted_data @> '{"animal_id": ...}');
+# jsonb_path_ops keeps the index small and supports exactly that operator
+Index(
+    "ix_recordings_extracted_data",
+    Recording.extracted_data,
+    postgresql_using="gin",
+    postgresql_ops={"extracted_data": "jsonb_path_ops"},
+).ddl_if(dialect="postgresql")
+
+# Finds an earlier upload of the same audio for a client, so processing can
+# reuse its transcription and extraction
+Index(
+    "ix_recordings_client_content_hash",
+    Recording.client_id,
+    Recording.content_hash,
+)
@@ -1,50 +1,59 @@
 """
 Schema mapping model for client-specific Dynamics 365 field mappings
 """
-from sqlalchemy import Column, String, DateTime, Text, Boolean, ForeignKey, JSON
+from sqlalchemy import String, DateTime, Text, Boolean, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
+from typing import List, Optional, TYPE_CHECKING
 import uuid
 
-from backend.core.database import Base
+from backend.core.database import Base, JSONDocument, gen_random_uuid, utc_now
+
+if TYPE_CHECKING:
+    from backend.models.client import Client
 
 
 class SchemaMapping(Base):
     """Schema mapping for client-specific Dynamics 365 entities"""
     __tablename__ = "schema_mappings"
+    # Fetch database-generated timestamps in the INSERT/UPDATE itself (RETURNING)
+    # instead of expiring them, which would need a lazy load after every flush
+    __mapper_args__ = {"eager_defaults": True}
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
+    client_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False)
 
     # Entity information
-    entity_name = Column(String(255), nullable=False)  # e.g., "animal", "farm", "treatment"
-    dynamics_entity_name = Column(String(255), nullable=False)  # Actual Dynamics entity name
+    entity_name: Mapped[str] = mapped_column(String(255), nullable=False)  # e.g., "animal", "farm", "treatment"
+    dynamics_entity_name: Mapped[str] = mapped_column(String(255), nullable=False)  # Actual Dynamics entity name
 
     # Field mappings (JSON structure)
     # Format: {"ai_field": "dynamics_field", "animal_id": "msdyn_animalid", ...}
-    field_mappings = Column(JSON, nullable=False, default={})
+    field_mappings: Mapped[dict] = mapped_column(JSONDocument, nullable=False, default={})
 
     # Validation rules (JSON structure)
     # Format: {"field_name": {"type": "string", "required": true, "pattern": "..."}}
-    validation_rules = Column(JSON, default={})
+    validation_rules: Mapped[Optional[dict]] = mapped_column(JSONDocument, default={})
 
     # Keywords/triggers for entity detection
     # List of keywords that indicate this entity type
-    detection_keywords = Column(JSON, default=[])
+    detection_keywords: Mapped[Optional[List[str]]] = mapped_column(JSONDocument, default=[])
 
     # Status
-    is_active = Column(Boolean, default=True, nullable=False)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
     # Description/notes
-    description = Column(Text)
+    description: Mapped[Optional[str]] = mapped_column(Text)
 
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=utc_now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=utc_now(), onupdate=utc_now(), nullable=False
+    )
 
     # Relationships
-    client = relationship("Client", back_populates="schema_mappings")
+    client: Mapped["Client"] = relationship(back_populates="schema_mappings", lazy="raise")
 
     def __repr__(self):
         return f"<SchemaMapping(id={self.id}, entity={self.entity_name})>"
@@ -209,6 +209,34 @@ BIOTRACK_DETECTION_KEYWORDS = [
 ]
 
 
+def _required_fields(newborn: bool, has_birth_weight: bool) -> tuple:
+    """Fields required in one situation, in BIOTRACK_REQUIRED_FIELDS order"""
+    fields = []
+    for field_name, field_config in BIOTRACK_REQUIRED_FIELDS.items():
+        required = field_config.get("required")
+        condition = field_config.get("condition", "").lower()
+
+        if required is True:
+            fields.append(field_name)
+        elif required == "conditional":
+            # Birth season required for newborn animals
+            if "newborn" in condition and newborn:
+                fields.append(field_name)
+            # Birth weight UoM required if birth weight provided
+            if "birth_weight" in condition and has_birth_weight:
+                fields.append(field_name)
+    return tuple(fields)
+
+
+# Required fields for each (newborn, has birth weight) combination, resolved
+# once instead of re-reading every field's config on each call
+_REQUIRED_FIELDS = {
+    (newborn, has_birth_weight): _required_fields(newborn, has_birth_weight)
+    for newborn in (False, True)
+    for has_birth_weight in (False, True)
+}
+
+
 def get_missing_required_fields(extracted_data: Dict, category: str = None) -> List[str]:
     """
     Identify which required fields are missing from extracted data
@@ -220,29 +248,11 @@ def get_missing_required_fields(extracted_data: Dict, category: str = None) -> L
     Returns:
         List of missing required field names
     """
-    missing_fields = []
-
-    for field_name, field_config in BIOTRACK_REQUIRED_FIELDS.items():
-        # Check always required fields
-        if field_config.get("required") is True:
-            if field_name not in extracted_data or not extracted_data[field_name]:
-                missing_fields.append(field_name)
-
-        # Check conditionally required fields
-        elif field_config.get("required") == "conditional":
-            condition = field_config.get("condition", "")
-
-            # Birth season required for newborn animals
-            if "newborn" in condition.lower() and category == AnimalCategory.NEWBORN.value:
-                if field_name not in extracted_data or not extracted_data[field_name]:
-                    missing_fields.append(field_name)
-
-            # Birth weight UoM required if birth weight provided
-            if "birth_weight" in condition.lower() and "birth_weight" in extracted_data:
-                if field_name not in extracted_data or not extracted_data[field_name]:
-                    missing_fields.append(field_name)
-
-    return missing_fields
+    required_fields = _REQUIRED_FIELDS[
+        category == AnimalCategory.NEWBORN.value,
+        "birth_weight" in extracted_data
+    ]
+    return [field_name for field_name in required_fields if not extracted_data.get(field_name)]
 
 
 def format_missing_fields_prompt(missing_fields: List[str]) -> str:
@@ -258,14 +268,13 @@ def format_missing_fields_prompt(missing_fields: List[str]) -> str:
     if not missing_fields:
         return ""
 
-    field_descriptions = []
-    for field_name in missing_fields:
-        field_config = BIOTRACK_REQUIRED_FIELDS.get(field_name, {})
-        description = field_config.get("description", field_name)
-        field_descriptions.append(f"- {description}")
-
-    prompt = "The following required information is missing from your recording:\n\n"
-    prompt += "\n".join(field_descriptions)
-    prompt += "\n\nPlease provide these details."
+    field_descriptions = "\n".join(
+        f"- {BIOTRACK_REQUIRED_FIELDS.get(field_name, {}).get('description', field_name)}"
+        for field_name in missing_fields
+    )
 
-    return prompt
+    return (
+        "The following required information is missing from your recording:\n\n"
+        f"{field_descriptions}\n\n"
+        "Please provide these details."
+    )
@@ -1,11 +1,21 @@
 """
 Client schemas for API validation and responses
 """
-from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_serializer, field_validator
+from typing import Optional, Dict, List
 from datetime import datetime
 from uuid import UUID
 
+# Login credentials kept in client.settings, never sent to API clients
+SECRET_SETTINGS = frozenset({"password", "password_hash"})
+
+
+def _reject_password_hash(settings: Optional[Dict]) -> Optional[Dict]:
+    # Hashes are only made by the API from a plaintext settings["password"]
+    if settings and "password_hash" in settings:
+        raise ValueError("password_hash can't be set directly; send settings.password instead")
+    return settings
+
 
 class ClientBase(BaseModel):
     """Base client schema"""
@@ -20,6 +30,8 @@ class ClientCreate(ClientBase):
     dynamics_client_secret: str
     settings: Optional[Dict] = {}
 
+    _check_settings = field_validator("settings")(_reject_password_hash)
+
 
 class ClientUpdate(BaseModel):
     """Schema for updating a client"""
@@ -31,6 +43,8 @@ class ClientUpdate(BaseModel):
     is_active: Optional[bool] = None
     settings: Optional[Dict] = None
 
+    _check_settings = field_validator("settings")(_reject_password_hash)
+
 
 class ClientResponse(ClientBase):
     """Schema for client response"""
@@ -40,5 +54,14 @@ class ClientResponse(ClientBase):
     updated_at: datetime
     settings: Dict
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, revalidate_instances="never", defer_build=True)
+
+    @field_serializer("settings")
+    def _public_settings(self, settings: Dict) -> Dict:
+        # Also keeps them out of the cached JSON, which is this serialization
+        return {key: value for key, value in settings.items() if key not in SECRET_SETTINGS}
+
+
+# Compiled once and reused to validate and serialize responses from ORM rows
+CLIENT_ADAPTER = TypeAdapter(ClientResponse)
+CLIENT_LIST_ADAPTER = TypeAdapter(List[ClientResponse])
@@ -1,8 +1,8 @@
 """
 Recording schemas for API validation and responses
 """
-from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import Optional, Dict, List
 from datetime import datetime
 from uuid import UUID
 from backend.models.recording import RecordingStatus
@@ -23,9 +23,10 @@ class RecordingResponse(BaseModel):
     id: UUID
     client_id: UUID
     filename: str
-    blob_url: str
+    blob_url: Optional[str]
     file_size: Optional[int]
     content_type: Optional[str]
+    content_hash: Optional[str]
     status: RecordingStatus
     transcription_text: Optional[str]
     transcription_confidence: Optional[str]
@@ -38,8 +39,33 @@ class RecordingResponse(BaseModel):
     updated_at: datetime
     processed_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, revalidate_instances="never", defer_build=True)
+
+
+class RecordingSummary(BaseModel):
+    """
+    Schema for recording list items
+
+    Leaves out the full transcription and extracted data; those are returned
+    by GET /recordings/{id}. transcription_preview holds the first
+    TRANSCRIPTION_PREVIEW_LENGTH characters of the transcription.
+    """
+    id: UUID
+    client_id: UUID
+    filename: str
+    status: RecordingStatus
+    transcription_preview: Optional[str]
+    entity_type: Optional[str]
+    dynamics_record_id: Optional[str]
+    sync_error: Optional[str]
+    created_at: datetime
+    processed_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True, revalidate_instances="never", defer_build=True)
+
+
+# Compiled once and reused to serialize streamed list batches
+RECORDING_SUMMARY_LIST_ADAPTER = TypeAdapter(List[RecordingSummary])
 
 
 class RecordingUploadResponse(BaseModel):
@@ -1,7 +1,7 @@
 """
 Schema mapping schemas for API validation and responses
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import Optional, Dict, List
 from datetime import datetime
 from uuid import UUID
@@ -42,5 +42,9 @@ class SchemaMappingResponse(SchemaMappingBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, revalidate_instances="never", defer_build=True)
+
+
+# Compiled once and reused to validate and serialize responses from ORM rows
+SCHEMA_MAPPING_ADAPTER = TypeAdapter(SchemaMappingResponse)
+SCHEMA_MAPPING_LIST_ADAPTER = TypeAdapter(List[SchemaMappingResponse])
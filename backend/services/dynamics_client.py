@@ -82,16 +82,28 @@ Usage Example:
         top=50
     )
 
+    # Iterate over every matching record, however many pages there are
+    async for animal in client.query_all("biotrack_animals", filter_query="species eq 'Beef Cattle'"):
+        ...
+
+    # Create and update several records in one request and one transaction
+    results = await client.batch_write([
+        {"method": "POST", "entity_name": "biotrack_animals", "data": {...}},
+        {"method": "PATCH", "entity_name": "biotrack_farms", "record_id": farm_id, "data": {...}}
+    ])
+
 Security Notes:
     - Client secrets should be stored securely (use environment variables)
-    - Tokens are stored in memory only (not persisted to disk)
+    - Tokens are kept in memory and in Redis (keyed by a hash), never on disk
     - Use HTTPS for all Dynamics API communication
     - Consider encrypting client_secret in database for multi-tenant setups
 
 Performance:
-    - Token cached for 1 hour (minus 5-minute buffer for safety)
+    - Token cached for 1 hour (minus 5-minute buffer for safety), shared by
+      all clients for the same app registration and across processes via Redis
     - Async operations don't block other processing
-    - Consider implementing connection pooling for high-volume scenarios
+    - One pooled HTTP/2 client is shared by every DynamicsClient in the process
+    - batch_write() sends related writes as a single $batch request
 
 Documentation:
     - Dynamics 365 Web API: https://docs.microsoft.com/en-us/dynamics365/customer-engagement/web-api/
@@ -102,12 +114,142 @@ Author: Farm Data Automation Team
 Version: 2.0 (Post-Azure migration)
 """
 import httpx
-from typing import Dict, Optional
+from collections import defaultdict
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
 import logging
-from datetime import datetime, timedelta
+import orjson
+import random
+import time
+import uuid
+
+from backend.core.cache import KEY_PREFIX, run_redis
+from backend.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+_http: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client for Azure AD and Dynamics 365 requests
+
+    One client per process keeps connections (and their TLS sessions) open
+    between recordings, and HTTP/2 lets concurrent requests to the same
+    Dataverse host share a connection.
+    """
+    global _http
+    if _http is None:
+        _http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=30.0
+        )
+    return _http
+
+
+# Shared by every DynamicsClient in the process, so a burst of recordings
+# queues here instead of tripping Dataverse's service protection limits
+_request_slots = asyncio.Semaphore(settings.DYNAMICS_MAX_CONCURRENCY)
+
+# Statuses worth retrying: throttled or a transient server/gateway failure.
+# A POST is only retried when it was rejected unprocessed (429/503); after a
+# 500/502/504 it may have created the record.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+POST_RETRY_STATUSES = frozenset({429, 503})
+
+
+async def _send(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Send a request through the shared client, retrying transient failures
+
+    Retries throttling/5xx responses and connection failures (the request
+    never reached the server, so retrying a POST can't create a duplicate), waiting
+    Retry-After if given and exponential backoff with jitter otherwise. The
+    final response is returned as-is for the caller to raise_for_status().
+    """
+    max_attempts = settings.DYNAMICS_MAX_ATTEMPTS
+    retry_statuses = POST_RETRY_STATUSES if method == "POST" else RETRY_STATUSES
+    for attempt in range(max_attempts):
+        try:
+            async with _request_slots:
+                response = await get_http_client().request(method, url, **kwargs)
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            if attempt == max_attempts - 1:
+                raise
+            retry_after = None
+        else:
+            if response.status_code not in retry_statuses or attempt == max_attempts - 1:
+                return response
+            retry_after = response.headers.get("Retry-After")
+
+        if retry_after and retry_after.isdigit():
+            wait_time = float(retry_after)
+        else:
+            wait_time = 0.5 * 2 ** attempt + random.random() * 0.1
+        logger.warning(f"Dynamics request {method} {url} failed, retrying in {wait_time:.1f}s")
+        await asyncio.sleep(wait_time)
+
+
+async def close_http_client():
+    """Close the shared HTTP client on shutdown"""
+    global _http
+    if _http is not None:
+        await _http.aclose()
+        _http = None
+
+
+# Access tokens are cached per app registration and Dynamics environment,
+# (tenant_id, client_id, scope), so every DynamicsClient for the same client
+# shares one token instead of each logging in. Tokens are also kept in Redis
+# (when reachable) so other worker processes and restarts reuse them.
+_tokens: Dict[Tuple[str, str, str], Tuple[str, float]] = {}
+_token_locks: Dict[Tuple[str, str, str], asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+def _token_redis_key(token_key: Tuple[str, str, str]) -> str:
+    # Hashed so tenant and app IDs don't appear in Redis key listings
+    digest = hashlib.blake2b("|".join(token_key).encode("utf-8"), digest_size=16).hexdigest()
+    return f"{KEY_PREFIX}:dynamics-token:{digest}"
+
+
+async def _load_shared_token(token_key: Tuple[str, str, str]) -> Optional[Tuple[str, float]]:
+    """Token another process cached in Redis, with its time.monotonic() expiry, if any"""
+    async def read(client):
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.get(_token_redis_key(token_key))
+            pipe.ttl(_token_redis_key(token_key))
+            return await pipe.execute()
+
+    result = await run_redis(read)
+    if not result or result[0] is None or result[1] <= 0:
+        return None
+    return result[0].decode("utf-8"), time.monotonic() + result[1]
+
+
+async def _store_shared_token(token_key: Tuple[str, str, str], access_token: str, ttl_seconds: int):
+    await run_redis(lambda client: client.set(_token_redis_key(token_key), access_token, ex=ttl_seconds))
+
+
+def _record_id_from_entity_url(entity_url: str) -> str:
+    """Extract the record ID from an OData-EntityId URL (.../accounts(<id>))"""
+    return entity_url.split("(")[-1].rstrip(")")
+
+
+def _parse_http_part(payload: bytes) -> tuple:
+    """Split an application/http part into (status_code, headers, body)"""
+    head, _, body = payload.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("utf-8").split("\r\n")
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return int(status_line.split(" ")[1]), headers, body.strip()
+
 
 class DynamicsClient:
     """Client for interacting with Microsoft Dynamics 365"""
@@ -124,7 +266,12 @@ class DynamicsClient:
         self.client_secret = client_secret
         self.tenant_id = tenant_id
         self.access_token = None
-        self.token_expires_at = None
+        # time.monotonic() deadline, checked before every API call
+        self._token_expires_monotonic = 0.0
+
+    @property
+    def _token_key(self) -> Tuple[str, str, str]:
+        return (self.tenant_id, self.client_id, f"{self.base_url}/.default")
 
     async def authenticate(self) -> str:
         """
@@ -143,30 +290,66 @@ class DynamicsClient:
                 "grant_type": "client_credentials"
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(token_url, data=data)
-                response.raise_for_status()
+            response = await _send("POST", token_url, data=data)
+            response.raise_for_status()
+
+            token_data = response.json()
+            self.access_token = token_data["access_token"]
+            expires_in = token_data.get("expires_in", 3600)
+            self._token_expires_monotonic = time.monotonic() + expires_in - 300
 
-                token_data = response.json()
-                self.access_token = token_data["access_token"]
-                expires_in = token_data.get("expires_in", 3600)
-                self.token_expires_at = datetime.utcnow() + timedelta(seconds=expires_in - 300)
+            _tokens[self._token_key] = (self.access_token, self._token_expires_monotonic)
+            await _store_shared_token(self._token_key, self.access_token, expires_in - 300)
 
-                logger.info("Successfully authenticated with Dynamics 365")
+            logger.info("Successfully authenticated with Dynamics 365")
 
-                return self.access_token
+            return self.access_token
 
         except Exception as e:
             logger.error(f"Error authenticating with Dynamics 365: {str(e)}")
             raise
 
+    def _use_cached_token(self, cached: Optional[Tuple[str, float]]) -> bool:
+        """Adopt a cached (token, expires_at) if it is still valid"""
+        if cached and time.monotonic() < cached[1]:
+            self.access_token, self._token_expires_monotonic = cached
+            return True
+        return False
+
     async def _ensure_authenticated(self):
         """Ensure we have a valid access token"""
-        if not self.access_token or not self.token_expires_at:
-            await self.authenticate()
-        elif datetime.utcnow() >= self.token_expires_at:
+        if self.access_token and time.monotonic() < self._token_expires_monotonic:
+            return
+
+        token_key = self._token_key
+        if self._use_cached_token(_tokens.get(token_key)):
+            return
+
+        # One login per token key at a time; concurrent callers wait and then
+        # pick up the token it cached
+        async with _token_locks[token_key]:
+            if self._use_cached_token(_tokens.get(token_key)):
+                return
+
+            shared = await _load_shared_token(token_key)
+            if self._use_cached_token(shared):
+                _tokens[token_key] = shared
+                return
+
             await self.authenticate()
 
+    async def prefetch_token(self):
+        """
+        Get an access token ahead of the first API call
+
+        Failures are only logged: the next API call authenticates again and
+        raises the error there.
+        """
+        try:
+            await self._ensure_authenticated()
+        except Exception as e:
+            logger.warning(f"Token prefetch failed: {str(e)}")
+
     async def create_record(
         self,
         entity_name: str,
@@ -196,19 +379,18 @@ class DynamicsClient:
                 "Prefer": "return=representation"
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=data, headers=headers)
-                response.raise_for_status()
+            response = await _send("POST", url, content=orjson.dumps(data), headers=headers)
+            response.raise_for_status()
 
-                created_record = response.json()
-                record_id = created_record.get("id") or response.headers.get("OData-EntityId", "").split("(")[-1].rstrip(")")
+            created_record = response.json()
+            record_id = created_record.get("id") or _record_id_from_entity_url(response.headers.get("OData-EntityId", ""))
 
-                logger.info(f"Successfully created {entity_name} record with ID: {record_id}")
+            logger.info(f"Successfully created {entity_name} record with ID: {record_id}")
 
-                return {
-                    "id": record_id,
-                    "data": created_record
-                }
+            return {
+                "id": record_id,
+                "data": created_record
+            }
 
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error creating record: {e.response.status_code} - {e.response.text}")
@@ -246,13 +428,12 @@ class DynamicsClient:
                 "OData-Version": "4.0"
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.patch(url, json=data, headers=headers)
-                response.raise_for_status()
+            response = await _send("PATCH", url, content=orjson.dumps(data), headers=headers)
+            response.raise_for_status()
 
-                logger.info(f"Successfully updated {entity_name} record: {record_id}")
+            logger.info(f"Successfully updated {entity_name} record: {record_id}")
 
-                return True
+            return True
 
         except Exception as e:
             logger.error(f"Error updating record in Dynamics 365: {str(e)}")
@@ -290,11 +471,10 @@ class DynamicsClient:
                 "Accept": "application/json"
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
+            response = await _send("GET", url, headers=headers)
+            response.raise_for_status()
 
-                return response.json()
+            return response.json()
 
         except Exception as e:
             logger.error(f"Error retrieving record from Dynamics 365: {str(e)}")
@@ -322,19 +502,7 @@ class DynamicsClient:
         try:
             await self._ensure_authenticated()
 
-            url = f"{self.base_url}/api/data/v9.2/{entity_name}"
-            params = []
-
-            if filter_query:
-                params.append(f"$filter={filter_query}")
-            if select_fields:
-                params.append(f"$select={','.join(select_fields)}")
-            if top:
-                params.append(f"$top={top}")
-
-            if params:
-                url += "?" + "&".join(params)
-
+            url = self._query_url(entity_name, filter_query, select_fields, top)
             headers = {
                 "Authorization": f"Bearer {self.access_token}",
                 "OData-MaxVersion": "4.0",
@@ -342,13 +510,201 @@ class DynamicsClient:
                 "Accept": "application/json"
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=headers)
+            response = await _send("GET", url, headers=headers)
+            response.raise_for_status()
+
+            result = response.json()
+            return result.get("value", [])
+
+        except Exception as e:
+            logger.error(f"Error querying records from Dynamics 365: {str(e)}")
+            raise
+
+    async def query_all(
+        self,
+        entity_name: str,
+        filter_query: Optional[str] = None,
+        select_fields: Optional[list] = None,
+        page_size: int = 500
+    ) -> AsyncIterator[Dict]:
+        """
+        Query every matching record, following server-side paging
+
+        Dynamics returns at most page_size records per response plus an
+        @odata.nextLink to the next page. The next page is requested as soon
+        as a page arrives, so it downloads while the caller works through the
+        current one.
+
+        Args:
+            entity_name: Dynamics entity name
+            filter_query: OData filter query
+            select_fields: Fields to select
+            page_size: Records per page (odata.maxpagesize)
+
+        Yields:
+            Records, one at a time
+        """
+        await self._ensure_authenticated()
+
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "OData-MaxVersion": "4.0",
+            "OData-Version": "4.0",
+            "Accept": "application/json",
+            "Prefer": f"odata.maxpagesize={page_size}"
+        }
+
+        url = self._query_url(entity_name, filter_query, select_fields)
+        pending = asyncio.create_task(_send("GET", url, headers=headers))
+        try:
+            while pending is not None:
+                response = await pending
+                pending = None
                 response.raise_for_status()
+                result = orjson.loads(response.content)
 
-                result = response.json()
-                return result.get("value", [])
+                next_url = result.get("@odata.nextLink")
+                if next_url:
+                    pending = asyncio.create_task(_send("GET", next_url, headers=headers))
+
+                for record in result.get("value", []):
+                    yield record
 
         except Exception as e:
             logger.error(f"Error querying records from Dynamics 365: {str(e)}")
             raise
+        finally:
+            # Caller stopped early or a page failed: drop the prefetch
+            if pending is not None:
+                pending.cancel()
+
+    def _query_url(
+        self,
+        entity_name: str,
+        filter_query: Optional[str] = None,
+        select_fields: Optional[list] = None,
+        top: Optional[int] = None
+    ) -> str:
+        """OData collection URL with $filter/$select/$top options"""
+        url = f"{self.base_url}/api/data/v9.2/{entity_name}"
+        params = []
+
+        if filter_query:
+            params.append(f"$filter={filter_query}")
+        if select_fields:
+            params.append(f"$select={','.join(select_fields)}")
+        if top:
+            params.append(f"$top={top}")
+
+        if params:
+            url += "?" + "&".join(params)
+        return url
+
+    async def batch_write(self, operations: List[Dict]) -> List[Dict]:
+        """
+        Create and update several records in one $batch request
+
+        All operations go in a single changeset, so Dynamics applies them as
+        one transaction: if any operation fails, none of them are saved.
+
+        Args:
+            operations: List of operations, each a dict with:
+                - method: "POST" (create) or "PATCH" (update)
+                - entity_name: Dynamics entity name
+                - record_id: ID of the record to update (PATCH only)
+                - data: Record data as dictionary
+
+        Returns:
+            One result per operation, in order: {"id": record_id, "data": record}
+            ("data" is empty if Dynamics returned no body)
+
+        Raises:
+            httpx.HTTPStatusError: If the batch or any operation is rejected
+            ValueError: If the response has no result for some operation
+        """
+        try:
+            await self._ensure_authenticated()
+
+            api_url = f"{self.base_url}/api/data/v9.2"
+            batch_boundary = f"batch_{uuid.uuid4().hex}"
+            changeset_boundary = f"changeset_{uuid.uuid4().hex}"
+
+            # multipart/mixed body: one changeset holding one HTTP request per
+            # operation. Content-ID (1-based) correlates responses to operations.
+            lines = [
+                f"--{batch_boundary}",
+                f"Content-Type: multipart/mixed; boundary={changeset_boundary}",
+                "",
+            ]
+            for content_id, operation in enumerate(operations, start=1):
+                url = f"{api_url}/{operation['entity_name']}"
+                if operation["method"] == "PATCH":
+                    url += f"({operation['record_id']})"
+                lines += [
+                    f"--{changeset_boundary}",
+                    "Content-Type: application/http",
+                    "Content-Transfer-Encoding: binary",
+                    f"Content-ID: {content_id}",
+                    "",
+                    f"{operation['method']} {url} HTTP/1.1",
+                    "Content-Type: application/json",
+                    "Prefer: return=representation",
+                    "",
+                    orjson.dumps(operation["data"]).decode("utf-8"),
+                ]
+            lines += [f"--{changeset_boundary}--", f"--{batch_boundary}--", ""]
+
+            headers = {
+                "Authorization": f"Bearer {self.access_token}",
+                "Content-Type": f"multipart/mixed; boundary={batch_boundary}",
+                "OData-MaxVersion": "4.0",
+                "OData-Version": "4.0",
+                "Accept": "application/json"
+            }
+
+            response = await _send(
+                "POST",
+                f"{api_url}/$batch",
+                content="\r\n".join(lines).encode("utf-8"),
+                headers=headers
+            )
+            response.raise_for_status()
+
+            # Parse the multipart response (a changeset response nested in the batch)
+            message = BytesParser(policy=HTTP).parsebytes(
+                f"Content-Type: {response.headers['Content-Type']}\r\n\r\n".encode("ascii")
+                + response.content
+            )
+            results = {}
+            for part in message.walk():
+                if part.get_content_type() != "application/http":
+                    continue
+
+                status_code, part_headers, body = _parse_http_part(part.get_payload(decode=True))
+                if status_code >= 400:
+                    # Re-raise as the same error type the single-record methods use
+                    httpx.Response(status_code, content=body, request=response.request).raise_for_status()
+
+                record = orjson.loads(body) if body else {}
+                record_id = record.get("id") or _record_id_from_entity_url(part_headers.get("odata-entityid", ""))
+                results[int(part.get("Content-ID", len(results) + 1))] = {"id": record_id, "data": record}
+
+            missing = [
+                content_id for content_id in range(1, len(operations) + 1) if content_id not in results
+            ]
+            if missing:
+                raise ValueError(
+                    f"Dynamics $batch response has {len(results)} results for {len(operations)} "
+                    f"operations; missing Content-IDs: {', '.join(map(str, missing))}"
+                )
+
+            logger.info(f"Successfully wrote {len(operations)} records in one batch")
+
+            return [results[content_id] for content_id in range(1, len(operations) + 1)]
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error in batch write: {e.response.status_code} - {e.response.text}")
+            raise
+        except Exception as e:
+            logger.error(f"Error in batch write to Dynamics 365: {str(e)}")
+            raise
@@ -2,43 +2,71 @@
 Groq AI Service
 Handles AI-powered data extraction and entity classification using Groq API
 """
-from groq import AsyncGroq
+from groq import APIConnectionError, AsyncGroq, InternalServerError, RateLimitError
 from backend.core.config import settings
+import asyncio
+import httpx
 import logging
-import json
-from typing import Dict, List
+import orjson
+import random
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Shared by every GroqService in the process, so a burst of recordings
+# queues here instead of tripping the API's rate limit
+_request_slots = asyncio.Semaphore(settings.GROQ_MAX_CONCURRENCY)
 
-class GroqService:
-    """Service for Groq AI data extraction"""
 
-    def __init__(self):
-        self.client = AsyncGroq(api_key=settings.GROQ_API_KEY)
-        self.model = settings.GROQ_MODEL
-        self.temperature = settings.GROQ_TEMPERATURE
+# Validation rule "type" names and the Python types they accept
+_PYTHON_TYPES = {
+    "string": str,
+    "integer": int,
+    "float": float,
+    "boolean": bool
+}
 
-    async def extract_data_from_transcription(
-        self,
-        transcription: str,
-        schema_mappings: List[Dict]
-    ) -> Dict:
-        """
-        Extract structured data from transcription text using Groq AI
 
-        Args:
-            transcription: Transcribed text from voice recording
-            schema_mappings: List of available entity schemas for the client
+# Errors extract_with_retry retries: rate limits, 5xx and connection failures
+# (timeouts included). Anything else is a bad request and fails immediately.
+_RETRYABLE_ERRORS = (RateLimitError, InternalServerError, APIConnectionError)
 
-        Returns:
-            Dictionary with extracted data, entity type, and confidence
-        """
-        try:
-            # Build prompt with schema information
-            schema_descriptions = self._build_schema_descriptions(schema_mappings)
 
-            system_prompt = f"""You are an AI assistant for an agricultural data management system.
+def _retry_delay(attempt: int, error: Exception) -> float:
+    """
+    Seconds to wait before retrying a failed request
+
+    Waits at least the Retry-After Groq sends with a 429, and 2^attempt
+    seconds without one. Jitter keeps workers that were throttled together
+    from retrying in lockstep.
+    """
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(retry_after) * random.uniform(1.0, 1.5)
+    except (TypeError, ValueError):
+        return 2 ** attempt * random.uniform(0.5, 1.5)
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    """Compile a validation rule pattern once per distinct pattern string"""
+    return re.compile(pattern)
+
+
+@lru_cache(maxsize=128)
+def _system_prompt(schema_mappings_json: bytes) -> str:
+    """
+    Build the extraction system prompt for a set of schema mappings
+
+    Cached by the mappings' canonical JSON: a client's schemas rarely change,
+    so the prompt is built once and stays byte-identical between requests.
+    """
+    schema_descriptions = GroqService._build_schema_descriptions(orjson.loads(schema_mappings_json))
+
+    return f"""You are an AI assistant for an agricultural data management system.
 Your job is to extract structured data from voice transcriptions about farm animals and operations.
 
 Available entity types and their fields:
@@ -55,12 +83,8 @@ Rules:
 - Use null for missing fields
 - Be precise with numbers, dates, and identifiers
 - If the transcription doesn't match any entity type, return entity_type: "unknown"
-"""
 
-            user_prompt = f"""Transcription:
-"{transcription}"
-
-Extract the data and return ONLY a JSON object with this structure:
+Extract the data from the transcription and return ONLY a JSON object with this structure:
 {{
     "entity_type": "animal|farm|treatment|unknown",
     "confidence": "HIGH|MEDIUM|LOW",
@@ -71,25 +95,83 @@ Extract the data and return ONLY a JSON object with this structure:
     "notes": "any additional context or uncertainties"
 }}"""
 
-            # Call Groq API
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=self.temperature,
-                response_format={"type": "json_object"}  # Force JSON output
+
+class GroqService:
+    """Service for Groq AI data extraction"""
+
+    def __init__(self):
+        # SDK retries are off: extract_with_retry owns retrying, and its backoff
+        # sleeps outside _request_slots, where the SDK's would hold a slot.
+        # The SDK's default pool drops idle connections after 5s, so the gap
+        # between recordings would cost a new TLS handshake; keep them a minute.
+        self.client = AsyncGroq(
+            api_key=settings.GROQ_API_KEY,
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=settings.GROQ_HTTP_POOL_SIZE,
+                    max_keepalive_connections=settings.GROQ_HTTP_POOL_SIZE,
+                    keepalive_expiry=60.0
+                ),
+                timeout=httpx.Timeout(60.0, connect=5.0)
             )
+        )
+        self.model = settings.GROQ_MODEL
+        self.temperature = settings.GROQ_TEMPERATURE
+
+    async def extract_data_from_transcription(
+        self,
+        transcription: str,
+        schema_mappings: List[Dict],
+        model: Optional[str] = None
+    ) -> Dict:
+        """
+        Extract structured data from transcription text using Groq AI
+
+        Args:
+            transcription: Transcribed text from voice recording
+            schema_mappings: List of available entity schemas for the client
+            model: Groq model to use (defaults to GROQ_MODEL)
+
+        Returns:
+            Dictionary with extracted data, entity type, and confidence
+
+        Raises:
+            RateLimitError, InternalServerError, APIConnectionError: Transient
+                failures, left to extract_with_retry (other errors are
+                returned in the result's "error")
+        """
+        try:
+            # Everything except the transcription is in the system prompt, so
+            # requests for the same client share an identical prompt prefix
+            # that Groq's prompt caching can reuse
+            system_prompt = _system_prompt(orjson.dumps(schema_mappings, option=orjson.OPT_SORT_KEYS))
+            user_prompt = f'Transcription:\n"{transcription}"'
+
+            # Call Groq API
+            async with _request_slots:
+                response = await self.client.chat.completions.create(
+                    model=model or self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=self.temperature,
+                    max_tokens=settings.GROQ_MAX_TOKENS,
+                    response_format={"type": "json_object"}  # Force JSON output
+                )
 
             # Parse response
             result_text = response.choices[0].message.content
-            result = json.loads(result_text)
+            result = orjson.loads(result_text)
 
             logger.info(f"Data extraction successful. Entity type: {result.get('entity_type')}")
 
             return result
 
+        except _RETRYABLE_ERRORS:
+            raise
         except Exception as e:
             logger.error(f"Error during Groq data extraction: {str(e)}")
             return {
@@ -99,7 +181,8 @@ Extract the data and return ONLY a JSON object with this structure:
                 "error": str(e)
             }
 
-    def _build_schema_descriptions(self, schema_mappings: List[Dict]) -> str:
+    @staticmethod
+    def _build_schema_descriptions(schema_mappings: List[Dict]) -> str:
         """Build human-readable schema descriptions for the prompt"""
         descriptions = []
 
@@ -156,8 +239,7 @@ Keywords: {keywords_list}
                 # Check pattern (regex)
                 pattern = rules.get("pattern")
                 if pattern:
-                    import re
-                    if not re.match(pattern, str(value)):
+                    if not _compile_pattern(pattern).match(str(value)):
                         warnings.append(f"Field '{field}' doesn't match expected pattern")
 
         return {
@@ -168,14 +250,8 @@ Keywords: {keywords_list}
 
     def _check_type(self, value, expected_type: str) -> bool:
         """Check if value matches expected type"""
-        type_mapping = {
-            "string": str,
-            "integer": int,
-            "float": float,
-            "boolean": bool
-        }
-
-        expected_python_type = type_mapping.get(expected_type.lower())
+        # Rule types are normally already lowercase; only normalize if not
+        expected_python_type = _PYTHON_TYPES.get(expected_type) or _PYTHON_TYPES.get(expected_type.lower())
         if not expected_python_type:
             return True  # Unknown type, skip validation
 
@@ -185,50 +261,48 @@ Keywords: {keywords_list}
         self,
         transcription: str,
         schema_mappings: List[Dict],
-        max_retries: int = 3
+        max_retries: int = 3,
+        model: Optional[str] = None
     ) -> Dict:
         """
-        Extract data with retry logic for rate limiting
+        Extract data with retry logic for rate limits and transient failures
 
         Args:
             transcription: Transcribed text
             schema_mappings: Available schemas
-            max_retries: Maximum number of retry attempts
+            max_retries: Maximum number of attempts
+            model: Groq model to use (defaults to GROQ_MODEL)
 
         Returns:
             Extraction result
         """
-        import asyncio
-
+        last_error = None
         for attempt in range(max_retries):
             try:
-                result = await self.extract_data_from_transcription(transcription, schema_mappings)
-
-                # If we got an error in the result but no exception, check if it's a rate limit
-                if result.get("error") and "rate" in result.get("error", "").lower():
-                    if attempt < max_retries - 1:
-                        # Exponential backoff: wait 2^attempt seconds
-                        wait_time = 2 ** attempt
-                        logger.warning(f"Rate limit hit, retrying in {wait_time} seconds...")
-                        await asyncio.sleep(wait_time)
-                        continue
-
-                return result
-
-            except Exception as e:
-                error_message = str(e).lower()
-                if "rate" in error_message and attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    logger.warning(f"Rate limit exception, retrying in {wait_time} seconds...")
+                return await self.extract_data_from_transcription(transcription, schema_mappings, model)
+
+            except _RETRYABLE_ERRORS as e:
+                last_error = e
+                if attempt < max_retries - 1:
+                    wait_time = _retry_delay(attempt, e)
+                    logger.warning(f"Groq request failed ({type(e).__name__}), retrying in {wait_time:.1f} seconds...")
                     await asyncio.sleep(wait_time)
-                else:
-                    # Non-rate-limit error or final attempt
-                    raise
 
         # If we exhausted retries
         return {
             "entity_type": "unknown",
             "confidence": "LOW",
             "extracted_data": {},
-            "error": "Max retries exceeded due to rate limiting"
+            "error": f"Max retries exceeded: {last_error}"
         }
+
+
+_service: Optional[GroqService] = None
+
+
+def get_groq_service() -> GroqService:
+    """Get the shared GroqService (one client and connection pool per process)"""
+    global _service
+    if _service is None:
+        _service = GroqService()
+    return _service
@@ -3,9 +3,12 @@ Local Filesystem Storage Service
 Handles file uploads and downloads from local server storage
 """
 import aiofiles
+import asyncio
 import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import AsyncIterator, Tuple
 import uuid
 import logging
 
@@ -21,6 +24,8 @@ class LocalStorageService:
         self.base_path = Path(settings.LOCAL_STORAGE_PATH)
         # Create base directory if it doesn't exist
         self.base_path.mkdir(parents=True, exist_ok=True)
+        # Directories known to exist, so uploads skip the mkdir syscalls
+        self._created_dirs = set()
 
     def _get_storage_path(self, client_id: str, filename: str) -> Path:
         """
@@ -34,10 +39,11 @@ class LocalStorageService:
             Path object for file storage location
         """
         # Organize by client_id and year-month
-        year_month = datetime.utcnow().strftime("%Y-%m")
+        now = datetime.utcnow()
+        year_month = now.strftime("%Y-%m")
 
         # Generate unique filename with timestamp and UUID
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         unique_id = str(uuid.uuid4())[:8]
         file_extension = Path(filename).suffix
         unique_filename = f"{timestamp}_{unique_id}{file_extension}"
@@ -45,11 +51,23 @@ class LocalStorageService:
         # Full path: /storage/recordings/{client_id}/{year-month}/{unique_filename}
         file_path = self.base_path / str(client_id) / year_month / unique_filename
 
-        # Create directory structure
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        # Create directory structure (once per directory)
+        if file_path.parent not in self._created_dirs:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(file_path.parent)
 
         return file_path
 
+    async def _open_for_write(self, file_path: Path):
+        """Open a new file for writing, recreating its directory if it's gone"""
+        try:
+            return await aiofiles.open(file_path, 'wb')
+        except FileNotFoundError:
+            # delete_file (possibly in another worker) removed the directory
+            # after this process cached it as created
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            return await aiofiles.open(file_path, 'wb')
+
     async def upload_file(
         self,
         file_content: bytes,
@@ -72,9 +90,14 @@ class LocalStorageService:
         try:
             file_path = self._get_storage_path(client_id, filename)
 
-            # Write file asynchronously
-            async with aiofiles.open(file_path, 'wb') as f:
-                await f.write(file_content)
+            # Whole file in one write on a worker thread (aiofiles would add
+            # a thread hop for the open and close as well)
+            try:
+                await asyncio.to_thread(file_path.write_bytes, file_content)
+            except FileNotFoundError:
+                # Directory removed since it was cached (see _open_for_write)
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                await asyncio.to_thread(file_path.write_bytes, file_content)
 
             # Return relative path from base storage path
             relative_path = file_path.relative_to(self.base_path)
@@ -87,6 +110,50 @@ class LocalStorageService:
             logger.error(f"Error uploading file to local storage: {str(e)}")
             raise
 
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: str,
+        client_id: str
+    ) -> Tuple[str, int]:
+        """
+        Stream a file to local filesystem chunk by chunk
+
+        Only one chunk is held in memory at a time, so large recordings
+        don't have to be buffered whole before they are written.
+
+        Args:
+            chunks: Async iterator yielding file content
+            filename: Original filename
+            client_id: Client ID for organization
+
+        Returns:
+            Tuple of (relative file path from base storage path, size in bytes)
+        """
+        file_path = self._get_storage_path(client_id, filename)
+        file_size = 0
+
+        try:
+            f = await self._open_for_write(file_path)
+            try:
+                async for chunk in chunks:
+                    await f.write(chunk)
+                    file_size += len(chunk)
+            finally:
+                await f.close()
+
+            relative_path = file_path.relative_to(self.base_path)
+
+            logger.info(f"File uploaded successfully: {relative_path} ({file_size} bytes)")
+
+            return str(relative_path), file_size
+
+        except Exception as e:
+            logger.error(f"Error uploading file to local storage: {str(e)}")
+            # Don't leave a partial file behind
+            file_path.unlink(missing_ok=True)
+            raise
+
     async def download_file(self, file_path: str) -> bytes:
         """
         Download a file from local filesystem
@@ -103,9 +170,8 @@ class LocalStorageService:
             if not full_path.exists():
                 raise FileNotFoundError(f"File not found: {file_path}")
 
-            # Read file asynchronously
-            async with aiofiles.open(full_path, 'rb') as f:
-                file_content = await f.read()
+            # Read the whole file in one worker-thread call
+            file_content = await asyncio.to_thread(full_path.read_bytes)
 
             logger.info(f"File downloaded successfully: {file_path}")
 
@@ -132,11 +198,16 @@ class LocalStorageService:
                 # Delete file
                 full_path.unlink()
 
-                # Try to remove empty parent directories (cleanup)
-                try:
-                    full_path.parent.rmdir()  # Only works if empty
-                except OSError:
-                    pass  # Directory not empty, which is fine
+                # Remove parent directories left empty (month, then client),
+                # e.g. after a rejected upload for an unknown client_id
+                parent = full_path.parent
+                while parent != self.base_path:
+                    try:
+                        parent.rmdir()  # Only works if empty
+                    except OSError:
+                        break  # Directory not empty, which is fine
+                    self._created_dirs.discard(parent)
+                    parent = parent.parent
 
                 logger.info(f"File deleted successfully: {file_path}")
             else:
@@ -187,3 +258,14 @@ class LocalStorageService:
         if full_path.exists():
             return full_path.stat().st_size
         return 0
+
+
+@lru_cache(maxsize=None)
+def get_storage_service() -> LocalStorageService:
+    """
+    Get the shared storage service
+
+    Creating the service touches the filesystem (mkdir of the base path), so
+    one instance is reused by the API (as a FastAPI dependency) and the worker.
+    """
+    return LocalStorageService()
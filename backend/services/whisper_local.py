@@ -4,13 +4,19 @@ Local Whisper Speech-to-Text Service (100% FREE)
 This module provides FREE audio transcription using OpenAI's Whisper model
 running locally on your server. No API keys or costs required!
 
+The model runs on faster-whisper (CTranslate2) with int8 weights, which is
+several times faster than the PyTorch reference implementation on CPU and
+uses about half the memory, at the same accuracy. On a GPU, a recording's
+speech segments are decoded in batches (WHISPER_BATCH_SIZE) rather than one
+30s window at a time.
+
 Cost: $0 (completely free)
 Speed: 10-30 seconds per recording (depending on hardware and model size)
 Privacy: Audio never leaves your server
 Requirements: ~1-3GB disk space for model, works on CPU (GPU faster)
 
 Installation:
-    pip install openai-whisper
+    pip install faster-whisper
 
 Models Available:
     - tiny: Fastest, lowest quality (~75MB)
@@ -20,23 +26,49 @@ Models Available:
     - large: Best quality (~2.9GB)
 
 Usage:
-    service = LocalWhisperService(model_name="base")
+    service = get_local_whisper_service("base")
     result = await service.transcribe_audio(audio_bytes, "recording.mp3")
 
 Author: Farm Data Automation Team
 Version: 2.0
 """
-import whisper
-import tempfile
-import os
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+import ctranslate2
+import numpy as np
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import io
 import logging
-from typing import Dict
+from typing import Dict, Union
 from pathlib import Path
 
+from backend.core.config import settings
+
 logger = logging.getLogger(__name__)
 
 
+# Transcriptions get their own threads rather than the default executor:
+# concurrent jobs would only compete for the same cores, and the default
+# pool's threads are left free for file I/O
+_executor = ThreadPoolExecutor(
+    max_workers=settings.WHISPER_LOCAL_WORKERS,
+    thread_name_prefix="whisper"
+)
+
+
+# Skip pauses of half a second or more (silero VAD, bundled with faster-whisper).
+# Field recordings have long gaps between sentences that would otherwise be
+# decoded 30s window by window - and are where Whisper tends to hallucinate.
+VAD_OPTIONS = {"vad_filter": True, "vad_parameters": {"min_silence_duration_ms": 500}}
+
+
+def _device() -> str:
+    """Device to run the model on, from WHISPER_DEVICE ("auto", "cpu" or "cuda")"""
+    if settings.WHISPER_DEVICE != "auto":
+        return settings.WHISPER_DEVICE
+    return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+
 class LocalWhisperService:
     """
     Service for local Whisper speech-to-text transcription
@@ -62,16 +94,27 @@ class LocalWhisperService:
                 - "large": Best quality, 2.9GB (~1550M parameters)
 
         Note:
-            On first run, the model will be downloaded to ~/.cache/whisper/
+            On first run, the model will be downloaded to ~/.cache/huggingface/
             This is a one-time download and will be reused for future runs.
         """
         self.model_name = model_name
         logger.info(f"Loading Whisper model '{model_name}' (this may take a moment on first run)...")
 
         try:
-            # Load model (will download on first run)
-            self.model = whisper.load_model(model_name)
-            logger.info(f"✅ Whisper model '{model_name}' loaded successfully")
+            # Load model (will download on first run). Weights are quantized
+            # to int8; GPUs compute in float16 on tensor cores, CPUs in int8.
+            device = _device()
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+            self.model = WhisperModel(
+                model_name,
+                device=device,
+                compute_type=compute_type,
+                num_workers=settings.WHISPER_LOCAL_WORKERS  # Lets that many threads transcribe in parallel
+            )
+            # Batching keeps a GPU busy; on CPU every core is already in use
+            self.batch_size = settings.WHISPER_BATCH_SIZE if device == "cuda" else 1
+            self.pipeline = BatchedInferencePipeline(self.model) if self.batch_size > 1 else None
+            logger.info(f"✅ Whisper model '{model_name}' loaded successfully ({device}, {compute_type})")
         except Exception as e:
             logger.error(f"❌ Failed to load Whisper model: {str(e)}")
             raise
@@ -116,53 +159,69 @@ class LocalWhisperService:
             async event loop. This allows other requests to be processed
             while Whisper is working.
         """
+        # Decoded straight from memory - no temporary file
+        return await self._transcribe(audio_content, filename)
+
+    async def transcribe_file(self, audio_path: str, filename: str = None) -> Dict:
+        """
+        Transcribe an audio file already on disk
+
+        Whisper decodes audio from a file path, so a recording in local storage
+        can be transcribed in place - no read into memory, no temporary copy.
+
+        Args:
+            audio_path (str): Path to the audio file
+            filename (str): Original filename, for logging (defaults to the path)
+
+        Returns:
+            dict: Transcription result (same structure as transcribe_audio)
+        """
+        return await self._transcribe(audio_path, filename or audio_path)
+
+    async def _transcribe(self, audio: Union[str, bytes], filename: str, **options) -> Dict:
+        """
+        Transcribe a file path or audio bytes and build the result dict
+
+        Args:
+            audio: Path to an audio file, or audio file content
+            filename: Name for logging
+            **options: Extra whisper transcribe() options (e.g. language)
+
+        Returns:
+            dict: Transcription result (see transcribe_audio)
+        """
         try:
-            # Determine file extension from filename
-            file_extension = os.path.splitext(filename)[1] or '.wav'
-
-            # Create temporary file for Whisper to read
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-                temp_file.write(audio_content)
-                temp_file_path = temp_file.name
-
-            try:
-                logger.info(f"Starting local Whisper transcription for {filename} using {self.model_name} model...")
-
-                # Run transcription in thread pool to avoid blocking
-                # Whisper is CPU-bound, so we use run_in_executor
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(
-                    None,  # Use default executor
-                    self._transcribe_sync,
-                    temp_file_path
-                )
-
-                # Extract transcription text
-                transcription_text = result["text"].strip()
-
-                # Determine confidence based on result quality
-                # Whisper doesn't provide direct confidence scores, so we use heuristics
-                confidence = self._estimate_confidence(result)
-
-                # Get detected language (if available)
-                detected_language = result.get("language", "unknown")
-
-                logger.info(f"✅ Local transcription successful ({len(transcription_text)} chars, language: {detected_language})")
-                logger.info(f"Preview: {transcription_text[:100]}...")
-
-                return {
-                    "text": transcription_text,
-                    "confidence": confidence,
-                    "success": True,
-                    "language": detected_language,
-                    "duration": result.get("duration"),
-                    "model": self.model_name
-                }
+            logger.info(f"Starting local Whisper transcription for {filename} using {self.model_name} model...")
+
+            # Run transcription in thread pool to avoid blocking
+            # Whisper is CPU-bound, so we use run_in_executor; extra jobs
+            # queue for a free Whisper thread
+            loop = asyncio.get_event_loop()
+            result = await loop.run_in_executor(
+                _executor,
+                lambda: self._transcribe_sync(audio, **options)
+            )
+
+            # Extract transcription text
+            transcription_text = result["text"].strip()
 
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
+            # Determine confidence based on result quality
+            confidence = self._estimate_confidence(result)
+
+            # Get detected language (if available)
+            detected_language = result.get("language", "unknown")
+
+            logger.info(f"✅ Local transcription successful ({len(transcription_text)} chars, language: {detected_language})")
+            logger.info(f"Preview: {transcription_text[:100]}...")
+
+            return {
+                "text": transcription_text,
+                "confidence": confidence,
+                "success": True,
+                "language": detected_language,
+                "duration": result.get("duration"),
+                "model": self.model_name
+            }
 
         except Exception as e:
             logger.error(f"❌ Error during local Whisper transcription: {str(e)}")
@@ -173,29 +232,59 @@ class LocalWhisperService:
                 "error": str(e)
             }
 
-    def _transcribe_sync(self, audio_path: str) -> Dict:
+    async def warm_up(self):
+        """
+        Transcribe a second of silence so the first recording doesn't pay
+        for the runtime's one-time setup (kernel selection, buffer allocation)
+        """
+        silence = np.zeros(16000, dtype=np.float32)  # 1s at 16 kHz
+        loop = asyncio.get_event_loop()
+        # VAD off: it would drop the silence and skip the decoder entirely.
+        # Goes to the model directly: the batched pipeline shares its weights
+        await loop.run_in_executor(
+            _executor,
+            lambda: "".join(s.text for s in self.model.transcribe(silence, vad_filter=False)[0])
+        )
+        logger.info(f"Whisper model '{self.model_name}' warmed up")
+
+    def _transcribe_sync(self, audio: Union[str, bytes, np.ndarray], **options) -> Dict:
         """
         Synchronous transcription (runs in thread pool)
 
         Args:
-            audio_path (str): Path to temporary audio file
+            audio: Path to the audio file, audio file content, or 16 kHz samples
+            **options: Extra whisper transcribe() options
 
         Returns:
-            dict: Whisper result with text, language, and metadata
+            dict: Whisper result with text, language, duration, and the mean
+                segment log probability (None if nothing was transcribed)
         """
-        # Run Whisper transcription
-        # verbose=False suppresses progress output
-        result = self.model.transcribe(audio_path, verbose=False)
-        return result
+        if isinstance(audio, bytes):
+            audio = io.BytesIO(audio)
+
+        options = {**VAD_OPTIONS, **options}
+        # Segments are generated lazily - transcription runs as they're read
+        if self.pipeline:
+            segments, info = self.pipeline.transcribe(audio, batch_size=self.batch_size, **options)
+        else:
+            segments, info = self.model.transcribe(audio, **options)
+        segments = list(segments)
+        return {
+            "text": "".join(segment.text for segment in segments),
+            "language": info.language,
+            "duration": info.duration,
+            "avg_logprob": (
+                sum(segment.avg_logprob for segment in segments) / len(segments)
+                if segments else None
+            )
+        }
 
     def _estimate_confidence(self, result: Dict) -> str:
         """
         Estimate confidence level based on Whisper result
 
-        Whisper doesn't provide direct confidence scores, so we use heuristics:
-        - Text length
-        - Presence of punctuation
-        - No probability available in result
+        Uses the decoder's mean segment log probability when available
+        (above -0.5 is HIGH, above -1.0 MEDIUM), otherwise text length.
 
         Args:
             result (dict): Whisper transcription result
@@ -208,6 +297,12 @@ class LocalWhisperService:
         if not text:
             return "LOW"
 
+        avg_logprob = result.get("avg_logprob")
+        if avg_logprob is not None:
+            if avg_logprob > -0.5:
+                return "HIGH"
+            return "MEDIUM" if avg_logprob > -1.0 else "LOW"
+
         # Basic heuristics
         if len(text) < 10:
             return "MEDIUM"  # Very short transcriptions might be uncertain
@@ -234,48 +329,30 @@ class LocalWhisperService:
         Returns:
             dict: Transcription result
         """
-        try:
-            file_extension = os.path.splitext(filename)[1] or '.wav'
-
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-                temp_file.write(audio_content)
-                temp_file_path = temp_file.name
-
-            try:
-                logger.info(f"Starting transcription with language={language}")
+        logger.info(f"Starting transcription with language={language}")
+        return await self._transcribe(audio_content, filename, language=language)
 
-                # Run with language parameter
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(
-                    None,
-                    lambda: self.model.transcribe(temp_file_path, language=language, verbose=False)
-                )
 
-                transcription_text = result["text"].strip()
-                confidence = self._estimate_confidence(result)
+# Loaded models by name: loading one takes seconds and hundreds of MB,
+# so each model is loaded once per process and reused
+_services: Dict[str, LocalWhisperService] = {}
 
-                logger.info(f"✅ Transcription successful (language: {language}): {transcription_text[:100]}...")
 
-                return {
-                    "text": transcription_text,
-                    "confidence": confidence,
-                    "success": True,
-                    "language": language,
-                    "model": self.model_name
-                }
+def get_local_whisper_service(model_name: str = "base") -> LocalWhisperService:
+    """Get the shared LocalWhisperService for a model, loading it on first use"""
+    if model_name not in _services:
+        _services[model_name] = LocalWhisperService(model_name=model_name)
+    return _services[model_name]
 
-            finally:
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
 
-        except Exception as e:
-            logger.error(f"❌ Error during transcription with language: {str(e)}")
-            return {
-                "text": "",
-                "confidence": "LOW",
-                "success": False,
-                "error": str(e)
-            }
+async def preload_local_whisper(model_name: str):
+    """Load and warm up a model at startup so the first recording doesn't wait for it"""
+    try:
+        service = await asyncio.to_thread(get_local_whisper_service, model_name)
+        await service.warm_up()
+    except Exception as e:
+        # Startup continues; recordings will retry loading the model
+        logger.error(f"Could not preload Whisper model '{model_name}': {str(e)}")
 
 
 # Convenience function for quick transcription
@@ -297,7 +374,7 @@ async def transcribe_file(audio_path: str, model_name: str = "base") -> str:
     with open(audio_path, "rb") as f:
         audio_content = f.read()
 
-    service = LocalWhisperService(model_name=model_name)
+    service = get_local_whisper_service(model_name)
     result = await service.transcribe_audio(audio_content, audio_path)
 
     return result.get("text", "")
@@ -4,72 +4,91 @@ Handles voice transcription using OpenAI Whisper API
 """
 from openai import AsyncOpenAI
 from backend.core.config import settings
+import asyncio
+import httpx
 import logging
-import tempfile
 import os
+from typing import BinaryIO, Optional, Union
 
 logger = logging.getLogger(__name__)
 
+# Shared by every WhisperService in the process, so a burst of recordings
+# queues here instead of tripping the API's rate limit
+_request_slots = asyncio.Semaphore(settings.WHISPER_MAX_CONCURRENCY)
+
+
+def _audio_file(audio_content: Union[bytes, BinaryIO], filename: str) -> tuple:
+    """
+    Upload for the transcription API: (name, bytes or open file)
+
+    The API detects the audio format from the name's extension, so the
+    original extension is kept (defaulting to .wav).
+    """
+    file_extension = os.path.splitext(filename)[1] or '.wav'
+    return (f"audio{file_extension}", audio_content)
+
 
 class WhisperService:
     """Service for OpenAI Whisper Speech-to-Text"""
 
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.WHISPER_API_KEY)
+        # The SDK retries 429/5xx and connection errors with exponential backoff.
+        # Its default pool drops idle connections after 5s, so the gap between
+        # recordings would cost a new TLS handshake; keep them for a minute.
+        self.client = AsyncOpenAI(
+            api_key=settings.WHISPER_API_KEY,
+            max_retries=3,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=settings.WHISPER_HTTP_POOL_SIZE,
+                    max_keepalive_connections=settings.WHISPER_HTTP_POOL_SIZE,
+                    keepalive_expiry=60.0
+                ),
+                # Long recordings take minutes to upload and transcribe
+                timeout=httpx.Timeout(600.0, connect=5.0)
+            )
+        )
         self.model = settings.WHISPER_MODEL
 
-    async def transcribe_audio(self, audio_content: bytes, filename: str = "audio.wav") -> dict:
+    async def transcribe_audio(self, audio_content: Union[bytes, BinaryIO], filename: str = "audio.wav") -> dict:
         """
         Transcribe audio content to text using OpenAI Whisper API
 
         Args:
-            audio_content: Audio file content as bytes
+            audio_content: Audio file content as bytes, or an open binary file
             filename: Original filename (used for file extension detection)
 
         Returns:
             Dictionary with transcription text and confidence level
         """
         try:
-            # Whisper API requires a file object, so we use a temporary file
-            # Determine file extension from filename
-            file_extension = os.path.splitext(filename)[1] or '.wav'
-
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-                temp_file.write(audio_content)
-                temp_file_path = temp_file.name
-
-            try:
-                # Open the temp file and send to Whisper API
-                with open(temp_file_path, 'rb') as audio_file:
-                    response = await self.client.audio.transcriptions.create(
-                        model=self.model,
-                        file=audio_file,
-                        response_format="verbose_json"  # Get detailed response with confidence
-                    )
-
-                # Extract transcription text
-                transcription_text = response.text
-
-                # Whisper doesn't provide direct confidence scores in the simple response
-                # In verbose_json mode, we can estimate based on response quality
-                # For now, we'll use a simple heuristic
-                if transcription_text and len(transcription_text.strip()) > 0:
-                    confidence = "HIGH"
-                else:
-                    confidence = "LOW"
-
-                logger.info(f"Transcription successful: {transcription_text[:100]}...")
-
-                return {
-                    "text": transcription_text,
-                    "confidence": confidence,
-                    "success": True
-                }
-
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
+            # Send the content directly - no temporary file round-trip
+            async with _request_slots:
+                response = await self.client.audio.transcriptions.create(
+                    model=self.model,
+                    file=_audio_file(audio_content, filename),
+                    response_format="verbose_json"  # Get detailed response with confidence
+                )
+
+            # Extract transcription text
+            transcription_text = response.text
+
+            # Whisper doesn't provide direct confidence scores in the simple response
+            # In verbose_json mode, we can estimate based on response quality
+            # For now, we'll use a simple heuristic
+            if transcription_text and len(transcription_text.strip()) > 0:
+                confidence = "HIGH"
+            else:
+                confidence = "LOW"
+
+            logger.info(f"Transcription successful: {transcription_text[:100]}...")
+
+            return {
+                "text": transcription_text,
+                "confidence": confidence,
+                "success": True
+            }
 
         except Exception as e:
             logger.error(f"Error during Whisper transcription: {str(e)}")
@@ -80,6 +99,23 @@ class WhisperService:
                 "error": str(e)
             }
 
+    async def transcribe_file(self, audio_path: str, filename: str = None) -> dict:
+        """
+        Transcribe an audio file already on disk
+
+        The file is streamed into the upload in chunks, so memory use doesn't
+        grow with the recording's length.
+
+        Args:
+            audio_path: Path to the audio file
+            filename: Original filename, for format detection (defaults to the path)
+
+        Returns:
+            Dictionary with transcription text and confidence level
+        """
+        with open(audio_path, "rb") as f:
+            return await self.transcribe_audio(f, filename or audio_path)
+
     async def transcribe_audio_with_language(
         self,
         audio_content: bytes,
@@ -98,36 +134,25 @@ class WhisperService:
             Dictionary with transcription text and confidence level
         """
         try:
-            file_extension = os.path.splitext(filename)[1] or '.wav'
-
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-                temp_file.write(audio_content)
-                temp_file_path = temp_file.name
-
-            try:
-                with open(temp_file_path, 'rb') as audio_file:
-                    response = await self.client.audio.transcriptions.create(
-                        model=self.model,
-                        file=audio_file,
-                        language=language,
-                        response_format="verbose_json"
-                    )
-
-                transcription_text = response.text
-                confidence = "HIGH" if transcription_text and len(transcription_text.strip()) > 0 else "LOW"
+            async with _request_slots:
+                response = await self.client.audio.transcriptions.create(
+                    model=self.model,
+                    file=_audio_file(audio_content, filename),
+                    language=language,
+                    response_format="verbose_json"
+                )
 
-                logger.info(f"Transcription successful (language: {language}): {transcription_text[:100]}...")
+            transcription_text = response.text
+            confidence = "HIGH" if transcription_text and len(transcription_text.strip()) > 0 else "LOW"
 
-                return {
-                    "text": transcription_text,
-                    "confidence": confidence,
-                    "success": True,
-                    "language": language
-                }
+            logger.info(f"Transcription successful (language: {language}): {transcription_text[:100]}...")
 
-            finally:
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
+            return {
+                "text": transcription_text,
+                "confidence": confidence,
+                "success": True,
+                "language": language
+            }
 
         except Exception as e:
             logger.error(f"Error during Whisper transcription with language: {str(e)}")
@@ -137,3 +162,14 @@ class WhisperService:
                 "success": False,
                 "error": str(e)
             }
+
+
+_service: Optional[WhisperService] = None
+
+
+def get_whisper_service() -> WhisperService:
+    """Get the shared WhisperService (one client and connection pool per process)"""
+    global _service
+    if _service is None:
+        _service = WhisperService()
+    return _service
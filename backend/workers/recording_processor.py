@@ -43,30 +43,94 @@ Author: Farm Data Automation Team
 Version: 2.0 (Post-Azure migration)
 """
 import asyncio
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy import select
-from datetime import datetime
+from sqlalchemy import select, update, bindparam, func, or_
+from sqlalchemy.orm import joinedload
+from datetime import datetime, timedelta, timezone
+import hashlib
 import logging
+import orjson
+import os
+from typing import Awaitable, Callable, Dict
 from uuid import UUID
 
+from fastapi import BackgroundTasks
+
+from backend.core.cache import KEY_PREFIX, run_redis
 from backend.core.config import settings
+from backend.core.database import AsyncSessionLocal, utc_now
+from backend.core.events import publish_status
 from backend.models.recording import Recording, RecordingStatus
 from backend.models.client import Client
 from backend.models.schema_mapping import SchemaMapping
-from backend.services.local_storage import LocalStorageService
-from backend.services.whisper_service import WhisperService
-from backend.services.whisper_local import LocalWhisperService
-from backend.services.groq_service import GroqService
-from backend.services.dynamics_client import DynamicsClient
+from backend.services.local_storage import get_storage_service
 
 # bioTrack animal validation
 from backend.schemas.biotrack_animal import get_missing_required_fields, format_missing_fields_prompt
 
 logger = logging.getLogger(__name__)
 
-# Create async engine for background workers
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
-AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+# Built once at import; each run only binds the id. The recording, its client
+# and the client's active schema mappings come back from one joined SELECT
+RECORDING_WITH_CLIENT = (
+    select(Recording)
+    .options(
+        joinedload(Recording.client).joinedload(
+            Client.schema_mappings.and_(SchemaMapping.is_active == True)
+        )
+    )
+    .where(Recording.id == bindparam("recording_id"))
+)
+
+# A run's claim is abandoned once it is older than PROCESSING_TIME_LIMIT (Celery
+# has stopped the task by then). Rows from before claimed_at use updated_at
+CLAIM_EXPIRED = func.coalesce(Recording.claimed_at, Recording.updated_at) < bindparam("lease_expired_before")
+
+# Takes a recording for this run: only a new, failed or abandoned one. A
+# duplicate task for a recording that is still running or has synced gets no
+# row back and stops, instead of running Whisper and Groq again and creating
+# a second Dynamics record
+CLAIM_RECORDING = (
+    update(Recording)
+    .where(
+        Recording.id == bindparam("recording_id"),
+        or_(
+            Recording.status.in_([RecordingStatus.UPLOADED, RecordingStatus.FAILED]),
+            (Recording.status != RecordingStatus.SYNCED) & CLAIM_EXPIRED,
+        ),
+    )
+    .values(status=RecordingStatus.TRANSCRIBING, sync_error=None, claimed_at=utc_now())
+    .returning(Recording.id)
+)
+
+# Records a run's failure without needing the recording loaded in the session
+MARK_FAILED = (
+    update(Recording)
+    .where(Recording.id == bindparam("recording_id"))
+    .values(status=RecordingStatus.FAILED, sync_error=bindparam("error"))
+    .returning(Recording.id, Recording.status, Recording.sync_error)
+)
+
+# The results of an earlier, successfully synced upload of the same audio
+SYNCED_DUPLICATE = (
+    select(
+        Recording.transcription_text,
+        Recording.transcription_confidence,
+        Recording.entity_type,
+        Recording.confidence_score,
+        Recording.extracted_data,
+    )
+    .where(
+        Recording.client_id == bindparam("client_id"),
+        Recording.content_hash == bindparam("content_hash"),
+        Recording.status == RecordingStatus.SYNCED,
+        Recording.id != bindparam("recording_id"),
+    )
+    .limit(1)
+)
+
+# Tasks started by process_recording_async and token prefetches, held until
+# they complete
+_background_tasks = set()
 
 
 async def process_recording_async(recording_id: UUID):
@@ -77,12 +141,10 @@ async def process_recording_async(recording_id: UUID):
     The client can poll the recording status to track progress.
 
     Implementation Note:
-        Currently uses asyncio.create_task() for in-process background execution.
-        In production, this should be replaced with a proper message queue system:
-        - Azure Service Bus
-        - Redis Queue (RQ)
-        - Celery with Redis/RabbitMQ
-        - AWS SQS
+        API routes use schedule_processing(). This helper is for callers outside
+        a request; with PROCESSING_BACKEND="background" it uses
+        asyncio.create_task() and keeps a reference to the task until it
+        finishes. With "celery" the recording is queued for a worker instead.
 
     Args:
         recording_id (UUID): Unique identifier of the recording to process
@@ -98,12 +160,179 @@ async def process_recording_async(recording_id: UUID):
         - PROCESSING: AI is extracting structured data
         - SYNCED: Successfully synced to Dynamics 365
         - FAILED: An error occurred (check recording.sync_error for details)
+        Each change is also published to GET /recordings/{id}/events subscribers.
     """
+    if settings.PROCESSING_BACKEND == "celery":
+        await _queue_recording(recording_id)
+        return
+
     # Start processing in background (non-blocking)
-    asyncio.create_task(process_recording(recording_id))
+    task = asyncio.create_task(process_recording(recording_id))
+    # The event loop only keeps weak references to tasks
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _audio_digest(recording: Recording, audio_path: str) -> str:
+    """
+    BLAKE2b-256 hex digest of the recording's audio
+
+    Uploads record it as content_hash while streaming the file to storage, so
+    only recordings from before that column existed are read and hashed here.
+    """
+    if recording.content_hash:
+        return recording.content_hash
+
+    def hash_file():
+        with open(audio_path, "rb") as f:
+            return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=32)).hexdigest()
+
+    return await asyncio.to_thread(hash_file)
+
+
+async def _cached_result(
+    key: str,
+    compute: Callable[[], Awaitable[Dict]],
+    reusable: Callable[[Dict], bool],
+    ttl_seconds: int
+) -> Dict:
+    """
+    Return a cached pipeline result from Redis, or compute and cache it
+
+    Only results that pass reusable() are stored, so failures are retried on
+    the next run. Without Redis every call computes.
+    """
+    key = f"{KEY_PREFIX}:{key}"
+
+    cached = await run_redis(lambda client: client.get(key))
+    if cached is not None:
+        return orjson.loads(cached)
+
+    result = await compute()
+    if reusable(result):
+        await run_redis(lambda client: client.set(key, orjson.dumps(result), ex=ttl_seconds))
+    return result
+
+
+async def _cached_transcription(
+    audio_digest: str,
+    model: str,
+    transcribe: Callable[[], Awaitable[Dict]]
+) -> Dict:
+    """
+    Transcribe audio, reusing the result for identical audio and model
+
+    Re-uploaded recordings and reprocessing runs skip Whisper entirely. Results
+    are keyed by the audio's digest (see _audio_digest).
+    """
+    return await _cached_result(
+        f"transcription:{model}:{audio_digest}",
+        transcribe,
+        lambda result: result.get("success"),
+        settings.TRANSCRIPTION_CACHE_TTL_SECONDS
+    )
+
+
+async def _cached_extraction(
+    transcription: str,
+    schema_dicts: list,
+    extract: Callable[[], Awaitable[Dict]]
+) -> Dict:
+    """
+    Extract data with Groq, reusing the result for an identical transcript
+
+    Keyed by the exact transcript and the client's schema mappings, so any
+    difference in wording, numbers or mappings gets a fresh extraction.
+    Low-confidence and failed extractions are not reused.
+    """
+    digest = hashlib.sha256(
+        transcription.encode("utf-8") + orjson.dumps(schema_dicts, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+    return await _cached_result(
+        f"extraction:{settings.GROQ_FAST_MODEL}+{settings.GROQ_MODEL}:{digest}",
+        extract,
+        lambda result: (
+            not result.get("error")
+            and result.get("entity_type") != "unknown"
+            and result.get("confidence") != "LOW"
+        ),
+        settings.EXTRACTION_CACHE_TTL_SECONDS
+    )
+
+
+def _needs_full_model(result: Dict) -> bool:
+    """Whether a fast-model extraction is too unreliable to use as-is"""
+    extracted_data = result.get("extracted_data") or {}
+    return bool(
+        result.get("error")
+        or result.get("entity_type") == "unknown"
+        or result.get("confidence") != "HIGH"
+        or get_missing_required_fields(extracted_data, extracted_data.get("category"))
+    )
+
+
+async def _extract(ai_service, transcription: str, schema_dicts: list) -> Dict:
+    """
+    Extract with the fast Groq model, escalating to the full model if needed
+
+    Most transcripts are clear and complete, and the fast model handles them
+    in a fraction of the time. Uncertain, failed or incomplete answers are
+    redone once with GROQ_MODEL, whose result is used either way.
+    """
+    if settings.GROQ_FAST_MODEL:
+        result = await ai_service.extract_with_retry(
+            transcription, schema_dicts, max_retries=3, model=settings.GROQ_FAST_MODEL
+        )
+        if not _needs_full_model(result):
+            return result
+        logger.info(f"Fast model result uncertain or incomplete, retrying with {settings.GROQ_MODEL}")
+
+    return await ai_service.extract_with_retry(transcription, schema_dicts, max_retries=3)
+
+
+async def schedule_processing(recording_id: UUID, background_tasks: BackgroundTasks):
+    """
+    Process a recording after the current response is sent
+
+    Queues it for a Celery worker with PROCESSING_BACKEND="celery", otherwise
+    runs it as a FastAPI background task in this process.
+    """
+    if settings.PROCESSING_BACKEND == "celery":
+        await _queue_recording(recording_id)
+    else:
+        background_tasks.add_task(process_recording, recording_id)
+
+
+async def _queue_recording(recording_id: UUID):
+    from backend.workers.tasks import process_recording_task
+    # Publishing to the broker is blocking I/O
+    await asyncio.to_thread(process_recording_task.delay, str(recording_id))
+
+
+async def _commit(db, recording: Recording):
+    """Commit the recording's progress and notify status subscribers"""
+    await db.commit()
+    await publish_status(recording)
 
 
-async def process_recording(recording_id: UUID):
+async def _announce(recording: Recording, status: RecordingStatus):
+    """
+    Move the recording to a transient status without committing it
+
+    PROCESSING only tells the dashboard what is running, so it goes to status
+    subscribers straight away and reaches the database with the final
+    SYNCED/FAILED, saving a commit.
+    """
+    recording.status = status
+    await publish_status(recording)
+
+
+def lease_expired_before() -> datetime:
+    """Claims made before this time belong to runs that have been stopped"""
+    return datetime.now(timezone.utc) - timedelta(seconds=settings.PROCESSING_TIME_LIMIT)
+
+
+async def process_recording(recording_id: UUID, takeover: bool = False):
     """
     Main processing pipeline for a voice recording
 
@@ -112,13 +341,14 @@ async def process_recording(recording_id: UUID):
     status updates, and validation.
 
     Processing Steps:
-        1. Download Audio File
-           - Retrieves audio file from local storage (./storage/recordings/)
+        1. Locate Audio File
+           - Finds the audio file in local storage (./storage/recordings/)
            - Validates file exists and is accessible
 
         2. Transcribe Audio (OpenAI Whisper)
-           - Converts speech to text using Whisper API
-           - Cost: ~$0.006 per minute of audio
+           - Converts speech to text using local Whisper (reads the stored
+             file in place) or the Whisper API (file is read and uploaded)
+           - API cost: ~$0.006 per minute of audio
            - Updates status: UPLOADED → TRANSCRIBING → TRANSCRIBED
            - Stores transcription_text and confidence score
 
@@ -149,12 +379,17 @@ async def process_recording(recording_id: UUID):
 
     Args:
         recording_id (UUID): Unique identifier of the recording to process
+        takeover (bool): Claim the recording even if another run's claim is
+            still live - for redelivered tasks, whose earlier run has died
 
     Returns:
         None (results are stored in database)
 
     Side Effects:
-        - Updates recording status in database after each step
+        - Claims the recording as TRANSCRIBING first and does nothing if
+          another run has it or it already synced
+        - Commits the transcript and the final status; PROCESSING is only
+          published to status subscribers
         - Stores transcription, extracted_data, and sync results
         - Sets recording.sync_error if any step fails
         - Logs detailed progress to application logs
@@ -173,7 +408,7 @@ async def process_recording(recording_id: UUID):
         - "Dynamics sync failed: Unauthorized - check client credentials"
 
     Database Changes:
-        - Updates recording.status multiple times during processing
+        - Commits recording.status after transcription and when finished
         - Sets recording.transcription_text after step 2
         - Sets recording.extracted_data after step 3
         - Sets recording.dynamics_record_id after step 6
@@ -183,81 +418,132 @@ async def process_recording(recording_id: UUID):
     logger.info(f"Starting processing for recording {recording_id}")
 
     async with AsyncSessionLocal() as db:
+        result = await db.execute(CLAIM_RECORDING, {
+            "recording_id": recording_id,
+            # A redelivered task's earlier run is known to be dead, whatever
+            # the age of its claim
+            "lease_expired_before": datetime.now(timezone.utc) if takeover else lease_expired_before(),
+        })
+        if result.scalar_one_or_none() is None:
+            logger.info(f"Recording {recording_id} not found, already processing or synced; skipping")
+            return
+        await db.commit()
+
         try:
-            # Get recording
-            result = await db.execute(select(Recording).where(Recording.id == recording_id))
-            recording = result.scalar_one_or_none()
+            # Get recording with its client and schema mappings
+            result = await db.execute(RECORDING_WITH_CLIENT, {"recording_id": recording_id})
+            recording = result.unique().scalar_one_or_none()
 
             if not recording:
                 logger.error(f"Recording {recording_id} not found")
                 return
 
-            # Get client
-            result = await db.execute(select(Client).where(Client.id == recording.client_id))
-            client = result.scalar_one_or_none()
+            client = recording.client
 
             if not client:
                 logger.error(f"Client {recording.client_id} not found")
                 return
 
-            # Step 1: Download audio file
-            logger.info(f"[{recording_id}] Step 1: Downloading audio file")
+            # Step 1: Locate audio file
+            logger.info(f"[{recording_id}] Step 1: Locating audio file")
 
-            # Download from local storage
             if not recording.file_path:
                 raise ValueError("No file path found for recording")
 
-            storage_service = LocalStorageService()
-            audio_content = await storage_service.download_file(recording.file_path)
+            storage_service = get_storage_service()
+            audio_path = storage_service.get_file_path(recording.file_path)
+            if not os.path.exists(audio_path):
+                raise FileNotFoundError(f"File not found: {recording.file_path}")
+
+            # Re-uploads of a recording that already synced (retries, devices
+            # re-sending a day's recordings) reuse its transcription and
+            # extraction instead of running Whisper and Groq again
+            previous = None
+            if recording.content_hash:
+                result = await db.execute(SYNCED_DUPLICATE, {
+                    "client_id": recording.client_id,
+                    "content_hash": recording.content_hash,
+                    "recording_id": recording.id,
+                })
+                previous = result.one_or_none()
 
             # Step 2: Transcribe audio
             logger.info(f"[{recording_id}] Step 2: Transcribing audio")
-            recording.status = RecordingStatus.TRANSCRIBING
-            await db.commit()
+            # Committed as TRANSCRIBING by the claim
+            await publish_status(recording)
 
             # Choose transcription service based on config
-            if settings.WHISPER_MODE == "local":
+            # Service modules are imported on first use: whisper loads CTranslate2
+            # and the API clients are slow to import, and none of them are
+            # needed to serve requests that don't process audio (the local model
+            # is loaded at startup only when WHISPER_PRELOAD is set)
+            if previous:
+                logger.info(f"[{recording_id}] Same audio already synced, reusing its transcription")
+                transcription_result = {
+                    "success": True,
+                    "text": previous.transcription_text,
+                    "confidence": previous.transcription_confidence,
+                }
+            elif settings.WHISPER_MODE == "local":
+                from backend.services.whisper_local import get_local_whisper_service
                 logger.info(f"[{recording_id}] Using FREE local Whisper (model: {settings.WHISPER_LOCAL_MODEL})")
-                speech_service = LocalWhisperService(model_name=settings.WHISPER_LOCAL_MODEL)
+                speech_service = get_local_whisper_service(settings.WHISPER_LOCAL_MODEL)
+                # Whisper reads the stored file directly - no copy into memory
+                transcription_result = await _cached_transcription(
+                    await _audio_digest(recording, audio_path),
+                    f"local:{settings.WHISPER_LOCAL_MODEL}",
+                    lambda: speech_service.transcribe_file(audio_path, recording.filename)
+                )
             else:
+                from backend.services.whisper_service import get_whisper_service
                 logger.info(f"[{recording_id}] Using OpenAI Whisper API (cost: ~$0.006/min)")
-                speech_service = WhisperService()
-
-            transcription_result = await speech_service.transcribe_audio(audio_content, recording.filename)
+                speech_service = get_whisper_service()
+                # Uploaded straight from the stored file in chunks - no copy into memory
+                transcription_result = await _cached_transcription(
+                    await _audio_digest(recording, audio_path),
+                    f"api:{settings.WHISPER_MODEL}",
+                    lambda: speech_service.transcribe_file(audio_path, recording.filename)
+                )
 
             if not transcription_result.get("success"):
                 recording.status = RecordingStatus.FAILED
                 recording.sync_error = f"Transcription failed: {transcription_result.get('error')}"
-                await db.commit()
+                await _commit(db, recording)
                 logger.error(f"[{recording_id}] Transcription failed")
                 return
 
             recording.transcription_text = transcription_result["text"]
             recording.transcription_confidence = transcription_result["confidence"]
             recording.status = RecordingStatus.TRANSCRIBED
-            await db.commit()
+            await _commit(db, recording)
 
             logger.info(f"[{recording_id}] Transcription successful")
 
+            from backend.services.dynamics_client import DynamicsClient
+            dynamics_client = DynamicsClient(
+                base_url=client.dynamics_url,
+                client_id=client.dynamics_client_id,
+                client_secret=client.dynamics_client_secret,
+                tenant_id=client.dynamics_tenant_id
+            )
+            # Log in to Dynamics while the AI extracts, so Step 5 doesn't wait
+            # for Azure AD (it waits on the same login if it is still running)
+            token_prefetch = asyncio.create_task(dynamics_client.prefetch_token())
+            _background_tasks.add(token_prefetch)
+            token_prefetch.add_done_callback(_background_tasks.discard)
+
             # Step 3: Extract data using AI
             logger.info(f"[{recording_id}] Step 3: Extracting data with AI")
-            recording.status = RecordingStatus.PROCESSING
-            await db.commit()
+            await _announce(recording, RecordingStatus.PROCESSING)
 
-            # Get schema mappings for client
-            result = await db.execute(
-                select(SchemaMapping).where(
-                    SchemaMapping.client_id == client.id,
-                    SchemaMapping.is_active == True
-                )
-            )
-            schema_mappings = result.scalars().all()
+            # Active schema mappings, loaded with the recording
+            schema_mappings = client.schema_mappings
 
             if not schema_mappings:
                 logger.warning(f"[{recording_id}] No schema mappings found for client {client.name}")
                 recording.status = RecordingStatus.FAILED
                 recording.sync_error = "No schema mappings configured for this client"
-                await db.commit()
+                await _commit(db, recording)
                 return
 
             # Convert schema mappings to dict format for AI
@@ -271,27 +557,44 @@ async def process_recording(recording_id: UUID):
                 for sm in schema_mappings
             ]
 
-            ai_service = GroqService()
-            extraction_result = await ai_service.extract_with_retry(
-                recording.transcription_text,
-                schema_dicts,
-                max_retries=3
-            )
+            from backend.services.groq_service import get_groq_service
+            ai_service = get_groq_service()
+            if previous:
+                extraction_result = {
+                    "entity_type": previous.entity_type,
+                    "confidence": previous.confidence_score,
+                    # Recordings synced before extracted_data held only the
+                    # fields stored the whole extraction result there
+                    "extracted_data": previous.extracted_data.get("extracted_data", previous.extracted_data),
+                }
+            else:
+                extraction_result = await _cached_extraction(
+                    recording.transcription_text,
+                    schema_dicts,
+                    lambda: _extract(ai_service, recording.transcription_text, schema_dicts)
+                )
 
             entity_type = extraction_result.get("entity_type")
-            extracted_data = extraction_result.get("extracted_data", {})
+            extracted_data = extraction_result.get("extracted_data") or {}
             confidence = extraction_result.get("confidence", "LOW")
 
             if entity_type == "unknown":
                 recording.status = RecordingStatus.FAILED
-                recording.sync_error = "Could not determine entity type from transcription"
-                recording.extracted_data = extraction_result
-                await db.commit()
-                logger.error(f"[{recording_id}] Unknown entity type")
+                # extracted_data holds only the fields, so a failed call's
+                # reason goes in sync_error
+                error = extraction_result.get("error")
+                if error:
+                    recording.sync_error = f"AI extraction failed: {error}"
+                else:
+                    recording.sync_error = "Could not determine entity type from transcription"
+                recording.extracted_data = extracted_data
+                await _commit(db, recording)
+                logger.error(f"[{recording_id}] Unknown entity type: {recording.sync_error}")
                 return
 
             recording.entity_type = entity_type
-            recording.extracted_data = extraction_result
+            # Only the fields: entity type and confidence have their own columns
+            recording.extracted_data = extracted_data
             recording.confidence_score = confidence
 
             # Check for missing required fields
@@ -304,11 +607,11 @@ async def process_recording(recording_id: UUID):
                 # Store missing fields information
                 recording.sync_error = format_missing_fields_prompt(missing_fields)
                 recording.status = RecordingStatus.FAILED
-                await db.commit()
+                await _commit(db, recording)
                 logger.warning(f"[{recording_id}] Missing required fields: {missing_fields}")
                 return
 
-            await db.commit()
+            # Extraction results are committed with the final status
 
             logger.info(f"[{recording_id}] Data extraction successful. Entity: {entity_type}")
 
@@ -324,7 +627,7 @@ async def process_recording(recording_id: UUID):
             if not matching_schema:
                 recording.status = RecordingStatus.FAILED
                 recording.sync_error = f"No schema mapping found for entity type: {entity_type}"
-                await db.commit()
+                await _commit(db, recording)
                 return
 
             # Validate extracted data
@@ -336,7 +639,7 @@ async def process_recording(recording_id: UUID):
             if not validation_result["is_valid"]:
                 recording.status = RecordingStatus.FAILED
                 recording.sync_error = f"Validation errors: {', '.join(validation_result['errors'])}"
-                await db.commit()
+                await _commit(db, recording)
                 logger.error(f"[{recording_id}] Validation failed")
                 return
 
@@ -351,13 +654,6 @@ async def process_recording(recording_id: UUID):
             # Step 5: Create record in Dynamics 365
             logger.info(f"[{recording_id}] Step 5: Creating record in Dynamics 365")
 
-            dynamics_client = DynamicsClient(
-                base_url=client.dynamics_url,
-                client_id=client.dynamics_client_id,
-                client_secret=client.dynamics_client_secret,
-                tenant_id=client.dynamics_tenant_id
-            )
-
             dynamics_result = await dynamics_client.create_record(
                 entity_name=matching_schema.dynamics_entity_name,
                 data=dynamics_data
@@ -365,13 +661,18 @@ async def process_recording(recording_id: UUID):
 
             recording.dynamics_record_id = dynamics_result["id"]
             recording.status = RecordingStatus.SYNCED
-            recording.processed_at = datetime.utcnow()
-            await db.commit()
+            recording.processed_at = datetime.now(timezone.utc)
+            await _commit(db, recording)
 
             logger.info(f"[{recording_id}] Successfully synced to Dynamics 365. Record ID: {dynamics_result['id']}")
 
         except Exception as e:
             logger.error(f"[{recording_id}] Error processing recording: {str(e)}")
-            recording.status = RecordingStatus.FAILED
-            recording.sync_error = str(e)
+            # The failure may have come before the recording was loaded, or
+            # from a commit that left the session needing a rollback
+            await db.rollback()
+            result = await db.execute(MARK_FAILED, {"recording_id": recording_id, "error": str(e)})
+            failed = result.one_or_none()
             await db.commit()
+            if failed is not None:
+                await publish_status(failed)
@@ -0,0 +1,95 @@
+"""
+Celery tasks for durable recording processing
+
+With PROCESSING_BACKEND="celery", uploads are queued in Redis and processed by
+separate worker processes instead of the API process. Queued and in-flight
+recordings survive API restarts and worker crashes, and throughput scales
+with the number of workers.
+
+Delivery:
+    - Tasks are acknowledged after they finish (acks_late), so a recording
+      whose worker dies mid-run is delivered again: at once if the worker
+      process is lost, otherwise after CELERY_VISIBILITY_TIMEOUT
+    - A run first claims its recording (see CLAIM_RECORDING), so a duplicate
+      task for a recording that is still running or already synced does nothing
+    - Runs are stopped after PROCESSING_TIME_LIMIT, below the visibility
+      timeout, so a redelivered task's earlier run is always dead: it takes
+      over that run's claim instead of being skipped
+    - Each worker process takes one recording at a time (prefetch 1)
+    - The broker uses its own Redis database (CELERY_BROKER_URL), separate
+      from the response cache
+
+Running a worker:
+    celery -A backend.workers.tasks worker --loglevel=info --concurrency=2
+
+    Each worker process loads its own Whisper model in local mode, so size
+    --concurrency to the machine's memory and cores.
+
+    The Procfile's worker line starts this too. With the default
+    PROCESSING_BACKEND="background" nothing is queued for it: scale it to
+    zero, or it sits idle (it skips the Whisper preload in that case).
+
+Monitoring:
+    GET /api/v1/health/queue reports how many recordings are waiting
+"""
+import asyncio
+import logging
+from uuid import UUID
+
+from celery import Celery
+from celery.signals import worker_process_init
+
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RECORDINGS_QUEUE = "recordings"
+
+celery_app = Celery("farm_data_automation", broker=settings.CELERY_BROKER_URL)
+celery_app.conf.update(
+    task_default_queue=RECORDINGS_QUEUE,
+    task_serializer="json",
+    accept_content=["json"],
+    task_ignore_result=True,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    task_time_limit=settings.PROCESSING_TIME_LIMIT,
+    # Redelivered if not acknowledged within this time - longer than
+    # task_time_limit so a running recording isn't picked up twice
+    broker_transport_options={"visibility_timeout": settings.CELERY_VISIBILITY_TIMEOUT},
+)
+
+# One event loop per worker process, kept for its lifetime: the shared HTTP
+# clients, semaphores and database pool are bound to the loop they were
+# first used on, so a fresh asyncio.run() per task would break them
+_loop = None
+
+
+@worker_process_init.connect
+def _start_event_loop(**kwargs):
+    global _loop
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+
+    if settings.PROCESSING_BACKEND != "celery":
+        logger.warning(
+            f"PROCESSING_BACKEND is {settings.PROCESSING_BACKEND!r}, so no recordings are "
+            f"queued for this worker; scale it to zero unless PROCESSING_BACKEND=celery"
+        )
+        return
+    if settings.WHISPER_MODE == "local" and settings.WHISPER_PRELOAD:
+        from backend.services.whisper_local import preload_local_whisper
+        _loop.run_until_complete(preload_local_whisper(settings.WHISPER_LOCAL_MODEL))
+
+
+@celery_app.task(name="recordings.process", bind=True)
+def process_recording_task(self, recording_id: str):
+    """Run the processing pipeline for one recording"""
+    # Imported here so the API process can queue tasks without loading the pipeline
+    from backend.workers.recording_processor import process_recording
+
+    redelivered = bool((self.request.delivery_info or {}).get("redelivered"))
+    if _loop is None:
+        _start_event_loop()
+    _loop.run_until_complete(process_recording(UUID(recording_id), takeover=redelivered))
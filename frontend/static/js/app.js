@@ -228,6 +228,7 @@ async function handleFileUpload() {
 
         // Refresh recordings
         await loadRecordings();
+        watchRecording(result.recording_id);
 
     } catch (error) {
         showToast('Upload failed: ' + error.message, 'error');
@@ -327,6 +328,7 @@ async function submitRecording() {
             throw new Error('Upload failed');
         }
 
+        const result = await response.json();
         showToast('Recording submitted successfully!', 'success');
 
         // Reset UI
@@ -339,6 +341,7 @@ async function submitRecording() {
 
         // Refresh recordings
         await loadRecordings();
+        watchRecording(result.recording_id);
 
     } catch (error) {
         showToast('Submission failed: ' + error.message, 'error');
@@ -379,6 +382,37 @@ async function loadRecordings() {
     }
 }
 
+// Refresh the list whenever a processing recording changes status
+function watchRecording(recordingId) {
+    const events = new EventSource(`${API_BASE_URL}/recordings/${recordingId}/events`);
+
+    events.addEventListener('status', async (e) => {
+        const { status } = JSON.parse(e.data);
+        if (status === 'synced' || status === 'failed') {
+            events.close();
+        }
+        await loadRecordings();
+        // Processing is streamed but not saved, so the reloaded
+        // list can still show the previous status
+        showRecordingStatus(recordingId, status);
+    });
+
+    events.addEventListener('deleted', async () => {
+        events.close();
+        await loadRecordings();
+    });
+
+    // EventSource reconnects by itself after a dropped connection (e.g. a
+    // proxy idle timeout); it is only closed once the status is final
+}
+
+function showRecordingStatus(recordingId, status) {
+    const badge = document.querySelector(`.recording-item[data-recording-id="${recordingId}"] .status-badge`);
+    if (!badge) return;
+    badge.className = `status-badge status-${status}`;
+    badge.textContent = status;
+}
+
 function createRecordingItem(recording) {
     const date = new Date(recording.created_at).toLocaleString();
     const status = recording.status;
@@ -407,11 +441,11 @@ function createRecordingItem(recording) {
     }
 
     return `
-        <div class="recording-item">
+        <div class="recording-item" data-recording-id="${recording.id}">
             <div class="recording-info">
                 <h4>${recording.filename}</h4>
                 <p>Uploaded: ${date}</p>
-                ${recording.transcription_text ? `<p>Transcription: ${recording.transcription_text.substring(0, 100)}...</p>` : ''}
+                ${recording.transcription_preview ? `<p>Transcription: ${recording.transcription_preview}...</p>` : ''}
                 ${recording.entity_type ? `<p>Entity Type: ${recording.entity_type}</p>` : ''}
                 ${errorSection}
             </div>
@@ -426,12 +460,17 @@ async function reprocessRecording(recordingId) {
             method: 'POST'
         });
 
+        if (response.status === 409) {
+            showToast('Recording is already being processed', 'info');
+            return;
+        }
         if (!response.ok) {
             throw new Error('Reprocessing failed');
         }
 
         showToast('Recording queued for reprocessing', 'success');
         await loadRecordings();
+        watchRecording(recordingId);
 
     } catch (error) {
         showToast('Reprocessing failed: ' + error.message, 'error');
@@ -0,0 +1,40 @@
+"""
+Alembic environment
+
+Runs migrations on the application's async engine, so they use the same
+DATABASE_URL and driver (asyncpg / aiosqlite) as the API. Revisions inspect
+the live schema before changing it, so there is no offline (--sql) mode.
+"""
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+
+from backend.core.database import Base, engine
+import backend.models  # noqa: F401 - registers the tables on Base.metadata
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def _run_migrations(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online():
+    """Run migrations against the configured database"""
+    async with engine.connect() as connection:
+        await connection.run_sync(_run_migrations)
+    await engine.dispose()
+
+
+asyncio.run(run_migrations_online())
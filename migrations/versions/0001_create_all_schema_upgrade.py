@@ -0,0 +1,225 @@
+"""
+Bring databases created by init_db (create_all) up to the current models
+
+Tables created before this revision have no server defaults for id and the
+timestamps (they were generated in Python), store recording status as the
+enum name ("UPLOADED") rather than its value ("uploaded"), and lack the
+listing indexes. On PostgreSQL the status column is also a native enum type,
+the timestamps have no time zone and the JSON columns are json, not jsonb.
+
+Each step checks the live schema first, so this is a no-op on a database
+create_all built from the current models, and on an empty database (init_db
+creates the tables afterwards).
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-14
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+TABLES = ("clients", "schema_mappings", "recordings")
+
+TIMESTAMP_COLUMNS = {
+    "clients": ("created_at", "updated_at"),
+    "schema_mappings": ("created_at", "updated_at"),
+    "recordings": ("created_at", "updated_at", "processed_at"),
+}
+
+JSON_COLUMNS = {
+    "clients": ("settings",),
+    "schema_mappings": ("field_mappings", "validation_rules", "detection_keywords"),
+    "recordings": ("extracted_data",),
+}
+
+STATUS_CHECK = (
+    "status IN ('uploaded', 'transcribing', 'transcribed', 'processing', "
+    "'processed', 'synced', 'failed')"
+)
+
+# SQLite SQL of gen_random_uuid() and utc_now() in backend.core.database,
+# copied so this revision doesn't change if those helpers do
+SQLITE_UUID = "(lower(hex(randomblob(16))))"
+SQLITE_NOW = (
+    "(strftime('%Y-%m-%d %H:%M:%S', 'now') || '.' || "
+    "substr(strftime('%f', 'now'), 4) || '000')"
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not set(TABLES).issubset(inspector.get_table_names()):
+        return
+
+    if bind.dialect.name == "postgresql":
+        _upgrade_postgresql(inspector)
+    else:
+        _upgrade_sqlite(inspector)
+    _create_indexes(bind.dialect.name)
+
+
+def _upgrade_postgresql(inspector):
+    for table in TABLES:
+        columns = {column["name"]: column for column in inspector.get_columns(table)}
+
+        op.alter_column(table, "id", server_default=sa.text("gen_random_uuid()"))
+        for name in TIMESTAMP_COLUMNS[table]:
+            if not columns[name]["type"].timezone:
+                # Naive values were written with datetime.utcnow()
+                op.alter_column(
+                    table, name,
+                    type_=sa.DateTime(timezone=True),
+                    postgresql_using=f"{name} AT TIME ZONE 'UTC'",
+                )
+        for name in ("created_at", "updated_at"):
+            op.alter_column(table, name, server_default=sa.text("now()"))
+        for name in JSON_COLUMNS[table]:
+            if not isinstance(columns[name]["type"], postgresql.JSONB):
+                op.alter_column(
+                    table, name,
+                    type_=postgresql.JSONB(),
+                    postgresql_using=f"{name}::jsonb",
+                )
+
+    status_type = next(
+        column["type"] for column in inspector.get_columns("recordings")
+        if column["name"] == "status"
+    )
+    if isinstance(status_type, sa.Enum):
+        # Native enum of the member names -> VARCHAR of the values
+        op.alter_column(
+            "recordings", "status",
+            type_=sa.String(16),
+            postgresql_using="lower(status::text)",
+        )
+        op.execute("DROP TYPE IF EXISTS recordingstatus")
+
+    checks = {check["name"] for check in inspector.get_check_constraints("recordings")}
+    if "ck_recordings_status" not in checks:
+        op.execute("UPDATE recordings SET status = lower(status) WHERE status <> lower(status)")
+        op.create_check_constraint("ck_recordings_status", "recordings", STATUS_CHECK)
+
+
+def _upgrade_sqlite(inspector):
+    for table in TABLES:
+        # SQLAlchemy binds SQLite datetimes with microseconds; rows written by
+        # CURRENT_TIMESTAMP have none and compare wrongly against them
+        for name in TIMESTAMP_COLUMNS[table]:
+            op.execute(f"UPDATE {table} SET {name} = {name} || '.000000' WHERE length({name}) = 19")
+
+        columns = {column["name"]: column for column in inspector.get_columns(table)}
+        needs_defaults = columns["id"]["default"] is None
+        needs_check = table == "recordings" and "ck_recordings_status" not in {
+            check["name"] for check in inspector.get_check_constraints(table)
+        }
+        if not (needs_defaults or needs_check):
+            continue
+
+        if needs_check:
+            op.execute("UPDATE recordings SET status = lower(status) WHERE status <> lower(status)")
+
+        # SQLite can't ALTER a column default or add a constraint in place:
+        # batch mode copies the rows into a rebuilt table. The UUID columns are
+        # given explicitly because reflection reads them back as NUMERIC; left
+        # to detect that as a type change, the copy would CAST the ids
+        uuid_columns = [sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True)]
+        if "client_id" in columns:
+            uuid_columns.append(
+                sa.Column("client_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("clients.id"), nullable=False)
+            )
+        with op.batch_alter_table(table, recreate="always", reflect_args=uuid_columns) as batch:
+            if needs_defaults:
+                batch.alter_column("id", server_default=sa.text(SQLITE_UUID))
+                for name in ("created_at", "updated_at"):
+                    batch.alter_column(name, server_default=sa.text(SQLITE_NOW))
+            if needs_check:
+                batch.alter_column("status", type_=sa.String(16))
+                batch.create_check_constraint("ck_recordings_status", STATUS_CHECK)
+
+
+def _create_indexes(dialect_name):
+    op.create_index("ix_recordings_status", "recordings", ["status"], if_not_exists=True)
+    op.create_index(
+        "ix_recordings_dynamics_record_id", "recordings", ["dynamics_record_id"], if_not_exists=True
+    )
+    op.create_index(
+        "ix_recordings_client_created", "recordings",
+        ["client_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_recordings_client_status_created", "recordings",
+        ["client_id", "status", sa.text("created_at DESC"), sa.text("id DESC")],
+        if_not_exists=True,
+    )
+
+    if dialect_name == "postgresql":
+        op.create_index(
+            "ix_recordings_extracted_data", "recordings", ["extracted_data"],
+            postgresql_using="gin",
+            postgresql_ops={"extracted_data": "jsonb_path_ops"},
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_clients_settings_username", "clients",
+            [sa.text("(settings ->> 'username')")],
+            postgresql_where=sa.text("is_active"),
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    """
+    Drop the indexes and the status check constraint this revision adds
+
+    The column conversions are kept: the ids and timestamps keep their
+    server defaults, PostgreSQL keeps timestamptz and jsonb, and statuses
+    stay lowercase values in a string column. Code from before this
+    revision still writes ids and timestamps itself, but reads statuses as
+    enum names, so it can't run against a downgraded database unchanged.
+    """
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not set(TABLES).issubset(inspector.get_table_names()):
+        return
+
+    for name in (
+        "ix_recordings_status",
+        "ix_recordings_dynamics_record_id",
+        "ix_recordings_client_created",
+        "ix_recordings_client_status_created",
+    ):
+        op.drop_index(name, table_name="recordings", if_exists=True)
+    if bind.dialect.name == "postgresql":
+        op.drop_index("ix_recordings_extracted_data", table_name="recordings", if_exists=True)
+        op.drop_index("ix_clients_settings_username", table_name="clients", if_exists=True)
+
+    checks = {check["name"] for check in inspector.get_check_constraints("recordings")}
+    if "ck_recordings_status" in checks:
+        if bind.dialect.name == "postgresql":
+            op.drop_constraint("ck_recordings_status", "recordings", type_="check")
+        else:
+            # SQLite can't drop a constraint in place; the UUID columns are
+            # given explicitly for the rebuild as in _upgrade_sqlite
+            uuid_columns = [
+                sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+                sa.Column("client_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("clients.id"), nullable=False),
+            ]
+            with op.batch_alter_table("recordings", recreate="always", reflect_args=uuid_columns) as batch:
+                batch.drop_constraint("ck_recordings_status", type_="check")
+
+    logger.info(
+        "0001 downgraded: indexes and ck_recordings_status dropped; "
+        "column types, server defaults and lowercase statuses kept"
+    )
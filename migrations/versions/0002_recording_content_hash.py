@@ -0,0 +1,38 @@
+"""
+Add recordings.content_hash for duplicate-upload detection
+
+Uploads store a BLAKE2b-256 digest of the audio, and processing looks up an
+earlier recording of the same client with that digest to reuse its
+transcription and extraction. Existing rows keep a NULL hash and are simply
+never matched.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-14
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if "recordings" not in inspector.get_table_names():
+        return
+
+    if "content_hash" not in {column["name"] for column in inspector.get_columns("recordings")}:
+        op.add_column("recordings", sa.Column("content_hash", sa.String(64), nullable=True))
+    op.create_index(
+        "ix_recordings_client_content_hash", "recordings",
+        ["client_id", "content_hash"],
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_recordings_client_content_hash", table_name="recordings", if_exists=True)
+    op.drop_column("recordings", "content_hash")
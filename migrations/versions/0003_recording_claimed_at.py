@@ -0,0 +1,31 @@
+"""
+Add recordings.claimed_at, the start of a processing run's claim
+
+A run's claim expires PROCESSING_TIME_LIMIT after it was made, when the run
+has been stopped, so another run or a reprocess request can take the
+recording over. Existing rows keep NULL and fall back to updated_at.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-14
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if "recordings" not in inspector.get_table_names():
+        return
+
+    if "claimed_at" not in {column["name"] for column in inspector.get_columns("recordings")}:
+        op.add_column("recordings", sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column("recordings", "claimed_at")
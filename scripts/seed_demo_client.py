@@ -8,10 +8,102 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from backend.core.database import AsyncSessionLocal, init_db
+from backend.core.database import AsyncSessionLocal, dialect_insert, init_db
+from backend.core.security import hash_password
 from backend.models.client import Client
 from backend.models.schema_mapping import SchemaMapping
 
+# Dashboard login password for the demo account (stored hashed)
+DEMO_PASSWORD = "demo123"
+
+# Values the demo client is created with until real Azure AD credentials are set
+PLACEHOLDER_CREDENTIALS = frozenset({
+    "YOUR_AZURE_AD_APP_CLIENT_ID",
+    "YOUR_AZURE_AD_APP_SECRET",
+    "YOUR_AZURE_AD_TENANT_ID",
+})
+
+# bioTrack animal schema mapping: AI field name -> Dynamics column
+ANIMAL_FIELD_MAPPINGS = {
+    # Identification
+    "ear_tag": "bt_ear_tag",
+    "rfid": "bt_rfid",
+    "bio_id": "bt_bio_id",
+    "registration_name": "bt_registration_name",
+    "registration_id": "bt_registration_id",
+
+    # Basic Information
+    "category": "bt_category",
+    "species": "bt_species",
+    "sex": "bt_sex",
+    "birth_date": "bt_birth_date",
+    "location": "bt_location",
+
+    # Birth Information
+    "herd_letter": "bt_herd_letter",
+    "one_time_herd_letter": "bt_one_time_herd_letter",
+    "birth_season": "bt_birth_season",
+    "born_as": "bt_born_as",
+    "raised_as": "bt_raised_as",
+    "birthing_ease": "bt_birthing_ease",
+    "birth_weight": "bt_birth_weight",
+    "birth_weight_uom": "bt_birth_weight_uom",
+
+    # Parentage
+    "dam_id": "bt_dam_id",
+    "sire_id": "bt_sire_id",
+    "foster_id": "bt_foster_id",
+    "donor_id": "bt_donor_id",
+
+    # Physical Characteristics
+    "colour": "bt_colour",
+    "horn": "bt_horn",
+    "breed_composition": "bt_breed_composition",
+
+    # Comments
+    "animal_comments": "bt_comments"
+}
+
+ANIMAL_VALIDATION_RULES = {
+    # Always required fields
+    "category": {"type": "string", "required": True},
+    "species": {"type": "string", "required": True},
+    "birth_date": {"type": "date", "required": True},
+    "sex": {"type": "string", "required": True},
+    "breed_composition": {"type": "object", "required": True},
+    "location": {"type": "string", "required": True},
+
+    # Conditionally required
+    "ear_tag": {"type": "string", "required": False, "unique": True},
+    "rfid": {"type": "string", "required": False, "pattern": r"^\d{15,20}$"},
+    "herd_letter": {"type": "string", "required": False},
+    "birth_season": {"type": "string", "required": False},
+    "birth_weight_uom": {"type": "string", "required": False},
+
+    # Optional fields
+    "registration_name": {"type": "string", "required": False},
+    "registration_id": {"type": "string", "required": False},
+    "born_as": {"type": "string", "required": False},
+    "raised_as": {"type": "string", "required": False},
+    "birthing_ease": {"type": "string", "required": False},
+    "birth_weight": {"type": "float", "required": False},
+    "dam_id": {"type": "string", "required": False},
+    "sire_id": {"type": "string", "required": False},
+    "colour": {"type": "string", "required": False},
+    "animal_comments": {"type": "string", "required": False}
+}
+
+# Words in a transcription that mark it as an animal record
+ANIMAL_DETECTION_KEYWORDS = [
+    "animal", "cow", "cattle", "bull", "heifer", "steer",
+    "sheep", "lamb", "ewe", "ram",
+    "goat", "kid", "doe", "buck",
+    "bison", "buffalo",
+    "ear tag", "rfid", "tag number",
+    "birth", "born", "calving", "lambing",
+    "biotrack", "bio track"
+]
+
 
 async def seed_demo_client():
     """Create a demo client and bioTrack schema mapping"""
@@ -19,17 +111,12 @@ async def seed_demo_client():
     await init_db()
 
     async with AsyncSessionLocal() as db:
-        # Check if demo client already exists
-        from sqlalchemy import select
-        result = await db.execute(select(Client).where(Client.name == "Demo Farm"))
-        existing_client = result.scalar_one_or_none()
-
-        if existing_client:
-            print(f"[OK] Demo client already exists (ID: {existing_client.id})")
-            client = existing_client
-        else:
-            # Create demo client configuration
-            client = Client(
+        # Insert the demo client unless one with its name exists; RETURNING
+        # gives back the new row, so no refresh is needed
+        from sqlalchemy import insert, select
+        result = await db.execute(
+            dialect_insert(Client)
+            .values(
                 name="Demo Farm",
                 dynamics_url="https://yourorg.crm3.dynamics.com",
 
@@ -47,112 +134,49 @@ async def seed_demo_client():
                 # These are the credentials users use to log into the voice automation dashboard
                 settings={
                     "username": "demo@example.com",
-                    "password": "demo123",
+                    "password_hash": hash_password(DEMO_PASSWORD),
                     "login_url": "https://yourorg.crm3.dynamics.com/",
                     "description": "Demo account for farm voice automation"
                 }
             )
-            db.add(client)
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(Client)
+        )
+        client = result.scalar_one_or_none()
+
+        if client:
             await db.commit()
-            await db.refresh(client)
             print(f"[OK] Created demo client: {client.name} (ID: {client.id})")
-
-        # Check if schema mapping already exists
-        result = await db.execute(
-            select(SchemaMapping).where(
-                SchemaMapping.client_id == client.id,
-                SchemaMapping.entity_name == "animal"
+            # A client created just now has no schema mappings yet
+            existing_mapping = None
+        else:
+            # The existing client and its animal mapping (if any) in one query
+            result = await db.execute(
+                select(Client, SchemaMapping.id)
+                .outerjoin(
+                    SchemaMapping,
+                    (SchemaMapping.client_id == Client.id) & (SchemaMapping.entity_name == "animal")
+                )
+                .where(Client.name == "Demo Farm")
             )
-        )
-        existing_mapping = result.scalar_one_or_none()
+            client, existing_mapping = result.first()
+            print(f"[OK] Demo client already exists (ID: {client.id})")
 
         if existing_mapping:
             print(f"[OK] Schema mapping already exists for {client.name}")
         else:
-            # Create bioTrack animal schema mapping
-            schema_mapping = SchemaMapping(
-                client_id=client.id,
-                entity_name="animal",
-                dynamics_entity_name="biotrack_animals",
-                field_mappings={
-                    # Identification
-                    "ear_tag": "bt_ear_tag",
-                    "rfid": "bt_rfid",
-                    "bio_id": "bt_bio_id",
-                    "registration_name": "bt_registration_name",
-                    "registration_id": "bt_registration_id",
-
-                    # Basic Information
-                    "category": "bt_category",
-                    "species": "bt_species",
-                    "sex": "bt_sex",
-                    "birth_date": "bt_birth_date",
-                    "location": "bt_location",
-
-                    # Birth Information
-                    "herd_letter": "bt_herd_letter",
-                    "one_time_herd_letter": "bt_one_time_herd_letter",
-                    "birth_season": "bt_birth_season",
-                    "born_as": "bt_born_as",
-                    "raised_as": "bt_raised_as",
-                    "birthing_ease": "bt_birthing_ease",
-                    "birth_weight": "bt_birth_weight",
-                    "birth_weight_uom": "bt_birth_weight_uom",
-
-                    # Parentage
-                    "dam_id": "bt_dam_id",
-                    "sire_id": "bt_sire_id",
-                    "foster_id": "bt_foster_id",
-                    "donor_id": "bt_donor_id",
-
-                    # Physical Characteristics
-                    "colour": "bt_colour",
-                    "horn": "bt_horn",
-                    "breed_composition": "bt_breed_composition",
-
-                    # Comments
-                    "animal_comments": "bt_comments"
-                },
-                validation_rules={
-                    # Always required fields
-                    "category": {"type": "string", "required": True},
-                    "species": {"type": "string", "required": True},
-                    "birth_date": {"type": "date", "required": True},
-                    "sex": {"type": "string", "required": True},
-                    "breed_composition": {"type": "object", "required": True},
-                    "location": {"type": "string", "required": True},
-
-                    # Conditionally required
-                    "ear_tag": {"type": "string", "required": False, "unique": True},
-                    "rfid": {"type": "string", "required": False, "pattern": r"^\d{15,20}$"},
-                    "herd_letter": {"type": "string", "required": False},
-                    "birth_season": {"type": "string", "required": False},
-                    "birth_weight_uom": {"type": "string", "required": False},
-
-                    # Optional fields
-                    "registration_name": {"type": "string", "required": False},
-                    "registration_id": {"type": "string", "required": False},
-                    "born_as": {"type": "string", "required": False},
-                    "raised_as": {"type": "string", "required": False},
-                    "birthing_ease": {"type": "string", "required": False},
-                    "birth_weight": {"type": "float", "required": False},
-                    "dam_id": {"type": "string", "required": False},
-                    "sire_id": {"type": "string", "required": False},
-                    "colour": {"type": "string", "required": False},
-                    "animal_comments": {"type": "string", "required": False}
-                },
-                detection_keywords=[
-                    "animal", "cow", "cattle", "bull", "heifer", "steer",
-                    "sheep", "lamb", "ewe", "ram",
-                    "goat", "kid", "doe", "buck",
-                    "bison", "buffalo",
-                    "ear tag", "rfid", "tag number",
-                    "birth", "born", "calving", "lambing",
-                    "biotrack", "bio track"
-                ],
-                is_active=True
-            )
-            db.add(schema_mapping)
+            # Create bioTrack animal schema mapping. A Core insert of plain
+            # rows: more mappings can be added to the list and go out in one
+            # multi-row INSERT
+            await db.execute(insert(SchemaMapping), [{
+                "client_id": client.id,
+                "entity_name": "animal",
+                "dynamics_entity_name": "biotrack_animals",
+                "field_mappings": ANIMAL_FIELD_MAPPINGS,
+                "validation_rules": ANIMAL_VALIDATION_RULES,
+                "detection_keywords": ANIMAL_DETECTION_KEYWORDS,
+                "is_active": True
+            }])
             await db.commit()
             print(f"[OK] Created bioTrack animal schema mapping for {client.name}")
 
@@ -167,11 +191,15 @@ async def seed_demo_client():
 
         print(f"\n🔐 Dashboard Login Credentials (for farmers):")
         print(f"  Username: {client.settings.get('username')}")
-        print(f"  Password: {client.settings.get('password')}")
+        print(f"  Password: {DEMO_PASSWORD}")
         print(f"  Login URL: {client.settings.get('login_url')}")
 
         print(f"\n⚠️  Dynamics 365 API Credentials Status:")
-        if client.dynamics_client_id.startswith("YOUR_"):
+        if PLACEHOLDER_CREDENTIALS.intersection((
+            client.dynamics_client_id,
+            client.dynamics_client_secret,
+            client.dynamics_tenant_id,
+        )):
             print(f"  ❌ NOT CONFIGURED - Placeholder values detected")
             print(f"  📝 Action Required: Set up Azure AD App Registration")
             print(f"  📖 Instructions: See .env.example or CLIENT_HANDOVER.md")
@@ -7,37 +7,45 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from backend.core.database import AsyncSessionLocal, init_db
+from backend.core.database import AsyncSessionLocal
+from backend.core.security import hash_password
 from backend.models.client import Client
-from sqlalchemy import select
+from sqlalchemy import update
 
 
 async def update_demo_credentials():
     """Update demo client with real credentials"""
 
-    await init_db()
+    # No init_db(): this only changes a client that seed_demo_client.py
+    # created, so the tables already exist
 
     async with AsyncSessionLocal() as db:
-        # Find existing demo client
-        result = await db.execute(select(Client).where(Client.name == "Demo Farm"))
-        client = result.scalar_one_or_none()
+        # Update the existing demo client with real credentials in one
+        # statement, returning what the summary below prints
+        result = await db.execute(
+            update(Client)
+            .where(Client.name == "Demo Farm")
+            .values(
+                name="bioTrack+ Demo",
+                dynamics_url="https://agsights.crm3.dynamics.com",
+                dynamics_client_id="demo@biotrack.ca",
+                dynamics_client_secret="bioTrack+test",
+                dynamics_tenant_id="biotrack-demo",
+                settings={
+                    "username": "demo@biotrack.ca",
+                    "password_hash": hash_password("bioTrack+test"),
+                    "login_url": "https://agsights.crm3.dynamics.com/"
+                }
+            )
+            .returning(Client.id, Client.name, Client.dynamics_url)
+            .execution_options(synchronize_session=False)
+        )
+        client = result.one_or_none()
 
         if not client:
             print("[ERROR] Demo Farm client not found!")
             return
 
-        # Update with real credentials
-        client.name = "bioTrack+ Demo"
-        client.dynamics_url = "https://agsights.crm3.dynamics.com"
-        client.dynamics_client_id = "demo@biotrack.ca"
-        client.dynamics_client_secret = "bioTrack+test"
-        client.dynamics_tenant_id = "biotrack-demo"
-        client.settings = {
-            "username": "demo@biotrack.ca",
-            "password": "bioTrack+test",
-            "login_url": "https://agsights.crm3.dynamics.com/"
-        }
-
         await db.commit()
 
         print("\n" + "="*60)
@@ -1,26 +1,35 @@
 """
 Quick script to update Dynamics 365 credentials for demo client
+
+Usage:
+    python scripts/update_dynamics_creds.py
+    python scripts/update_dynamics_creds.py --client-id ... --tenant-id ... --client-secret ...
+
+Values not given as options are read from DYNAMICS_CLIENT_ID,
+DYNAMICS_TENANT_ID and DYNAMICS_CLIENT_SECRET, and prompted for otherwise.
 """
+import argparse
 import asyncio
+import os
 import sys
 from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
 
 sys.path.append('.')
+from backend.core.database import AsyncSessionLocal, engine
 from backend.models.client import Client
 
-async def update_credentials():
-    # Connect to database
-    engine = create_async_engine('sqlite+aiosqlite:///./farm_data.db', echo=False)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
-    async with async_session() as session:
-        # Find the demo client
+async def update_credentials(client_id: str = None, tenant_id: str = None, client_secret: str = None):
+    async with AsyncSessionLocal() as session:
+        # Find the demo client's current credentials
         result = await session.execute(
-            select(Client).where(Client.name == "bioTrack+ Demo")
+            select(
+                Client.dynamics_client_id,
+                Client.dynamics_tenant_id,
+                Client.dynamics_client_secret
+            ).where(Client.name == "bioTrack+ Demo")
         )
-        client = result.scalar_one_or_none()
+        client = result.one_or_none()
 
         if not client:
             print("ERROR: Demo client not found!")
@@ -32,23 +41,35 @@ async def update_credentials():
         print(f"  Secret: {client.dynamics_client_secret[:20]}...")
         print()
 
-        # Get new credentials from user
-        print("Enter your Azure AD credentials:")
-        print("(Get these from Azure Portal -> App Registrations)")
-        print()
+        # Get new credentials from user - only those not passed in
+        if not (client_id and tenant_id and client_secret):
+            print("Enter your Azure AD credentials:")
+            print("(Get these from Azure Portal -> App Registrations)")
+            print()
 
-        client_id = input("Application (client) ID: ").strip()
-        tenant_id = input("Directory (tenant) ID: ").strip()
-        client_secret = input("Client Secret: ").strip()
+        client_id = client_id or input("Application (client) ID: ").strip()
+        tenant_id = tenant_id or input("Directory (tenant) ID: ").strip()
+        client_secret = client_secret or input("Client Secret: ").strip()
 
         if not client_id or not tenant_id or not client_secret:
             print("\nERROR: All three values are required!")
             return
 
-        # Update client
-        client.dynamics_client_id = client_id
-        client.dynamics_tenant_id = tenant_id
-        client.dynamics_client_secret = client_secret
+        # Update client in one statement - no ORM object to flush
+        result = await session.execute(
+            update(Client)
+            .where(Client.name == "bioTrack+ Demo")
+            .values(
+                dynamics_client_id=client_id,
+                dynamics_tenant_id=tenant_id,
+                dynamics_client_secret=client_secret
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        if result.rowcount == 0:
+            print("\nERROR: Demo client not found!")
+            return
 
         await session.commit()
 
@@ -59,5 +80,18 @@ async def update_credentials():
         print("Test it by uploading a voice recording about adding an animal.")
         print()
 
+async def main():
+    parser = argparse.ArgumentParser(description="Update the demo client's Dynamics 365 credentials")
+    parser.add_argument("--client-id", default=os.environ.get("DYNAMICS_CLIENT_ID"))
+    parser.add_argument("--tenant-id", default=os.environ.get("DYNAMICS_TENANT_ID"))
+    parser.add_argument("--client-secret", default=os.environ.get("DYNAMICS_CLIENT_SECRET"))
+    args = parser.parse_args()
+
+    try:
+        await update_credentials(args.client_id, args.tenant_id, args.client_secret)
+    finally:
+        # Close the pooled connection so aiosqlite shuts down cleanly
+        await engine.dispose()
+
 if __name__ == "__main__":
-    asyncio.run(update_credentials())
+    asyncio.run(main())
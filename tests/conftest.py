@@ -0,0 +1,177 @@
+"""
+Test configuration
+
+Points the app at a throwaway SQLite database and storage directory before
+any backend module reads its settings.
+"""
+import asyncio
+import fnmatch
+import inspect
+import os
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+_tmp = tempfile.mkdtemp(prefix="fda-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_tmp}/test.db"
+os.environ["LOCAL_STORAGE_PATH"] = f"{_tmp}/storage"
+os.environ["WHISPER_PRELOAD"] = "false"
+os.environ["REDIS_URL"] = "redis://127.0.0.1:1/0"  # Unreachable: caching is skipped
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.core import cache  # noqa: E402 - needs the environment above
+from backend.core.config import settings  # noqa: E402
+from backend.core.database import AsyncSessionLocal, engine, init_db  # noqa: E402
+from backend.models.client import Client  # noqa: E402
+from backend.models.recording import Recording  # noqa: E402
+
+
+class FakeRedis:
+    """Just enough of the Redis protocol for the cache and status events"""
+
+    def __init__(self):
+        self.data = {}
+        self.subscribers = {}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                command = await self._read_command(reader)
+                if command is None:
+                    break
+                writer.write(self._encode(self._execute(command, writer)))
+                await writer.drain()
+        except ConnectionError:
+            pass
+
+    def _execute(self, command, writer):
+        name, args = command[0].upper(), command[1:]
+        if name == b"SUBSCRIBE":
+            self.subscribers.setdefault(args[0], []).append(writer)
+            return [b"subscribe", args[0], 1]
+        if name == b"PUBLISH":
+            receivers = self.subscribers.get(args[0], [])
+            for subscriber in receivers:
+                subscriber.write(self._encode([b"message", args[0], args[1]]))
+            return len(receivers)
+        if name == b"SET":
+            self.data[args[0]] = args[1]
+            return "OK"
+        if name == b"GET":
+            return self.data.get(args[0])
+        if name == b"MGET":
+            return [self.data.get(key) for key in args]
+        if name == b"DEL":
+            return sum(self.data.pop(key, None) is not None for key in args)
+        if name == b"SCAN":
+            # One pass over every key: SCAN <cursor> MATCH <pattern> [COUNT n]
+            pattern = args[args.index(b"MATCH") + 1].decode() if b"MATCH" in args else "*"
+            return [b"0", [key for key in self.data if fnmatch.fnmatchcase(key.decode(), pattern)]]
+        return "OK"
+
+    @staticmethod
+    async def _read_command(reader):
+        header = await reader.readline()
+        if not header:
+            return None
+        parts = []
+        for _ in range(int(header[1:])):
+            length = int((await reader.readline())[1:])
+            parts.append((await reader.readexactly(length + 2))[:-2])
+        return parts
+
+    @classmethod
+    def _encode(cls, value):
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, str):
+            return b"+%s\r\n" % value.encode()
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, bytes):
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        return b"*%d\r\n" % len(value) + b"".join(cls._encode(item) for item in value)
+
+
+@pytest_asyncio.fixture
+async def fake_redis(monkeypatch):
+    """Point the app's Redis clients at an in-process FakeRedis"""
+    state = FakeRedis()
+    server = await asyncio.start_server(state.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    monkeypatch.setattr(settings, "REDIS_URL", f"redis://127.0.0.1:{port}/0")
+    monkeypatch.setattr(cache, "_redis", None)
+    monkeypatch.setattr(cache, "_pubsub_redis", None)
+    monkeypatch.setattr(cache, "_unavailable_until", 0.0)
+    yield state
+
+    await cache.close_cache()
+    server.close()
+
+
+@pytest_asyncio.fixture
+async def database():
+    """Create the tables for tests that use the engine directly"""
+    # Pooled connections belong to the event loop that opened them
+    await engine.dispose()
+    await init_db()
+    yield
+    await engine.dispose()
+
+
+def _client_fields(**fields) -> dict:
+    """Client create payload with a unique name, so tests can share a database"""
+    return {
+        "name": f"Test Farm {uuid.uuid4()}",
+        "dynamics_url": "https://test.crm.dynamics.com",
+        "dynamics_client_id": "client-id",
+        "dynamics_tenant_id": "tenant-id",
+        "dynamics_client_secret": "secret",
+        **fields,
+    }
+
+
+def _created(response) -> dict:
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+@pytest.fixture
+def client_factory():
+    """
+    Create a client through the API and return its JSON
+
+    Call it with a TestClient, or with an httpx.AsyncClient (then await the
+    result); keyword arguments override the default fields.
+    """
+    def create(c, **fields):
+        response = c.post("/api/v1/clients", json=_client_fields(**fields))
+        if inspect.isawaitable(response):
+            async def created():
+                return _created(await response)
+            return created()
+        return _created(response)
+
+    return create
+
+
+@pytest.fixture
+def recording_factory(database):
+    """Insert a recording, and a client that owns it, directly in the database"""
+    async def create(**fields) -> Recording:
+        async with AsyncSessionLocal() as session:
+            client = Client(**_client_fields())
+            session.add(client)
+            await session.flush()
+            recording = Recording(client_id=client.id, filename="test.wav", **fields)
+            session.add(recording)
+            await session.commit()
+            return recording
+
+    return create
@@ -0,0 +1,86 @@
+"""
+Dashboard login and stored client credentials
+"""
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.core.security import hash_password, verify_client_password
+from backend.main import app
+
+
+@pytest.mark.asyncio
+async def test_verify_bcrypt_password():
+    client_settings = {"password_hash": hash_password("bioTrack+test")}
+
+    assert await verify_client_password(client_settings, "bioTrack+test")
+    assert not await verify_client_password(client_settings, "wrong")
+
+
+@pytest.mark.asyncio
+async def test_verify_legacy_plaintext_password():
+    client_settings = {"password": "bioTrack+test"}
+
+    assert await verify_client_password(client_settings, "bioTrack+test")
+    assert not await verify_client_password(client_settings, "wrong")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("client_settings", [None, {}, {"username": "farmer@example.com"}])
+async def test_verify_without_credentials(client_settings):
+    assert not await verify_client_password(client_settings, "")
+    assert not await verify_client_password(client_settings, "bioTrack+test")
+
+
+def test_login(client_factory):
+    username = f"{uuid.uuid4()}@example.com"
+    with TestClient(app) as c:
+        created = client_factory(c, settings={"username": username, "password": "bioTrack+test"})
+
+        response = c.post("/api/v1/auth/login", json={"username": username, "password": "bioTrack+test"})
+        assert response.status_code == 200, response.text
+        assert response.json()["client"]["id"] == created["id"]
+
+        for credentials in (
+            {"username": username, "password": "wrong"},
+            {"username": f"{uuid.uuid4()}@example.com", "password": "bioTrack+test"},
+        ):
+            response = c.post("/api/v1/auth/login", json=credentials)
+            assert response.status_code == 401, response.text
+
+
+def test_client_responses_hide_credentials(client_factory):
+    username = f"{uuid.uuid4()}@example.com"
+    with TestClient(app) as c:
+        created = client_factory(c, settings={"username": username, "password": "bioTrack+test"})
+        fetched = c.get(f"/api/v1/clients/{created['id']}").json()
+        listed = c.get("/api/v1/clients", params={"limit": 1000}).json()
+
+    for client in (created, fetched, *listed):
+        assert "password" not in client["settings"]
+        assert "password_hash" not in client["settings"]
+    assert fetched["settings"] == {"username": username}
+
+
+def test_settings_round_trip_keeps_the_login(client_factory):
+    username = f"{uuid.uuid4()}@example.com"
+    credentials = {"username": username, "password": "bioTrack+test"}
+    with TestClient(app) as c:
+        created = client_factory(c, settings=credentials)
+        url = f"/api/v1/clients/{created['id']}"
+
+        # Edit the settings as returned by GET, without the credential
+        settings = {**c.get(url).json()["settings"], "description": "North barn"}
+        assert c.patch(url, json={"settings": settings}).status_code == 200
+        assert c.post("/api/v1/auth/login", json=credentials).status_code == 200
+
+        response = c.patch(url, json={"settings": {**settings, "password_hash": "$2b$12$forged"}})
+        assert response.status_code == 422
+        assert c.post("/api/v1/auth/login", json=credentials).status_code == 200
+
+        # A new password replaces the stored one
+        new_password = {"username": username, "password": "changed"}
+        assert c.patch(url, json={"settings": new_password}).status_code == 200
+        assert c.post("/api/v1/auth/login", json=new_password).status_code == 200
+        assert c.post("/api/v1/auth/login", json=credentials).status_code == 401
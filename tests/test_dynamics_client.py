@@ -0,0 +1,206 @@
+"""
+Dynamics 365 Web API client against a mock transport
+"""
+import asyncio
+import time
+from contextlib import aclosing
+from email.parser import BytesParser
+from email.policy import HTTP
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from backend.services import dynamics_client as dynamics_module
+from backend.services.dynamics_client import DynamicsClient
+
+BASE_URL = "https://farm.crm.dynamics.com"
+API_URL = f"{BASE_URL}/api/data/v9.2"
+
+
+@pytest_asyncio.fixture
+async def dynamics(monkeypatch):
+    """Returns install(handler) -> DynamicsClient whose requests go to handler"""
+    http_clients = []
+
+    def install(handler) -> DynamicsClient:
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        http_clients.append(http)
+        monkeypatch.setattr(dynamics_module, "_http", http)
+
+        client = DynamicsClient(BASE_URL, "client-id", "secret", "tenant-id")
+        # Already logged in: no Azure AD request
+        client.access_token = "token"
+        client._token_expires_monotonic = time.monotonic() + 3600
+        return client
+
+    yield install
+    for http in http_clients:
+        await http.aclose()
+
+
+def _parse_multipart(content_type: str, body: bytes):
+    return BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("ascii") + body
+    )
+
+
+def _batch_response(*parts: str) -> httpx.Response:
+    """A $batch response with the given application/http parts in one changeset"""
+    lines = [
+        "--batchresponse_1",
+        "Content-Type: multipart/mixed; boundary=changesetresponse_1",
+        "",
+    ]
+    for part in parts:
+        lines += ["--changesetresponse_1", part]
+    lines += ["--changesetresponse_1--", "--batchresponse_1--", ""]
+    return httpx.Response(
+        200,
+        headers={"Content-Type": "multipart/mixed; boundary=batchresponse_1"},
+        content="\r\n".join(lines).encode("utf-8"),
+    )
+
+
+def _http_part(content_id: int, status_line: str, *headers: str, body: str = "") -> str:
+    return "\r\n".join([
+        "Content-Type: application/http",
+        "Content-Transfer-Encoding: binary",
+        f"Content-ID: {content_id}",
+        "",
+        f"HTTP/1.1 {status_line}",
+        *headers,
+        "",
+        body,
+    ])
+
+
+OPERATIONS = [
+    {"method": "POST", "entity_name": "biotrack_animals", "data": {"ear_tag": "12345"}},
+    {"method": "PATCH", "entity_name": "biotrack_farms", "record_id": "farm-1", "data": {"head_count": 41}},
+]
+
+
+@pytest.mark.asyncio
+async def test_batch_write_sends_one_changeset(dynamics):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        # Parts answered out of order: results follow Content-ID, not position
+        return _batch_response(
+            _http_part(2, "204 No Content", f"OData-EntityId: {API_URL}/biotrack_farms(farm-1)"),
+            _http_part(
+                1, "201 Created",
+                "Content-Type: application/json",
+                f"OData-EntityId: {API_URL}/biotrack_animals(animal-1)",
+                body='{"ear_tag": "12345"}',
+            ),
+        )
+
+    results = await dynamics(handler).batch_write(OPERATIONS)
+
+    assert results == [
+        {"id": "animal-1", "data": {"ear_tag": "12345"}},
+        {"id": "farm-1", "data": {}},
+    ]
+
+    [request] = requests
+    assert request.method == "POST"
+    assert str(request.url) == f"{API_URL}/$batch"
+    assert request.headers["Authorization"] == "Bearer token"
+
+    batch = _parse_multipart(request.headers["Content-Type"], request.content)
+    [changeset] = batch.get_payload()
+    assert changeset.get_content_type() == "multipart/mixed"
+    parts = changeset.get_payload()
+    assert [part.get_content_type() for part in parts] == ["application/http"] * 2
+    assert [part["Content-ID"] for part in parts] == ["1", "2"]
+
+    request_lines = [part.get_payload(decode=True).split(b"\r\n") for part in parts]
+    assert request_lines[0][0] == f"POST {API_URL}/biotrack_animals HTTP/1.1".encode()
+    assert request_lines[0][-1] == b'{"ear_tag":"12345"}'
+    assert request_lines[1][0] == f"PATCH {API_URL}/biotrack_farms(farm-1) HTTP/1.1".encode()
+    assert request_lines[1][-1] == b'{"head_count":41}'
+
+
+@pytest.mark.asyncio
+async def test_batch_write_raises_for_a_failed_changeset(dynamics):
+    def handler(request):
+        # A failed changeset comes back as the failing operation's response alone
+        return _batch_response(
+            _http_part(
+                2, "400 Bad Request",
+                "Content-Type: application/json",
+                body='{"error": {"message": "Invalid head_count"}}',
+            ),
+        )
+
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        await dynamics(handler).batch_write(OPERATIONS)
+
+    assert error.value.response.status_code == 400
+    assert "Invalid head_count" in error.value.response.text
+
+
+@pytest.mark.asyncio
+async def test_batch_write_reports_missing_results(dynamics):
+    def handler(request):
+        return _batch_response(
+            _http_part(1, "204 No Content", f"OData-EntityId: {API_URL}/biotrack_animals(animal-1)"),
+        )
+
+    with pytest.raises(ValueError, match="missing Content-IDs: 2"):
+        await dynamics(handler).batch_write(OPERATIONS)
+
+
+def _page(records, next_link=None) -> httpx.Response:
+    body = {"value": records}
+    if next_link:
+        body["@odata.nextLink"] = next_link
+    return httpx.Response(200, json=body)
+
+
+@pytest.mark.asyncio
+async def test_query_all_prefetches_the_next_page(dynamics):
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        if "page=2" in str(request.url):
+            return _page([{"n": 3}])
+        return _page([{"n": 1}, {"n": 2}], next_link=f"{API_URL}/biotrack_animals?page=2")
+
+    records = dynamics(handler).query_all("biotrack_animals", page_size=2)
+
+    assert await anext(records) == {"n": 1}
+    # Page 2 is requested while the caller is still on page 1
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert requested == [f"{API_URL}/biotrack_animals", f"{API_URL}/biotrack_animals?page=2"]
+
+    assert [record async for record in records] == [{"n": 2}, {"n": 3}]
+    assert len(requested) == 2
+
+
+@pytest.mark.asyncio
+async def test_query_all_cancels_the_prefetch_when_the_caller_stops(dynamics):
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def handler(request):
+        if "page=2" not in str(request.url):
+            return _page([{"n": 1}, {"n": 2}], next_link=f"{API_URL}/biotrack_animals?page=2")
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async with aclosing(dynamics(handler).query_all("biotrack_animals")) as records:
+        async for record in records:
+            await asyncio.wait_for(started.wait(), 1.0)
+            break
+
+    await asyncio.wait_for(cancelled.wait(), 1.0)
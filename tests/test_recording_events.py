@@ -0,0 +1,123 @@
+"""
+Recording status events and the SSE stream
+"""
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, update
+
+from backend.api import recordings as recordings_api
+from backend.core.database import AsyncSessionLocal
+from backend.core.events import publish_status, subscribe
+from backend.core.responses import SelectiveGZipMiddleware
+from backend.main import app
+from backend.models.recording import Recording, RecordingStatus
+
+
+@pytest.mark.asyncio
+async def test_subscription_survives_idle_periods(fake_redis):
+    recording = SimpleNamespace(id=uuid.uuid4(), status=RecordingStatus.PROCESSING, sync_error=None)
+
+    async with subscribe(recording.id) as events:
+        # Longer than the cache client's 0.5s socket timeout
+        await asyncio.sleep(1.0)
+        await publish_status(recording)
+        event = await asyncio.wait_for(events.get(), 2.0)
+
+    assert fake_redis.subscribers, "subscription should go through Redis"
+    assert event == {"id": str(recording.id), "status": "processing", "sync_error": None}
+
+
+@pytest.mark.asyncio
+async def test_stream_catches_up_when_an_event_is_lost(recording_factory, monkeypatch):
+    monkeypatch.setattr(recordings_api, "EVENTS_KEEPALIVE_SECONDS", 0.05)
+    recording = await recording_factory()
+
+    async with AsyncSessionLocal() as db:
+        response = await recordings_api.recording_events(recording.id, db)
+    chunks = response.body_iterator
+
+    first = await anext(chunks)
+    assert b'"status":"uploaded"' in first
+
+    # Committed without publishing, like a worker that died before announcing it
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(Recording).where(Recording.id == recording.id).values(status=RecordingStatus.FAILED)
+        )
+        await session.commit()
+
+    async def drain():
+        return [chunk async for chunk in chunks]
+
+    rest = await asyncio.wait_for(drain(), 2.0)
+    assert b'"status":"failed"' in rest[-1]
+
+
+@pytest.mark.asyncio
+async def test_stream_ends_when_the_recording_is_deleted(recording_factory, monkeypatch):
+    monkeypatch.setattr(recordings_api, "EVENTS_KEEPALIVE_SECONDS", 0.05)
+    recording = await recording_factory()
+
+    async with AsyncSessionLocal() as db:
+        response = await recordings_api.recording_events(recording.id, db)
+    chunks = response.body_iterator
+    await anext(chunks)
+
+    # Deleted along with its client
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Recording).where(Recording.id == recording.id))
+        await session.commit()
+
+    async def drain():
+        return [chunk async for chunk in chunks]
+
+    rest = await asyncio.wait_for(drain(), 2.0)
+    assert rest[-1].startswith(b"event: deleted\n")
+
+
+@pytest.mark.asyncio
+async def test_published_status_shows_in_recording_and_list(recording_factory, fake_redis):
+    recording = await recording_factory()
+    # Published without being committed, as the processor does for processing
+    await publish_status(
+        SimpleNamespace(id=recording.id, status=RecordingStatus.PROCESSING, sync_error=None)
+    )
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        detail = (await c.get(f"/api/v1/recordings/{recording.id}")).json()
+        listed = (await c.get("/api/v1/recordings", params={"client_id": str(recording.client_id)})).json()
+
+    assert detail["status"] == "processing"
+    assert [r["status"] for r in listed] == ["processing"]
+
+
+@pytest.mark.asyncio
+async def test_event_streams_are_not_compressed():
+    body = b"data: " + b"x" * 2048 + b"\n\n"
+    gzip_app = FastAPI()
+    gzip_app.add_middleware(SelectiveGZipMiddleware, minimum_size=1024)
+
+    @gzip_app.get("/events")
+    async def events():
+        return StreamingResponse(iter([body]), media_type="text/event-stream")
+
+    @gzip_app.get("/list")
+    async def listed():
+        return StreamingResponse(iter([body]), media_type="application/json")
+
+    transport = httpx.ASGITransport(app=gzip_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        events_response = await c.get("/events", headers={"Accept-Encoding": "gzip"})
+        list_response = await c.get("/list", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in events_response.headers
+    assert events_response.content == body
+    assert list_response.headers["content-encoding"] == "gzip"
+    assert list_response.content == body
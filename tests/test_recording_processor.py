@@ -0,0 +1,199 @@
+"""
+Recording processing pipeline: claiming runs and cache keys
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+from sqlalchemy import select, text
+
+from backend.api import recordings as recordings_api
+from backend.core.config import settings
+from backend.core.database import AsyncSessionLocal
+from backend.models.recording import Recording, RecordingStatus
+from backend.models.schema_mapping import SchemaMapping
+from backend.workers import recording_processor
+
+
+async def _load(recording_id) -> Recording:
+    async with AsyncSessionLocal() as session:
+        return (await session.execute(select(Recording).where(Recording.id == recording_id))).scalar_one()
+
+
+@pytest.fixture
+def storage_calls(monkeypatch):
+    """Counts how often a run gets as far as locating the audio file"""
+    calls = []
+
+    class Storage:
+        def get_file_path(self, file_path):
+            calls.append(file_path)
+            return "/nonexistent/" + file_path
+
+    monkeypatch.setattr(recording_processor, "get_storage_service", Storage)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_second_run_of_a_synced_recording_is_a_no_op(recording_factory, storage_calls):
+    recording = await recording_factory(
+        file_path="processor.wav", status=RecordingStatus.SYNCED, dynamics_record_id="record-1"
+    )
+
+    await recording_processor.process_recording(recording.id)
+
+    stored = await _load(recording.id)
+    assert stored.status == RecordingStatus.SYNCED
+    assert stored.dynamics_record_id == "record-1"
+    assert stored.sync_error is None
+    assert storage_calls == []
+
+
+@pytest.mark.asyncio
+async def test_redelivered_run_skips_a_recording_in_progress(recording_factory, storage_calls):
+    recording = await recording_factory(file_path="processor.wav")
+
+    # The first run fails on the missing file; a claim in progress is
+    # simulated by running again after putting the status back to transcribing
+    await recording_processor.process_recording(recording.id)
+    assert (await _load(recording.id)).status == RecordingStatus.FAILED
+
+    async with AsyncSessionLocal() as session:
+        stored = (await session.execute(select(Recording).where(Recording.id == recording.id))).scalar_one()
+        stored.status = RecordingStatus.TRANSCRIBING
+        await session.commit()
+
+    await recording_processor.process_recording(recording.id)
+
+    assert (await _load(recording.id)).status == RecordingStatus.TRANSCRIBING
+    assert storage_calls == ["processor.wav"]
+
+
+@pytest.mark.asyncio
+async def test_redelivered_run_takes_over_a_live_claim(recording_factory, storage_calls):
+    # Claimed just now by a run whose worker was lost
+    recording = await recording_factory(
+        file_path="processor.wav", status=RecordingStatus.TRANSCRIBED, claimed_at=datetime.now(timezone.utc)
+    )
+
+    await recording_processor.process_recording(recording.id)
+    assert storage_calls == []
+
+    await recording_processor.process_recording(recording.id, takeover=True)
+    assert storage_calls == ["processor.wav"]
+    assert (await _load(recording.id)).status == RecordingStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_expired_claim_is_taken_over(recording_factory, storage_calls):
+    claimed_at = datetime.now(timezone.utc) - timedelta(seconds=settings.PROCESSING_TIME_LIMIT + 60)
+    recording = await recording_factory(
+        file_path="processor.wav", status=RecordingStatus.TRANSCRIBING, claimed_at=claimed_at
+    )
+
+    await recording_processor.process_recording(recording.id)
+
+    assert storage_calls == ["processor.wav"]
+    assert (await _load(recording.id)).status == RecordingStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_failure_before_the_recording_loads_marks_it_failed(recording_factory, monkeypatch):
+    recording = await recording_factory(file_path="processor.wav")
+
+    # The load after the claim raises OperationalError
+    monkeypatch.setattr(
+        recording_processor, "RECORDING_WITH_CLIENT",
+        text("SELECT * FROM missing_table WHERE id = :recording_id")
+    )
+
+    await recording_processor.process_recording(recording.id)
+
+    stored = await _load(recording.id)
+    assert stored.status == RecordingStatus.FAILED
+    assert "missing_table" in stored.sync_error
+
+
+@pytest.mark.asyncio
+async def test_failed_extraction_keeps_its_error(recording_factory, tmp_path, monkeypatch):
+    from backend.services import dynamics_client, groq_service, whisper_service
+
+    audio = tmp_path / "processor.wav"
+    audio.write_bytes(b"RIFF" + bytes(64))
+
+    class Storage:
+        def get_file_path(self, file_path):
+            return str(audio)
+
+    async def transcribed(*args):
+        return {"success": True, "text": "New heifer, tag 123", "confidence": "HIGH"}
+
+    async def extraction_failed(*args):
+        return {
+            "entity_type": "unknown", "confidence": "LOW", "extracted_data": {},
+            "error": "Max retries exceeded: rate limited",
+        }
+
+    async def no_login(self):
+        pass
+
+    monkeypatch.setattr(settings, "WHISPER_MODE", "api")
+    monkeypatch.setattr(recording_processor, "get_storage_service", Storage)
+    monkeypatch.setattr(recording_processor, "_cached_transcription", transcribed)
+    monkeypatch.setattr(recording_processor, "_cached_extraction", extraction_failed)
+    monkeypatch.setattr(whisper_service, "get_whisper_service", lambda: None)
+    monkeypatch.setattr(groq_service, "get_groq_service", lambda: None)
+    monkeypatch.setattr(dynamics_client.DynamicsClient, "prefetch_token", no_login)
+
+    recording = await recording_factory(file_path="processor.wav")
+    async with AsyncSessionLocal() as session:
+        session.add(SchemaMapping(
+            client_id=recording.client_id, entity_name="animal", dynamics_entity_name="msdyn_animal"
+        ))
+        await session.commit()
+
+    await recording_processor.process_recording(recording.id)
+
+    stored = await _load(recording.id)
+    assert stored.status == RecordingStatus.FAILED
+    assert stored.sync_error == "AI extraction failed: Max retries exceeded: rate limited"
+
+
+@pytest.mark.asyncio
+async def test_reprocess_refuses_a_recording_in_progress(recording_factory, monkeypatch):
+    scheduled = []
+
+    async def record_schedule(recording_id, background_tasks):
+        scheduled.append(recording_id)
+
+    monkeypatch.setattr(recordings_api, "schedule_processing", record_schedule)
+    in_progress = await recording_factory(file_path="processor.wav", status=RecordingStatus.TRANSCRIBING)
+    failed = await recording_factory(file_path="processor.wav", status=RecordingStatus.FAILED)
+    # Uploaded but never claimed: its task was lost
+    unclaimed = await recording_factory(file_path="processor.wav")
+
+    async with AsyncSessionLocal() as db:
+        with pytest.raises(HTTPException) as refused:
+            await recordings_api.reprocess_recording(in_progress.id, BackgroundTasks(), db)
+        assert refused.value.status_code == 409
+
+        reset = await recordings_api.reprocess_recording(failed.id, BackgroundTasks(), db)
+        assert reset.status == RecordingStatus.UPLOADED
+        await recordings_api.reprocess_recording(unclaimed.id, BackgroundTasks(), db)
+
+    assert (await _load(in_progress.id)).status == RecordingStatus.TRANSCRIBING
+    assert scheduled == [failed.id, unclaimed.id]
+
+
+@pytest.mark.asyncio
+async def test_audio_digest_uses_the_upload_hash(tmp_path):
+    # Hashed at upload: the file isn't read again
+    recording = Recording(content_hash="ab" * 32)
+    assert await recording_processor._audio_digest(recording, str(tmp_path / "missing.wav")) == "ab" * 32
+
+    # Recordings from before content_hash are hashed the same way the upload does
+    audio = tmp_path / "legacy.wav"
+    audio.write_bytes(b"RIFF" + bytes(64))
+    digest = await recording_processor._audio_digest(Recording(), str(audio))
+    assert digest == hashlib.blake2b(audio.read_bytes(), digest_size=32).hexdigest()
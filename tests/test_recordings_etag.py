@@ -0,0 +1,58 @@
+"""
+ETags and 304 Not Modified on detail GETs
+"""
+import uuid
+
+from fastapi.testclient import TestClient
+
+from backend.api import recordings as recordings_api
+from backend.main import app
+
+
+def _upload(c, client_id: str) -> dict:
+    response = c.post(
+        "/api/v1/recordings/upload",
+        data={"client_id": client_id},
+        files={"file": ("etag.wav", b"RIFF" + uuid.uuid4().bytes + bytes(48), "audio/wav")},
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_client_etag_answers_304(client_factory):
+    with TestClient(app) as c:
+        url = f"/api/v1/clients/{client_factory(c)['id']}"
+        first = c.get(url)
+        etag = first.headers["ETag"]
+
+        unchanged = c.get(url, headers={"If-None-Match": etag})
+        assert unchanged.status_code == 304
+        assert unchanged.headers["ETag"] == etag
+        assert unchanged.content == b""
+
+        # Weak, listed and wildcard forms match too
+        for header in (f"W/{etag}", f'"other", {etag}', "*"):
+            assert c.get(url, headers={"If-None-Match": header}).status_code == 304
+
+        assert c.patch(url, json={"name": f"ETag Farm {uuid.uuid4()}"}).status_code == 200
+        changed = c.get(url, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+
+
+def test_recording_etag_answers_304(client_factory, monkeypatch):
+    async def leave_unprocessed(recording_id, background_tasks):
+        pass
+
+    # Processing would change the recording between requests
+    monkeypatch.setattr(recordings_api, "schedule_processing", leave_unprocessed)
+    with TestClient(app) as c:
+        recording = _upload(c, client_factory(c)["id"])
+        url = f"/api/v1/recordings/{recording['recording_id']}"
+        etag = c.get(url).headers["ETag"]
+
+        unchanged = c.get(url, headers={"If-None-Match": etag})
+        assert unchanged.status_code == 304
+        assert unchanged.content == b""
+
+        assert c.get(url, headers={"If-None-Match": '"stale"'}).status_code == 200
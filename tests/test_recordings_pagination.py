@@ -0,0 +1,54 @@
+"""
+Recordings list: cursor pagination and streaming
+"""
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+from backend.core import responses
+from backend.main import app
+
+
+def test_cursor_pages_do_not_overlap(client_factory):
+    with TestClient(app) as c:
+        client_id = client_factory(c)["id"]
+        for i in range(5):
+            response = c.post(
+                "/api/v1/recordings/upload",
+                data={"client_id": client_id},
+                files={"file": (f"page{i}.wav", b"RIFF" + bytes(64), "audio/wav")},
+            )
+            assert response.status_code == 201, response.text
+
+        params = {"client_id": client_id, "limit": 2}
+        first = c.get("/api/v1/recordings", params=params).json()
+        assert len(first) == 2
+
+        last = first[-1]
+        second = c.get("/api/v1/recordings", params={
+            **params, "before": last["created_at"], "before_id": last["id"],
+        }).json()
+        assert len(second) == 2
+
+        first_ids = {r["id"] for r in first}
+        assert first_ids.isdisjoint(r["id"] for r in second)
+
+        # The timestamp-only cursor must also move past the page's last row
+        older = c.get("/api/v1/recordings", params={
+            **params, "before": last["created_at"],
+        }).json()
+        assert all(r["created_at"] < last["created_at"] for r in older)
+
+
+def test_list_query_failure_is_an_error_status(monkeypatch):
+    class DownSession:
+        async def stream_scalars(self, *args, **kwargs):
+            raise OperationalError("SELECT", {}, ConnectionRefusedError("database is down"))
+
+        async def close(self):
+            pass
+
+    monkeypatch.setattr(responses, "AsyncSessionLocal", DownSession)
+    with TestClient(app, raise_server_exceptions=False) as c:
+        response = c.get("/api/v1/recordings")
+
+    assert response.status_code >= 500
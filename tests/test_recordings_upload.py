@@ -0,0 +1,23 @@
+"""
+Recording upload rejection
+"""
+import os
+import uuid
+
+from fastapi.testclient import TestClient
+
+from backend.core.config import settings
+from backend.main import app
+
+
+def test_rejected_upload_leaves_no_client_directory():
+    with TestClient(app) as c:
+        client_id = str(uuid.uuid4())
+        response = c.post(
+            "/api/v1/recordings/upload",
+            data={"client_id": client_id},
+            files={"file": ("unknown.wav", b"RIFF" + bytes(64), "audio/wav")},
+        )
+        assert response.status_code == 404, response.text
+
+    assert not os.path.exists(os.path.join(settings.LOCAL_STORAGE_PATH, client_id))
@@ -0,0 +1,92 @@
+"""
+Redis response cache for the client endpoints
+"""
+import uuid
+
+import httpx
+import pytest
+from sqlalchemy import update
+from sqlalchemy.exc import OperationalError
+
+from backend.core.database import AsyncSessionLocal, get_db
+from backend.main import app
+from backend.models.client import Client
+
+
+def _api():
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def _rename_in_database(client_id: str, name: str):
+    """Change a client behind the API's back, so nothing invalidates the cache"""
+    async with AsyncSessionLocal() as session:
+        await session.execute(update(Client).where(Client.id == uuid.UUID(client_id)).values(name=name))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_is_served_from_cache(database, fake_redis, client_factory):
+    async with _api() as c:
+        created = await client_factory(c)
+        first = await c.get(f"/api/v1/clients/{created['id']}")
+        assert f"fda:clients:{created['id']}".encode() in fake_redis.data
+
+        await _rename_in_database(created["id"], "Renamed Farm")
+        second = await c.get(f"/api/v1/clients/{created['id']}")
+
+    assert second.status_code == 200
+    assert second.json()["name"] == created["name"]
+    assert second.content == first.content
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cached_entries(database, fake_redis, client_factory):
+    async with _api() as c:
+        created = await client_factory(c)
+        client_url = f"/api/v1/clients/{created['id']}"
+
+        # POST: a cached list picks up the new client
+        await c.get("/api/v1/clients", params={"limit": 1000})
+        added = await client_factory(c)
+        listed = (await c.get("/api/v1/clients", params={"limit": 1000})).json()
+        assert added["id"] in [client["id"] for client in listed]
+
+        # PATCH: the cached detail shows the update
+        await c.get(client_url)
+        response = await c.patch(client_url, json={"name": "Patched Farm"})
+        assert response.status_code == 200, response.text
+        assert (await c.get(client_url)).json()["name"] == "Patched Farm"
+
+        # DELETE: the cached detail is gone
+        assert (await c.delete(client_url)).status_code == 204
+        assert (await c.get(client_url)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_stale_copy_is_served_when_the_database_is_down(database, fake_redis, client_factory):
+    async with _api() as c:
+        created = await client_factory(c)
+        cached = await c.get(f"/api/v1/clients/{created['id']}")
+
+        # Fresh copy expired, then the database goes away
+        del fake_redis.data[f"fda:clients:{created['id']}".encode()]
+
+        class DownSession:
+            async def execute(self, *args, **kwargs):
+                raise OperationalError("SELECT", {}, ConnectionRefusedError("database is down"))
+
+        async def down_db():
+            yield DownSession()
+
+        app.dependency_overrides[get_db] = down_db
+        try:
+            stale = await c.get(f"/api/v1/clients/{created['id']}")
+            # Nothing cached to fall back on: the database error is raised
+            with pytest.raises(OperationalError):
+                await c.get(f"/api/v1/clients/{uuid.uuid4()}")
+        finally:
+            del app.dependency_overrides[get_db]
+
+    assert stale.status_code == 200
+    assert stale.content == cached.content
+    assert stale.headers["Warning"] == '110 - "Response is Stale"'